@@ -144,6 +144,12 @@ class UsecaseSidebarControls:
                 help="Filter results by AWS services mentioned"
             )
             
+            filter_types = st.multiselect(
+                "Filter by Document Type",
+                self._get_available_types(),
+                help="Filter results by documentation type"
+            )
+            
             top_k = st.slider(
                 "Number of Results",
                 min_value=1,
@@ -160,6 +166,13 @@ class UsecaseSidebarControls:
                 step=0.1,
                 help="Minimum similarity score to include in results"
             )
+            
+            search_mode = st.radio(
+                "Search Mode",
+                ["Semantic", "Hybrid"],
+                horizontal=True,
+                help="Hybrid fuses semantic and keyword (BM25) rankings"
+            )
         
         search_clicked = st.sidebar.button("🔍 Search Use Cases", type="secondary")
         
@@ -167,8 +180,10 @@ class UsecaseSidebarControls:
             "query": search_query,
             "usecase_filter": filter_usecase if filter_usecase != "All" else None,
             "services_filter": filter_services if filter_services else None,
+            "types_filter": filter_types if filter_types else None,
             "top_k": top_k,
             "min_similarity": min_similarity,
+            "search_mode": search_mode.lower(),
             "search_clicked": search_clicked
         }
 
@@ -190,6 +205,15 @@ class UsecaseSidebarControls:
         except:
             return ['EC2', 'S3', 'RDS', 'Lambda', 'CloudFront', 'ELB', 'VPC', 'IAM', 'CloudWatch', 'Auto Scaling']
 
+    def _get_available_types(self) -> list:
+        """Get list of available document types from stored data"""
+        try:
+            vector_stats = self.redis_service.get_usecase_statistics()
+            types = list(vector_stats.get('types_distribution', {}).keys())
+            return [t for t in types if t and t != 'Unknown']
+        except:
+            return []
+
     def render_action_buttons(self, usecase_config: Dict[str, Any], ai_config: Dict[str, Any], vector_config: Dict[str, Any]) -> Tuple[bool, bool, bool]:
         """Render action buttons and return their states"""
         st.sidebar.markdown("---")
@@ -359,7 +383,7 @@ class UsecaseSidebarControls:
             # Basic stats
             col1, col2 = st.sidebar.columns(2)
             with col1:
-                st.metric("📄 Total Docs", stats.get('total_vectors', 0))
+                st.metric("📄 Total Docs", stats.get('total_documents', stats.get('total_vectors', 0)))
             with col2:
                 st.metric("🔄 Unique", stats.get('unique_documents', 0))
             
@@ -144,6 +144,11 @@ class UsecaseTabManager:
                     self._get_available_services(),
                     help="Filter by AWS services mentioned in use cases"
                 )
+                type_filter = st.multiselect(
+                    "Document Types",
+                    self._get_available_types(),
+                    help="Filter by documentation type"
+                )
             
             with col3:
                 col3a, col3b = st.columns(2)
@@ -151,23 +156,35 @@ class UsecaseTabManager:
                     top_k = st.slider("Max Results", 1, 20, 10)
                 with col3b:
                     min_similarity = st.slider("Min Similarity", 0.1, 1.0, 0.2, 0.1)
+                search_mode = st.radio(
+                    "Search Mode",
+                    ["Semantic", "Hybrid"],
+                    horizontal=True,
+                    help="Hybrid fuses semantic and keyword (BM25) rankings"
+                )
         
         # Handle search
         if search_button and search_query:
             with st.spinner("🔍 Searching use case documentation..."):
                 try:
-                    results = self.redis_service.semantic_search_usecases(
+                    search = (self.redis_service.hybrid_search_usecases if search_mode == "Hybrid"
+                              else self.redis_service.semantic_search_usecases)
+                    results = search(
                         query=search_query,
                         top_k=top_k,
                         usecase_filter=usecase_filter if usecase_filter != "All" else None,
-                        min_similarity=min_similarity
+                        min_similarity=min_similarity,
+                        services_filter=service_filter or None,
+                        types_filter=type_filter or None
                     )
                     
                     if results:
                         # Show search method used
                         if results and 'match_type' in results[0]:
                             match_type = results[0]['match_type']
-                            if 'semantic_titan' in match_type:
+                            if 'hybrid' in match_type:
+                                st.success("🔀 Results from hybrid semantic + keyword search")
+                            elif 'semantic_titan' in match_type:
                                 st.success("🤖 Results from AWS Titan semantic search")
                             elif 'semantic_tfidf' in match_type:
                                 st.info("📊 Results from TF-IDF semantic search")
@@ -242,6 +259,15 @@ class UsecaseTabManager:
             # Return common AWS services as fallback
             return ['EC2', 'S3', 'RDS', 'Lambda', 'CloudFront', 'ELB', 'VPC', 'IAM', 'CloudWatch', 'Auto Scaling']
 
+    def _get_available_types(self) -> List[str]:
+        """Get list of available document types from stored data"""
+        try:
+            vector_stats = self.redis_service.get_usecase_statistics()
+            types = list(vector_stats.get('types_distribution', {}).keys())
+            return [t for t in types if t and t != 'Unknown']
+        except Exception:
+            return []
+
     def render_analytics_tab(self):
         """Render analytics tab with AWS Titan vector analytics"""
         st.header("📊 Use Case Analytics Dashboard")
@@ -636,6 +662,8 @@ class UsecaseTabManager:
 
             # System information table
             st.subheader("📋 Redis Server Information")
+            pool_stats = system_info.get('connection_pool', {})
+            cache_stats = system_info.get('embedding_service', {}).get('cache', {})
             info_data = {
                 'Redis Version': system_info.get('redis_version', 'N/A'),
                 'Uptime (days)': system_info.get('uptime_days', 0),
@@ -643,21 +671,59 @@ class UsecaseTabManager:
                 'Connected Clients': system_info.get('connected_clients', 0),
                 'Keyspace Hits': system_info.get('keyspace_hits', 0),
                 'Keyspace Misses': system_info.get('keyspace_misses', 0),
+                'Pool In Use / Created': f"{pool_stats.get('in_use', 0)} / {pool_stats.get('created', 0)}",
+                'Pool Waits': pool_stats.get('waits', 0),
+                'Embedding Cache Hit Rate': f"{cache_stats.get('hit_rate', 0.0):.0%}" if cache_stats.get('enabled') else 'Disabled',
                 'Service Type': system_info.get('service_type', 'N/A')
             }
 
             info_df = pd.DataFrame([info_data])
             st.dataframe(info_df, use_container_width=True)
 
+            # Vector spaces: one index per embedding method and dimension
+            vector_spaces = vector_stats.get('vector_spaces', {}) if vector_stats else {}
+            active_space = vector_stats.get('active_space') if vector_stats else None
+            if vector_spaces:
+                st.subheader("🧭 Vector Spaces")
+                st.caption(f"Searches use the active space: {active_space}")
+                st.dataframe(
+                    pd.DataFrame([{'Space': space, 'Vectors': count, 'Active': space == active_space}
+                                  for space, count in vector_spaces.items()]),
+                    use_container_width=True
+                )
+
+                reembedding = self.redis_service.get_reembedding_status()
+                if reembedding.get('state') == 'running':
+                    st.info(f"⏳ Re-embedding {reembedding.get('processed', 0)}/{reembedding.get('total', 0)} vectors")
+                elif any(count for space, count in vector_spaces.items() if space != active_space):
+                    if st.button(f"🔁 Re-embed older vectors into {active_space}", type="secondary"):
+                        if self.redis_service.start_reembedding_job():
+                            st.info("⏳ Started re-embedding in the background")
+
             # Data management section
             st.subheader("🗑️ Data Management")
             
+            run_in_background = st.checkbox(
+                "Run maintenance in background",
+                help="Run duplicate removal and clears in a background job; refresh the page to see progress"
+            )
+            maintenance = self.redis_service.get_maintenance_status()
+            if maintenance.get('state') == 'running':
+                st.info(f"⏳ {maintenance['job']} running: {maintenance.get('progress', {})}")
+            elif maintenance.get('state') in ('completed', 'failed'):
+                icon = "✅" if maintenance['state'] == 'completed' else "❌"
+                detail = maintenance.get('result', maintenance.get('error'))
+                st.caption(f"{icon} Last background job {maintenance['job']} {maintenance['state']}: {detail}")
+
             col1, col2, col3, col4 = st.columns(4)
             
             with col1:
                 if st.button("🔄 Remove Duplicates", type="secondary"):
-                    with st.spinner("Removing duplicates..."):
-                        result = self.redis_service.remove_duplicates()
+                    if run_in_background:
+                        self._start_maintenance_job("remove_duplicates")
+                    else:
+                        with st.spinner("Removing duplicates..."):
+                            result = self.redis_service.remove_duplicates(progress=self._progress_reporter())
                         duplicates_removed = result.get('duplicates_removed', 0)
                         unique_docs = result.get('unique_documents', 0)
                         
@@ -669,13 +735,19 @@ class UsecaseTabManager:
             
             with col2:
                 if st.button("🧠 Clear Vector Data Only", type="secondary"):
-                    cleared = self.redis_service.clear_all_vectors()
-                    st.success(f"✅ Cleared {cleared} vector keys")
+                    if run_in_background:
+                        self._start_maintenance_job("clear_vectors")
+                    else:
+                        cleared = self.redis_service.clear_all_vectors(progress=self._progress_reporter())
+                        st.success(f"✅ Cleared {cleared} vector keys")
             
             with col3:
                 if st.button("🗑️ Clear All Use Case Data", type="secondary"):
-                    cleared = self.redis_service.clear_all_usecase_data()
-                    st.success(f"✅ Cleared {cleared} total keys")
+                    if run_in_background:
+                        self._start_maintenance_job("clear_all")
+                    else:
+                        cleared = self.redis_service.clear_all_usecase_data(progress=self._progress_reporter())
+                        st.success(f"✅ Cleared {cleared} total keys")
                     # Clear session state
                     if 'current_usecase_data' in st.session_state:
                         del st.session_state['current_usecase_data']
@@ -726,6 +798,23 @@ class UsecaseTabManager:
             st.error(f"Error getting system info: {str(e)}")
             st.exception(e)
 
+    def _start_maintenance_job(self, job: str):
+        """Start a background maintenance job and report whether it was accepted"""
+        if self.redis_service.start_maintenance_job(job):
+            st.info(f"⏳ Started {job} in the background")
+        else:
+            st.warning("Another maintenance job is still running")
+
+    @staticmethod
+    def _progress_reporter():
+        """Progress callback that renders maintenance progress into a placeholder"""
+        placeholder = st.empty()
+
+        def report(progress: Dict[str, Any]):
+            placeholder.caption(" · ".join(f"{key}: {value}" for key, value in progress.items()))
+
+        return report
+
 
 # Backward compatibility - alias for the old class name
 TabManager = UsecaseTabManager
\ No newline at end of file
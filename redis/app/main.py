@@ -10,7 +10,8 @@ import os
 # Add the app directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from services.redis_service import RedisVectorService  # Import from redis_service.py
+from services.redis_service import get_redis_service  # Import from redis_service.py
+from services.ui_cache import CachedUsecaseService
 from components.sidebar import UsecaseSidebarControls
 from components.tabs import UsecaseTabManager
 from components.display import UsecaseDocumentDisplay
@@ -40,7 +41,9 @@ def main():
         
         # Initialize vector-enhanced Redis service
         try:
-            redis_service = RedisVectorService()
+            # Cached across reruns so the in-process vector index is reused
+            # Reads shared by the components are cached per page render (see services/ui_cache.py)
+            redis_service = CachedUsecaseService(get_redis_service())
             redis_connected, redis_message = redis_service.test_connection()
             
             if redis_connected:
@@ -224,11 +227,16 @@ def main():
                         
                         with st.spinner("🔍 Performing semantic search..."):
                             try:
-                                results = redis_service.semantic_search_usecases(
+                                search = (redis_service.hybrid_search_usecases
+                                          if search_data.get('search_mode') == 'hybrid'
+                                          else redis_service.semantic_search_usecases)
+                                results = search(
                                     query=search_data['query'],
                                     top_k=search_data.get('top_k', 10),
                                     usecase_filter=search_data.get('usecase_filter'),
-                                    min_similarity=search_data.get('min_similarity', 0.2)
+                                    min_similarity=search_data.get('min_similarity', 0.2),
+                                    services_filter=search_data.get('services_filter'),
+                                    types_filter=search_data.get('types_filter')
                                 )
                                 
                                 if results:
@@ -12,31 +12,110 @@ from .result import MCPResult
 
 
 class MCPClient:
-    def __init__(self, base_url: str = "http://localhost:5000"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:5000",
+        http2: bool = False,
+        max_connections: int = 20,
+        keepalive_expiry: float = 60.0
+    ):
         self.base_url = base_url.rstrip('/')
         self.mcp_url = f"{self.base_url}/mcp/"
         self.http_client = None
         self.session_id = None
+        self.http2 = http2
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._session_lock = None
         
     async def __aenter__(self):
         """Async context manager entry"""
-        self.http_client = httpx.AsyncClient(
+        await self.connect()
+        return self
+        
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit"""
+        await self.close()
+    
+    async def connect(self):
+        """Open the pooled HTTP client and initialize the MCP session"""
+        self.http_client = self._create_http_client()
+        self._session_lock = asyncio.Lock()
+        await self._initialize_session()
+    
+    async def close(self):
+        """Close the HTTP client and its pooled connections"""
+        if self.http_client:
+            await self.http_client.aclose()
+            self.http_client = None
+        self.session_id = None
+    
+    def _create_http_client(self) -> httpx.AsyncClient:
+        """HTTP client keeping connections alive between calls (HTTP/2 if requested and available)"""
+        http2 = self.http2
+        if http2:
+            try:
+                import h2  # noqa: F401 - httpx needs it for HTTP/2
+            except ImportError:
+                print("⚠️ HTTP/2 requested but the h2 package is not installed, using HTTP/1.1")
+                http2 = False
+        
+        return httpx.AsyncClient(
             timeout=120.0,
             follow_redirects=True,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry
+            ),
             headers={
                 "User-Agent": "MCP-Client/1.0",
                 "Accept": "application/json, text/event-stream",
                 "Content-Type": "application/json"
             }
         )
+    
+    async def _reinitialize_session(self, expired_session_id: Optional[str]):
+        """Start a new MCP session unless a concurrent call already replaced the expired one"""
+        async with self._session_lock:
+            if self.session_id == expired_session_id:
+                if expired_session_id:
+                    print(f"🔄 MCP session {expired_session_id} expired, re-initializing...")
+                self.session_id = None
+                await self._initialize_session()
+    
+    async def _post_in_session(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Optional[httpx.Response]:
+        """POST a request in the current session, re-initializing it once if the server dropped it
+
+        Returns None when no session can be established.
+        """
+        if not self.session_id and self.http_client:
+            await self._reinitialize_session(None)
+        if not self.session_id:
+            return None
         
-        await self._initialize_session()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit"""
-        if self.http_client:
-            await self.http_client.aclose()
+        session_id = self.session_id
+        response = await self._post(payload, session_id, timeout)
+        # Servers answer 404 for a session they no longer know (restart or expiry)
+        if response.status_code == 404:
+            await self._reinitialize_session(session_id)
+            if self.session_id:
+                response = await self._post(payload, self.session_id, timeout)
+        return response
+    
+    async def _post(self, payload: Dict[str, Any], session_id: str, timeout: Optional[float] = None) -> httpx.Response:
+        kwargs = {} if timeout is None else {"timeout": timeout}
+        return await self.http_client.post(
+            self.mcp_url,
+            json=payload,
+            headers={
+                "Content-Type": "application/json",
+                "Accept": "application/json, text/event-stream",
+                "mcp-session-id": session_id
+            },
+            **kwargs
+        )
     
     async def _initialize_session(self):
         """Initialize MCP session and get server's session ID"""
@@ -120,10 +199,6 @@ class MCPClient:
     
     async def call_tool(self, tool_name: str, arguments: Dict[str, Any], timeout: int = 100) -> MCPResult:
         """Call a tool on the MCP server"""
-        if not self.session_id:
-            print("❌ No active session")
-            return MCPResult(data=[], error="No active session")
-        
         payload = {
             "jsonrpc": "2.0",
             "id": f"call-{tool_name}-{uuid.uuid4()}",
@@ -137,16 +212,10 @@ class MCPClient:
         print(f"🔧 Calling tool: {tool_name}")
         
         try:
-            response = await self.http_client.post(
-                self.mcp_url,
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json, text/event-stream",
-                    "mcp-session-id": self.session_id
-                },
-                timeout=timeout
-            )
+            response = await self._post_in_session(payload, timeout=timeout)
+            if response is None:
+                print("❌ No active session")
+                return MCPResult(data=[], error="No active session")
             
             if response.status_code != 200:
                 print(f"📥 Error response body: {response.text}")
@@ -221,10 +290,6 @@ class MCPClient:
 
     async def list_tools(self) -> Dict[str, Any]:
         """List available tools"""
-        if not self.session_id:
-            print("❌ No active session")
-            return {"error": "No active session"}
-            
         payload = {
             "jsonrpc": "2.0",
             "id": f"list-tools-{uuid.uuid4()}",
@@ -233,15 +298,10 @@ class MCPClient:
         }
         
         try:
-            response = await self.http_client.post(
-                self.mcp_url,
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json, text/event-stream",
-                    "mcp-session-id": self.session_id
-                }
-            )
+            response = await self._post_in_session(payload)
+            if response is None:
+                print("❌ No active session")
+                return {"error": "No active session"}
             
             if response.status_code != 200:
                 return {"error": f"HTTP {response.status_code}: {response.text}"}
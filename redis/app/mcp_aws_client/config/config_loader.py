@@ -8,6 +8,10 @@ from pathlib import Path
 import os
 from datetime import datetime
 
+# Use cases of a batch run processed at the same time (global_settings.max_parallel_usecases)
+DEFAULT_MAX_PARALLEL_USECASES = 4
+MAX_PARALLEL_USECASES_RANGE = (1, 32)
+
 
 def load_config(config_path: str = "usecase_config.yaml") -> Dict[str, Any]:
     """Load use case configuration from YAML file"""
@@ -147,7 +151,7 @@ def load_batch_config(batch_config_path: str = "batch_usecases.yaml") -> Dict[st
         if config_file.exists():
             with open(config_file, 'r') as f:
                 batch_config = yaml.safe_load(f)
-                return _validate_batch_config(batch_config)
+                return validate_batch_config(batch_config)
         else:
             print(f"⚠️ Batch config file {batch_config_path} not found, creating example")
             example_config = _get_example_batch_config()
@@ -158,42 +162,69 @@ def load_batch_config(batch_config_path: str = "batch_usecases.yaml") -> Dict[st
         return _get_example_batch_config()
 
 
-def _validate_batch_config(batch_config: Dict[str, Any]) -> Dict[str, Any]:
-    """Validate batch configuration"""
+def validate_batch_config(batch_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate batch configuration and fill in defaults"""
     if not isinstance(batch_config.get("use_cases"), list):
         print("⚠️ Invalid batch config: use_cases must be a list")
         return _get_example_batch_config()
     
     # Validate each use case
     validated_cases = []
-    for i, use_case in enumerate(batch_config["use_cases"]):
-        if not isinstance(use_case, dict) or not use_case.get("query"):
-            print(f"⚠️ Skipping invalid use case {i+1}: missing query")
+    for i, use_case in enumerate(batch_config["use_cases"], 1):
+        validated_case = validate_batch_usecase(use_case)
+        if validated_case is None:
+            print(f"⚠️ Skipping invalid use case {i}: missing query")
             continue
-        
-        # Merge with default settings
-        default_case = {
-            "auto_refine": True,
-            "include_best_practices": True,
-            "include_cost_analysis": False,
-            "include_security": False,
-            "max_documents": 10,
-            "max_recommendations_per_doc": 3
-        }
-        validated_case = {**default_case, **use_case}
         validated_cases.append(validated_case)
     
     batch_config["use_cases"] = validated_cases
+    batch_config["global_settings"] = validate_batch_global_settings(batch_config)
+    
+    return batch_config
+
+
+def validate_batch_usecase(use_case: Any) -> Optional[Dict[str, Any]]:
+    """One batch use case merged with the default settings, or None without a query"""
+    if not isinstance(use_case, dict) or not use_case.get("query"):
+        return None
+    
+    # Merge with default settings
+    default_case = {
+        "auto_refine": True,
+        "include_best_practices": True,
+        "include_cost_analysis": False,
+        "include_security": False,
+        "max_documents": 10,
+        "max_recommendations_per_doc": 3
+    }
+    return {**default_case, **use_case}
+
+
+def validate_batch_global_settings(batch_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Validated global_settings of a batch configuration"""
+    global_settings = batch_config.get("global_settings")
     
     # Add global settings if not present
-    if "global_settings" not in batch_config:
-        batch_config["global_settings"] = {
+    if global_settings is None:
+        global_settings = {
             "use_bedrock": True,
             "enable_vectors": True,
-            "output_format": "comprehensive"
+            "output_format": "comprehensive",
+            "max_parallel_usecases": DEFAULT_MAX_PARALLEL_USECASES
         }
+    elif not isinstance(global_settings, dict):
+        print(f"⚠️ Invalid global_settings: {global_settings}, using defaults")
+        global_settings = {"max_parallel_usecases": DEFAULT_MAX_PARALLEL_USECASES}
     
-    return batch_config
+    # Validate batch concurrency
+    max_parallel = global_settings.get("max_parallel_usecases", DEFAULT_MAX_PARALLEL_USECASES)
+    min_val, max_val = MAX_PARALLEL_USECASES_RANGE
+    if isinstance(max_parallel, bool) or not isinstance(max_parallel, int) or not (min_val <= max_parallel <= max_val):
+        print(f"⚠️ Invalid max_parallel_usecases: {max_parallel}, using default: {DEFAULT_MAX_PARALLEL_USECASES}")
+        max_parallel = DEFAULT_MAX_PARALLEL_USECASES
+    global_settings["max_parallel_usecases"] = max_parallel
+    
+    return global_settings
 
 
 def _get_example_batch_config() -> Dict[str, Any]:
@@ -203,7 +234,8 @@ def _get_example_batch_config() -> Dict[str, Any]:
             "use_bedrock": True,
             "enable_vectors": True,
             "output_format": "comprehensive",
-            "mcp_url": "http://localhost:5000"
+            "mcp_url": "http://localhost:5000",
+            "max_parallel_usecases": DEFAULT_MAX_PARALLEL_USECASES
         },
         "use_cases": [
             {
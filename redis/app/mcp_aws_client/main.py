@@ -6,10 +6,17 @@ Main entry point for MCP AWS Use Case Client
 import asyncio
 import json
 import argparse
+import os
+import time
 from pathlib import Path
+from typing import Dict, Any, List
+
+import yaml
 
 from .client.mcp_client import MCPClient
-from .config.config_loader import load_config
+from .config.config_loader import (
+    load_config, validate_batch_usecase, validate_batch_global_settings, MAX_PARALLEL_USECASES_RANGE
+)
 from .processors.usecase_processor import UsecaseProcessor
 from .processors.data_converter import format_usecase_output_data
 from .utils.testing import test_connection, run_diagnostic_tests
@@ -180,115 +187,241 @@ async def main():
             return 1
 
 
+def _batch_usecase_config(usecase: Dict[str, Any], use_bedrock: bool) -> Dict[str, Any]:
+    """Processing configuration of one batch use case"""
+    return {
+        "user_query": usecase.get('query'),
+        "use_bedrock": use_bedrock,
+        "auto_refine": usecase.get('auto_refine', True),
+        "include_best_practices": usecase.get('include_best_practices', True),
+        "include_cost_analysis": usecase.get('include_cost_analysis', False),
+        "include_security": usecase.get('include_security', False),
+        "max_documents": usecase.get('max_documents', 10),
+        "max_recommendations_per_doc": usecase.get('max_recommendations_per_doc', 3)
+    }
+
+
+def _write_json_atomic(path: Path, data: Any):
+    """Write JSON so that an interrupted run never leaves a partial file behind"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def _load_batch_results(results_file: Path) -> Dict[int, Dict[str, Any]]:
+    """Results streamed by earlier runs, by use case id (the last record wins)"""
+    previous = {}
+    if not results_file.exists():
+        return previous
+    with open(results_file, 'r') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                previous[int(record["usecase_id"])] = record
+            except (ValueError, KeyError, TypeError):
+                # A line cut short by an interrupted run
+                continue
+    return previous
+
+
+async def _run_batch_usecase(
+    client: MCPClient,
+    limit: asyncio.Semaphore,
+    usecase_id: int,
+    total: int,
+    usecase: Dict[str, Any],
+    use_bedrock: bool,
+    output_file: Path
+) -> Dict[str, Any]:
+    """Process one use case of a batch and save its output as soon as it is done"""
+    async with limit:
+        print(f"\n🎯 Processing use case {usecase_id}/{total}")
+        print(f"Query: {usecase.get('query', 'N/A')}")
+        started = time.perf_counter()
+        
+        try:
+            # One processor per use case; all of them share the client's MCP session
+            processor = UsecaseProcessor(client, use_bedrock=use_bedrock)
+            usecase_config = _batch_usecase_config(usecase, use_bedrock)
+            
+            output_data = await processor.generate_usecase_documentation(usecase_config)
+            
+            if "error" not in output_data:
+                # Format and save individual result
+                formatted_output = format_usecase_output_data(output_data, usecase_config)
+                _write_json_atomic(output_file, formatted_output)
+                
+                summary = processor.get_usecase_processing_summary(output_data)
+                print(f"✅ Use case {usecase_id}: {summary.get('total_documents', 0)} docs, "
+                      f"{summary.get('total_recommendations', 0)} recs")
+                return {
+                    "usecase_id": usecase_id,
+                    "query": usecase.get('query'),
+                    "status": "success",
+                    "summary": summary,
+                    "output_file": str(output_file),
+                    "seconds": round(time.perf_counter() - started, 2)
+                }
+            
+            print(f"❌ Use case {usecase_id} error: {output_data['error']}")
+            return {
+                "usecase_id": usecase_id,
+                "query": usecase.get('query'),
+                "status": "error",
+                "error": output_data['error'],
+                "seconds": round(time.perf_counter() - started, 2)
+            }
+        
+        except Exception as e:
+            print(f"❌ Use case {usecase_id} exception: {str(e)}")
+            return {
+                "usecase_id": usecase_id,
+                "query": usecase.get('query'),
+                "status": "error",
+                "error": str(e),
+                "seconds": round(time.perf_counter() - started, 2)
+            }
+
+
 async def run_batch_usecases():
-    """Run multiple use cases from a batch file"""
+    """Run multiple use cases from a batch file, several at a time
+    
+    Up to ``global_settings.max_parallel_usecases`` use cases run concurrently
+    over one shared MCP session. Each result is written to the output
+    directory as soon as it completes (usecase_NNN.json plus a line in
+    batch_results.jsonl); with --resume, use cases whose output file already
+    exists are not processed again.
+    """
     parser = argparse.ArgumentParser(description="AWS MCP Batch Use Case Client")
-    parser.add_argument("--batch-file", required=True, help="JSON file with multiple use cases")
+    parser.add_argument("--batch-file", required=True, help="YAML or JSON file with multiple use cases")
     parser.add_argument("--url", default="http://localhost:5000", help="Server URL")
     parser.add_argument("--output-dir", default="batch_output", help="Output directory")
     parser.add_argument("--use-bedrock", action="store_true", help="Enable Bedrock AI enhancement")
+    parser.add_argument("--max-parallel", type=int, help="Use cases processed at once (overrides max_parallel_usecases)")
+    parser.add_argument("--resume", action="store_true", help="Skip use cases whose output file already exists")
     
     args = parser.parse_args()
     
-    # Load batch file
+    min_val, max_val = MAX_PARALLEL_USECASES_RANGE
+    if args.max_parallel is not None and not (min_val <= args.max_parallel <= max_val):
+        print(f"❌ --max-parallel must be between {min_val} and {max_val}, got {args.max_parallel}")
+        return 1
+    
+    # Load batch file (YAML; JSON is valid YAML)
     try:
         with open(args.batch_file, 'r') as f:
-            batch_data = json.load(f)
+            batch_data = yaml.safe_load(f)
     except Exception as e:
         print(f"❌ Error loading batch file: {str(e)}")
         return 1
     
+    if not isinstance(batch_data, dict) or not isinstance(batch_data.get('use_cases'), list):
+        print("❌ Invalid batch file: use_cases must be a list")
+        return 1
+    
+    # Use cases keep their position in the batch file as id, so output file
+    # names stay stable for --resume when other entries are fixed or added
+    use_cases = batch_data['use_cases']
+    global_settings = validate_batch_global_settings(batch_data)
+    max_parallel = args.max_parallel
+    if max_parallel is None:
+        max_parallel = global_settings['max_parallel_usecases']
+    
     # Create output directory
     output_dir = Path(args.output_dir)
     output_dir.mkdir(exist_ok=True)
+    results_file = output_dir / "batch_results.jsonl"
     
-    # Initialize client
-    client = MCPClient(args.url)
+    previous_results = _load_batch_results(results_file) if args.resume else {}
+    if not args.resume and results_file.exists():
+        results_file.unlink()
     
-    async with client:
-        # Check server health
-        health = await client.health_check()
-        if health.get('status') != 'ok':
-            print("❌ Server is not healthy, exiting...")
-            return 1
-        
-        processor = UsecaseProcessor(client, use_bedrock=args.use_bedrock)
+    results: List[Dict[str, Any]] = []
+    pending = []
+    for i, raw_usecase in enumerate(use_cases, 1):
+        usecase = validate_batch_usecase(raw_usecase)
+        if usecase is None:
+            print(f"⚠️ Skipping invalid use case {i}: missing query")
+            results.append({
+                "usecase_id": i,
+                "query": None,
+                "status": "error",
+                "error": "Missing query"
+            })
+            continue
         
-        results = []
+        output_file = output_dir / f"usecase_{i:03d}.json"
+        if args.resume and output_file.exists():
+            previous = previous_results.get(i, {})
+            results.append({
+                **previous,
+                "usecase_id": i,
+                "query": usecase.get('query'),
+                "status": "success",
+                "output_file": str(output_file),
+                "resumed": True
+            })
+            continue
+        pending.append((i, usecase, output_file))
+    
+    resumed = len([r for r in results if r.get('resumed')])
+    if resumed:
+        print(f"⏭️ Resuming: {resumed} use cases already done, {len(pending)} to process")
+    
+    if pending:
+        # Initialize client
+        client = MCPClient(args.url)
         
-        for i, usecase in enumerate(batch_data.get('use_cases', []), 1):
-            print(f"\n🎯 Processing use case {i}/{len(batch_data['use_cases'])}")
-            print(f"Query: {usecase.get('query', 'N/A')}")
+        async with client:
+            # Check server health
+            health = await client.health_check()
+            if health.get('status') != 'ok':
+                print("❌ Server is not healthy, exiting...")
+                return 1
             
-            try:
-                usecase_config = {
-                    "user_query": usecase.get('query'),
-                    "use_bedrock": args.use_bedrock,
-                    "auto_refine": usecase.get('auto_refine', True),
-                    "include_best_practices": usecase.get('include_best_practices', True),
-                    "include_cost_analysis": usecase.get('include_cost_analysis', False),
-                    "include_security": usecase.get('include_security', False),
-                    "max_documents": usecase.get('max_documents', 10),
-                    "max_recommendations_per_doc": usecase.get('max_recommendations_per_doc', 3)
-                }
-                
-                output_data = await processor.generate_usecase_documentation(usecase_config)
-                
-                if "error" not in output_data:
-                    # Format and save individual result
-                    formatted_output = format_usecase_output_data(output_data, usecase_config)
-                    
-                    output_file = output_dir / f"usecase_{i:03d}.json"
-                    with open(output_file, 'w') as f:
-                        json.dump(formatted_output, f, indent=2, default=str)
-                    
-                    summary = processor.get_usecase_processing_summary(output_data)
-                    results.append({
-                        "usecase_id": i,
-                        "query": usecase.get('query'),
-                        "status": "success",
-                        "summary": summary,
-                        "output_file": str(output_file)
-                    })
-                    
-                    print(f"✅ Success: {summary.get('total_documents', 0)} docs, {summary.get('total_recommendations', 0)} recs")
-                else:
-                    results.append({
-                        "usecase_id": i,
-                        "query": usecase.get('query'),
-                        "status": "error",
-                        "error": output_data['error']
-                    })
-                    print(f"❌ Error: {output_data['error']}")
-                    
-            except Exception as e:
-                results.append({
-                    "usecase_id": i,
-                    "query": usecase.get('query'),
-                    "status": "error",
-                    "error": str(e)
-                })
-                print(f"❌ Exception: {str(e)}")
-        
-        # Save batch results summary
-        batch_summary = {
-            "total_usecases": len(batch_data['use_cases']),
-            "successful": len([r for r in results if r['status'] == 'success']),
-            "failed": len([r for r in results if r['status'] == 'error']),
-            "results": results
-        }
-        
-        summary_file = output_dir / "batch_summary.json"
-        with open(summary_file, 'w') as f:
-            json.dump(batch_summary, f, indent=2, default=str)
-        
-        print(f"\n📊 Batch Processing Complete:")
-        print(f"  ✅ Successful: {batch_summary['successful']}")
-        print(f"  ❌ Failed: {batch_summary['failed']}")
-        print(f"  📁 Output directory: {output_dir}")
-        print(f"  📋 Summary file: {summary_file}")
-        
-        return 0 if batch_summary['failed'] == 0 else 1
+            print(f"🚀 Processing {len(pending)} use cases, {max_parallel} at a time")
+            limit = asyncio.Semaphore(max_parallel)
+            started = time.perf_counter()
+            
+            tasks = [
+                _run_batch_usecase(client, limit, i, len(use_cases), usecase, args.use_bedrock, output_file)
+                for i, usecase, output_file in pending
+            ]
+            with open(results_file, 'a') as stream:
+                for completed in asyncio.as_completed(tasks):
+                    result = await completed
+                    results.append(result)
+                    # Stream each result so an interrupted run can be resumed
+                    stream.write(json.dumps(result, default=str) + "\n")
+                    stream.flush()
+                    print(f"📈 {len(results)}/{len(use_cases)} use cases done "
+                          f"({time.perf_counter() - started:.1f}s)")
+    
+    results.sort(key=lambda r: r['usecase_id'])
+    
+    # Save batch results summary
+    batch_summary = {
+        "total_usecases": len(use_cases),
+        "successful": len([r for r in results if r['status'] == 'success']),
+        "failed": len([r for r in results if r['status'] == 'error']),
+        "resumed": len([r for r in results if r.get('resumed')]),
+        "max_parallel_usecases": max_parallel,
+        "results": results
+    }
+    
+    summary_file = output_dir / "batch_summary.json"
+    _write_json_atomic(summary_file, batch_summary)
+    
+    print(f"\n📊 Batch Processing Complete:")
+    print(f"  ✅ Successful: {batch_summary['successful']}")
+    print(f"  ❌ Failed: {batch_summary['failed']}")
+    if batch_summary['resumed']:
+        print(f"  ⏭️ Skipped (already done): {batch_summary['resumed']}")
+    print(f"  📁 Output directory: {output_dir}")
+    print(f"  📋 Summary file: {summary_file}")
+    
+    return 0 if batch_summary['failed'] == 0 else 1
 
 
 if __name__ == "__main__":
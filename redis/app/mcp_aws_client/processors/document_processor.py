@@ -2,18 +2,25 @@
 Document processing utilities for AWS documentation
 """
 
+import asyncio
 import json
-from typing import List, Dict, Any, Union
+import os
+import time
+from typing import List, Dict, Any, Optional, Union
 
 from ..client.mcp_client import MCPClient
 from .data_converter import convert_to_dict
 
+# Tool calls (read_documentation/recommend) in flight at once per processing run
+MAX_CONCURRENT_FETCHES = int(os.getenv('MCP_MAX_CONCURRENT_FETCHES', 10))
+
 
 class DocumentProcessor:
     """Handles processing of AWS documentation and recommendations"""
     
-    def __init__(self, client: MCPClient):
+    def __init__(self, client: MCPClient, max_concurrent_fetches: int = MAX_CONCURRENT_FETCHES):
         self.client = client
+        self.max_concurrent_fetches = max(1, max_concurrent_fetches)
     
     async def search_and_process_documents(
         self, 
@@ -52,12 +59,15 @@ class DocumentProcessor:
         print(f"✅ Found {len(search_results)} search results")
         
         # Step 2: Process documents
+        fetch_timings = []
         doc_content = await self._process_documents(
             search_results[:max_documents],
-            max_recommendations_per_doc
+            max_recommendations_per_doc,
+            timings=fetch_timings
         )
         
         output_data["doc_content"] = doc_content
+        output_data["fetch_timings"] = fetch_timings
         
         return output_data
     
@@ -81,35 +91,117 @@ class DocumentProcessor:
     async def _process_documents(
         self, 
         search_results: List[Dict[str, Any]], 
-        max_recommendations_per_doc: int
+        max_recommendations_per_doc: int,
+        timings: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
-        """Process documents and their recommendations"""
-        doc_content = []
+        """Process documents and their recommendations concurrently
         
-        for idx, result in enumerate(search_results):
-            print(f"📄 Processing document {idx + 1}/{len(search_results)}...")
-            
-            url = self._extract_url_from_result(result)
-            if not url:
+        At most ``max_concurrent_fetches`` tool calls run at once. The output
+        keeps the search result order (each document followed by its
+        recommendations), a failing document is skipped without affecting
+        the others, and one timing per tool call is appended to ``timings``.
+        """
+        limit = asyncio.Semaphore(self.max_concurrent_fetches)
+        timings = [] if timings is None else timings
+        started = time.perf_counter()
+        
+        processed = await asyncio.gather(
+            *(
+                self._process_document(idx, len(search_results), result,
+                                       max_recommendations_per_doc, limit, timings)
+                for idx, result in enumerate(search_results)
+            ),
+            return_exceptions=True
+        )
+        
+        doc_content = []
+        for idx, items in enumerate(processed):
+            if isinstance(items, Exception):
+                print(f"❌ Failed to process document {idx + 1}: {items}")
                 continue
-            
-            # Read main document content
-            main_content = await self._read_document_content(url)
-            if main_content:
-                doc_content.append({
-                    "type": "main_content",
-                    "source": url,
-                    "content": main_content
-                })
-            
-            # Process recommendations for this document
-            recommendations = await self._process_document_recommendations(
-                url, max_recommendations_per_doc
-            )
-            doc_content.extend(recommendations)
+            doc_content.extend(items)
+        
+        if timings:
+            slowest = max(timings, key=lambda timing: timing["seconds"])
+            print(f"⏱️ {len(timings)} tool calls for {len(search_results)} documents in "
+                  f"{time.perf_counter() - started:.2f}s (slowest: {slowest['tool']} "
+                  f"{slowest['url']} {slowest['seconds']:.2f}s)")
         
         return doc_content
     
+    async def _process_document(
+        self,
+        idx: int,
+        total: int,
+        result: Union[Dict[str, Any], str],
+        max_recommendations_per_doc: int,
+        limit: Optional[asyncio.Semaphore] = None,
+        timings: Optional[List[Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Read one document and its recommendations (main content first)"""
+        print(f"📄 Processing document {idx + 1}/{total}...")
+        
+        url = self._extract_url_from_result(result)
+        if not url:
+            return []
+        
+        # The main content and the recommendations only depend on the URL;
+        # either one failing keeps what the other returned
+        main_content, recommendations = await asyncio.gather(
+            self._read_document_content(url, limit, timings),
+            self._process_document_recommendations(
+                url, max_recommendations_per_doc, limit, timings
+            ),
+            return_exceptions=True
+        )
+        if isinstance(main_content, Exception):
+            print(f"  ❌ Failed to read content from {url}: {main_content}")
+            main_content = None
+        if isinstance(recommendations, Exception):
+            print(f"  ❌ Failed to get recommendations for {url}: {recommendations}")
+            recommendations = []
+        
+        items = []
+        if main_content:
+            items.append({
+                "type": "main_content",
+                "source": url,
+                "content": main_content
+            })
+        items.extend(recommendations)
+        return items
+    
+    async def _call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        url: str,
+        limit: Optional[asyncio.Semaphore] = None,
+        timings: Optional[List[Dict[str, Any]]] = None
+    ):
+        """Call a tool, holding a slot of ``limit`` and recording how long it took"""
+        if limit is None:
+            return await self.client.call_tool(tool_name, arguments=arguments, timeout=100)
+        
+        async with limit:
+            started = time.perf_counter()
+            ok = False
+            try:
+                result = await self.client.call_tool(tool_name, arguments=arguments, timeout=100)
+                ok = not result.error
+                return result
+            finally:
+                # Calls that raise (timeouts, dropped connections) are recorded too
+                seconds = time.perf_counter() - started
+                if timings is not None:
+                    timings.append({
+                        "tool": tool_name,
+                        "url": url,
+                        "seconds": round(seconds, 3),
+                        "ok": ok
+                    })
+                print(f"  ⏱️ {tool_name} {url}: {seconds:.2f}s")
+    
     def _extract_url_from_result(self, result: Union[Dict[str, Any], str]) -> str:
         """Extract URL from search result"""
         if isinstance(result, dict):
@@ -118,13 +210,16 @@ class DocumentProcessor:
             return result
         return None
     
-    async def _read_document_content(self, url: str) -> Any:
+    async def _read_document_content(
+        self,
+        url: str,
+        limit: Optional[asyncio.Semaphore] = None,
+        timings: Optional[List[Dict[str, Any]]] = None
+    ) -> Any:
         """Read content from a document URL"""
         print(f"  📖 Reading content from: {url}")
-        content_result = await self.client.call_tool(
-            "read_documentation",
-            arguments={"url": url},
-            timeout=100,
+        content_result = await self._call_tool(
+            "read_documentation", {"url": url}, url, limit, timings
         )
         
         if content_result.error:
@@ -136,14 +231,14 @@ class DocumentProcessor:
     async def _process_document_recommendations(
         self, 
         url: str, 
-        max_recommendations: int
+        max_recommendations: int,
+        limit: Optional[asyncio.Semaphore] = None,
+        timings: Optional[List[Dict[str, Any]]] = None
     ) -> List[Dict[str, Any]]:
-        """Process recommendations for a document"""
+        """Process recommendations for a document (read concurrently, kept in order)"""
         print(f"  💡 Getting recommendations for: {url}")
-        recommendations_result = await self.client.call_tool(
-            "recommend",
-            arguments={"context": url},
-            timeout=100
+        recommendations_result = await self._call_tool(
+            "recommend", {"context": url}, url, limit, timings
         )
         
         if recommendations_result.error:
@@ -153,15 +248,24 @@ class DocumentProcessor:
         recommendations = self._normalize_recommendations(recommendations_result.data)
         
         # Process each recommendation
-        processed_recommendations = []
+        rec_urls = []
         for rec_idx, rec in enumerate(recommendations[:max_recommendations]):
             print(f"    🔗 Processing recommendation {rec_idx + 1}/{min(len(recommendations), max_recommendations)}...")
             
             rec_url = self._extract_url_from_result(rec)
-            if not rec_url:
+            if rec_url:
+                rec_urls.append(rec_url)
+        
+        rec_contents = await asyncio.gather(
+            *(self._read_document_content(rec_url, limit, timings) for rec_url in rec_urls),
+            return_exceptions=True
+        )
+        
+        processed_recommendations = []
+        for rec_url, rec_content in zip(rec_urls, rec_contents):
+            if isinstance(rec_content, Exception):
+                print(f"    ❌ Failed to read recommendation {rec_url}: {rec_content}")
                 continue
-                
-            rec_content = await self._read_document_content(rec_url)
             if rec_content:
                 processed_recommendations.append({
                     "type": "recommendation",
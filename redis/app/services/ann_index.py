@@ -0,0 +1,509 @@
+"""
+In-process approximate nearest-neighbour (ANN) index for use case vectors
+"""
+
+import io
+import os
+import tempfile
+import threading
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .quantization import QUANTIZATION_MODES, ProductQuantizer
+
+
+class IVFIndex:
+    """Inverted-file cosine index over a contiguous row matrix.
+
+    Rows are L2-normalised on insert so cosine similarity is a plain dot
+    product. Until ``min_train_size`` vectors are present the index answers
+    queries exactly; after that it clusters the rows with spherical k-means
+    and only scans the ``nprobe`` closest lists per query, which is the
+    recall-vs-latency knob.
+
+    ``quantization`` sets how rows are held (and persisted): "none" keeps
+    float32, "float16" halves it, "int8" stores one byte per component
+    with a per-row scale and "pq" stores ``pq_subvectors`` bytes of
+    product-quantization codes, scored by asymmetric distance computation.
+    PQ rows stay float32 until ``pq_min_train_size`` vectors are present;
+    the codebooks are then trained once and every row is encoded.
+
+    With ``mmap_dir`` the row matrix is a memory-mapped file there instead
+    of heap memory, so the OS can page it out under memory pressure. The
+    file is unlinked right after it is mapped and never outlives the index.
+    """
+
+    FORMAT_VERSION = 2
+    # Rows scored per block; bounds the temporaries of a scan independently of its size
+    SCORE_BLOCK_ROWS = 16384
+
+    def __init__(self, dim: Optional[int] = None, nprobe: int = 8,
+                 min_train_size: int = 1024, retrain_growth: float = 4.0,
+                 quantization: str = "none", pq_subvectors: int = 64,
+                 pq_min_train_size: int = 1024, mmap_dir: Optional[str] = None):
+        if quantization not in QUANTIZATION_MODES:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+        self.dim = dim
+        self.nprobe = nprobe
+        self.min_train_size = min_train_size
+        self.retrain_growth = retrain_growth
+        self.quantization = quantization
+        self.pq_subvectors = pq_subvectors
+        self.pq_min_train_size = max(pq_min_train_size, 256)
+        self.mmap_dir = mmap_dir
+
+        self._lock = threading.RLock()
+        self._pq: Optional[ProductQuantizer] = None
+        self._matrix = self._empty_matrix(0)
+        self._scales = np.ones(0, dtype=np.float32)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._free: List[int] = []
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._centroids: Optional[np.ndarray] = None
+        self._lists: List[set] = []
+        self._trained_size = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+    def __contains__(self, vector_id: str) -> bool:
+        with self._lock:
+            return vector_id in self._rows
+
+    @property
+    def is_trained(self) -> bool:
+        return self._centroids is not None
+
+    def ids(self) -> List[str]:
+        """Return the ids of all live vectors"""
+        with self._lock:
+            return list(self._rows.keys())
+
+    # ------------------------------------------------------------------
+    # Mutation
+    # ------------------------------------------------------------------
+
+    def add(self, vector_id: str, vector: np.ndarray) -> bool:
+        """Insert or replace a vector. Returns False if the dimension does not match."""
+        vector = self._normalize(vector)
+        if vector is None:
+            return False
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vector.shape[0]
+                self._matrix = self._empty_matrix(0)
+            if vector.shape[0] != self.dim:
+                return False
+
+            if vector_id in self._rows:
+                self.remove(vector_id)
+
+            row = self._allocate_row()
+            self._matrix[row], self._scales[row] = self._encode(vector)
+            self._ids[row] = vector_id
+            self._rows[vector_id] = row
+
+            if self._centroids is not None:
+                list_no = int(np.argmax(self._centroids @ vector))
+                self._assign[row] = list_no
+                self._lists[list_no].add(row)
+
+            self._maybe_train()
+            return True
+
+    def remove(self, vector_id: str) -> bool:
+        """Remove a vector by id"""
+        with self._lock:
+            row = self._rows.pop(vector_id, None)
+            if row is None:
+                return False
+
+            list_no = int(self._assign[row])
+            if list_no >= 0:
+                self._lists[list_no].discard(row)
+            self._assign[row] = -1
+            self._ids[row] = None
+            self._matrix[row] = 0.0
+            self._free.append(row)
+            return True
+
+    def get_vector(self, vector_id: str) -> Optional[np.ndarray]:
+        """Return the stored (normalised) vector for an id"""
+        with self._lock:
+            row = self._rows.get(vector_id)
+            if row is None:
+                return None
+            return self._decode_rows(np.array([row]))[0]
+
+    def train(self, nlist: Optional[int] = None, iterations: int = 8, seed: int = 0):
+        """Cluster the stored rows into ``nlist`` inverted lists (spherical k-means)"""
+        with self._lock:
+            live_rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+            if len(live_rows) == 0:
+                return
+
+            if nlist is None:
+                nlist = int(np.clip(np.sqrt(len(live_rows)), 8, 1024))
+            nlist = min(nlist, len(live_rows))
+
+            rng = np.random.default_rng(seed)
+            sample_size = min(len(live_rows), nlist * 40)
+            sample = self._decode_rows(rng.choice(live_rows, size=sample_size, replace=False))
+
+            centroids = sample[rng.choice(sample_size, size=nlist, replace=False)].copy()
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                sums = np.zeros_like(centroids)
+                np.add.at(sums, labels, sample)
+                norms = np.linalg.norm(sums, axis=1)
+                empty = norms == 0
+                # Re-seed empty clusters with random sample points
+                if empty.any():
+                    sums[empty] = sample[rng.choice(sample_size, size=int(empty.sum()))]
+                    norms[empty] = np.linalg.norm(sums[empty], axis=1)
+                centroids = sums / norms[:, None]
+
+            self._centroids = centroids.astype(np.float32)
+            self._assign_all(live_rows)
+            self._trained_size = len(live_rows)
+
+    def train_quantizer(self, sample_size: int = 16384, seed: int = 0):
+        """Train the PQ codebooks on the stored rows and encode every row"""
+        with self._lock:
+            if self.quantization != "pq" or self._pq is not None or not self._rows:
+                return
+
+            live_rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+            rng = np.random.default_rng(seed)
+            sample = live_rows[rng.choice(len(live_rows), size=min(sample_size, len(live_rows)), replace=False)]
+
+            quantizer = ProductQuantizer(self.dim, m=self.pq_subvectors)
+            quantizer.train(self._matrix[sample], seed=seed)
+
+            matrix = self._matrix
+            self._pq = quantizer
+            codes = self._empty_matrix(matrix.shape[0])
+            for start in range(0, len(live_rows), 4096):
+                batch = live_rows[start:start + 4096]
+                codes[batch] = quantizer.encode(matrix[batch])
+            self._matrix = codes
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, query: np.ndarray, k: int, nprobe: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Return up to ``k`` (vector_id, cosine similarity) pairs, best first"""
+        query = self._normalize(query)
+        if query is None or self.dim is None or query.shape[0] != self.dim or k <= 0:
+            return []
+
+        with self._lock:
+            candidates = self._candidate_rows(query, nprobe or self.nprobe)
+            if len(candidates) == 0:
+                return []
+
+            return self._rank(candidates, query[None, :], k)[0]
+
+    def search_subset(self, query: np.ndarray, vector_ids: Iterable[str], k: int) -> List[Tuple[str, float]]:
+        """Exact search restricted to ``vector_ids`` (e.g. pre-filtered candidates)"""
+        query = self._normalize(query)
+        if query is None or self.dim is None or query.shape[0] != self.dim or k <= 0:
+            return []
+
+        with self._lock:
+            rows = np.fromiter(
+                (self._rows[vector_id] for vector_id in vector_ids if vector_id in self._rows),
+                dtype=np.int64
+            )
+            if len(rows) == 0:
+                return []
+            return self._rank(rows, query[None, :], k)[0]
+
+    def search_many(self, queries: np.ndarray, k: int, nprobe: Optional[int] = None,
+                    vector_ids: Optional[Iterable[str]] = None) -> List[List[Tuple[str, float]]]:
+        """Answer several queries with matrix-matrix products, one result list per query
+
+        The rows of every probed list are scored against all queries at once;
+        rows outside a query's own probes are masked out. ``vector_ids``
+        restricts the search to those ids (exact), like ``search_subset``.
+        """
+        queries = np.asarray(queries, dtype=np.float32)
+        if queries.ndim == 1:
+            queries = queries[None, :]
+        results: List[List[Tuple[str, float]]] = [[] for _ in range(len(queries))]
+        if self.dim is None or queries.shape[1] != self.dim or k <= 0 or len(queries) == 0:
+            return results
+
+        norms = np.linalg.norm(queries, axis=1)
+        valid = np.flatnonzero((norms > 0) & np.isfinite(norms))
+        if len(valid) == 0:
+            return results
+        normalized = queries[valid] / norms[valid, None]
+
+        with self._lock:
+            probe_mask = None
+            if vector_ids is not None:
+                rows = np.fromiter(
+                    (self._rows[vector_id] for vector_id in vector_ids if vector_id in self._rows),
+                    dtype=np.int64
+                )
+            elif self._centroids is None:
+                rows = np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+            else:
+                nprobe = max(1, min(nprobe or self.nprobe, len(self._centroids)))
+                probes = np.argpartition(-(normalized @ self._centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+                probe_mask = np.zeros((len(normalized), len(self._centroids)), dtype=bool)
+                np.put_along_axis(probe_mask, probes, True, axis=1)
+                members = [self._lists[p] for p in np.unique(probes)]
+                rows = np.fromiter((row for lst in members for row in lst), dtype=np.int64,
+                                   count=sum(len(lst) for lst in members))
+
+            if len(rows) == 0:
+                return results
+            for i, hits in zip(valid, self._rank(rows, normalized, k, probe_mask)):
+                results[i] = hits
+        return results
+
+    def _rank(self, rows: np.ndarray, queries: np.ndarray, k: int,
+              probe_mask: Optional[np.ndarray] = None) -> List[List[Tuple[str, float]]]:
+        """Top-k rows per query, best first
+
+        Rows are scored block by block and merged into a running top-k with
+        argpartition, so memory stays O(k + block) however many rows are
+        scanned. ``probe_mask`` (queries x lists) hides rows of lists a query
+        did not probe.
+        """
+        prepared = self._prepare_queries(queries)
+        n_queries = len(queries)
+        best_rows = np.empty((n_queries, 0), dtype=np.int64)
+        best_scores = np.empty((n_queries, 0), dtype=np.float32)
+
+        for start in range(0, len(rows), self.SCORE_BLOCK_ROWS):
+            block = rows[start:start + self.SCORE_BLOCK_ROWS]
+            scores = self._scores(block, prepared)
+            if probe_mask is not None:
+                scores = np.where(probe_mask[:, self._assign[block]], scores, -np.inf)
+            best_rows = np.hstack([best_rows, np.broadcast_to(block, scores.shape)])
+            best_scores = np.hstack([best_scores, scores])
+            if best_scores.shape[1] > k:
+                top = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                best_rows = np.take_along_axis(best_rows, top, axis=1)
+                best_scores = np.take_along_axis(best_scores, top, axis=1)
+
+        order = np.argsort(-best_scores, axis=1)
+        return [
+            [(self._ids[best_rows[q, i]], float(best_scores[q, i])) for i in order[q] if best_scores[q, i] > -np.inf]
+            for q in range(n_queries)
+        ]
+
+    def _candidate_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        if self._centroids is None:
+            return np.fromiter(self._rows.values(), dtype=np.int64, count=len(self._rows))
+
+        nprobe = max(1, min(nprobe, len(self._centroids)))
+        centroid_scores = self._centroids @ query
+        probe = np.argpartition(-centroid_scores, nprobe - 1)[:nprobe]
+        size = sum(len(self._lists[p]) for p in probe)
+        rows = np.empty(size, dtype=np.int64)
+        offset = 0
+        for p in probe:
+            members = self._lists[p]
+            rows[offset:offset + len(members)] = np.fromiter(members, dtype=np.int64, count=len(members))
+            offset += len(members)
+        return rows
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+
+    def to_bytes(self) -> bytes:
+        """Serialise the index (no pickle) so it can be stored in Redis"""
+        with self._lock:
+            buffer = io.BytesIO()
+            used = len(self._ids)
+            np.savez(
+                buffer,
+                header=np.array([self.FORMAT_VERSION, self.dim or 0, self.nprobe, self._trained_size,
+                                 self.pq_subvectors], dtype=np.int64),
+                quantization=np.array(self.quantization),
+                matrix=self._matrix[:used],
+                scales=self._scales[:used],
+                ids=np.array([vid or "" for vid in self._ids], dtype=np.str_),
+                assign=self._assign[:used],
+                centroids=self._centroids if self._centroids is not None else np.zeros((0, self.dim or 0), dtype=np.float32),
+                pq=np.frombuffer(self._pq.to_bytes(), dtype=np.uint8) if self._pq is not None else np.zeros(0, dtype=np.uint8)
+            )
+            return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, **kwargs) -> 'IVFIndex':
+        """Restore an index produced by ``to_bytes``
+
+        Version 1 snapshots (float32 only) are still readable.
+        """
+        with np.load(io.BytesIO(data), allow_pickle=False) as payload:
+            header = [int(x) for x in payload["header"]]
+            version, dim, nprobe, trained_size = header[:4]
+            if version not in (1, cls.FORMAT_VERSION):
+                raise ValueError(f"Unsupported ANN index format version: {version}")
+
+            kwargs.setdefault("nprobe", nprobe)
+            if version == 1:
+                kwargs["quantization"] = "none"
+            else:
+                kwargs["quantization"] = str(payload["quantization"])
+                kwargs["pq_subvectors"] = header[4]
+            index = cls(dim=dim or None, **kwargs)
+            if version > 1 and len(payload["pq"]):
+                index._pq = ProductQuantizer.from_bytes(payload["pq"].tobytes())
+            matrix = payload["matrix"]
+            index._matrix = index._empty_matrix(len(matrix))
+            index._matrix[:] = matrix
+            index._scales = (payload["scales"].astype(np.float32, copy=True) if version > 1
+                             else np.ones(len(index._matrix), dtype=np.float32))
+            index._ids = [vid or None for vid in payload["ids"].tolist()]
+            index._assign = payload["assign"].astype(np.int32, copy=True)
+            centroids = payload["centroids"]
+            index._centroids = centroids.astype(np.float32) if len(centroids) else None
+            index._trained_size = trained_size
+
+        index._rows = {vid: row for row, vid in enumerate(index._ids) if vid is not None}
+        index._free = [row for row, vid in enumerate(index._ids) if vid is None]
+        if index._centroids is not None:
+            index._lists = [set() for _ in range(len(index._centroids))]
+            for row in index._rows.values():
+                index._lists[int(index._assign[row])].add(row)
+        return index
+
+    def get_info(self) -> Dict[str, Any]:
+        """Get index statistics"""
+        with self._lock:
+            return {
+                "type": "ivf",
+                "vectors": len(self._rows),
+                "dimension": self.dim,
+                "trained": self.is_trained,
+                "nlist": len(self._centroids) if self._centroids is not None else 0,
+                "nprobe": self.nprobe,
+                "quantization": self.quantization,
+                "pq_trained": self._pq is not None,
+                "bytes_per_vector": self._bytes_per_row(),
+                "capacity": self._matrix.shape[0],
+                "memory_bytes": int(self._matrix.nbytes + (self._scales.nbytes if self.quantization == "int8" else 0))
+            }
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _normalize(vector: np.ndarray) -> Optional[np.ndarray]:
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        if vector.size == 0 or norm == 0 or not np.isfinite(norm):
+            return None
+        return vector / norm
+
+    def _empty_matrix(self, capacity: int) -> np.ndarray:
+        if self._pq is not None:
+            shape, dtype = (capacity, self._pq.code_size), np.uint8
+        else:
+            shape = (capacity, self.dim or 0)
+            dtype = {"float16": np.float16, "int8": np.int8}.get(self.quantization, np.float32)
+
+        if not self.mmap_dir or capacity == 0 or not shape[1]:
+            return np.zeros(shape, dtype=dtype)
+
+        os.makedirs(self.mmap_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(prefix="ivf-", suffix=".mat", dir=self.mmap_dir)
+        os.close(fd)
+        matrix = np.memmap(path, dtype=dtype, mode="w+", shape=shape)
+        try:
+            # The mapping stays valid after the unlink; the space is freed with the last reference
+            os.unlink(path)
+        except OSError:
+            pass
+        return matrix
+
+    def _bytes_per_row(self) -> int:
+        row_bytes = self._matrix.shape[1] * self._matrix.itemsize
+        return row_bytes + (self._scales.itemsize if self.quantization == "int8" else 0)
+
+    def _encode(self, vector: np.ndarray) -> Tuple[np.ndarray, float]:
+        """Quantize one normalised vector to its stored row and scale"""
+        if self._pq is not None:
+            return self._pq.encode(vector)[0], 1.0
+        if self.quantization == "int8":
+            scale = float(np.max(np.abs(vector))) / 127.0 or 1.0
+            return np.clip(np.rint(vector / scale), -127, 127).astype(np.int8), scale
+        return vector, 1.0
+
+    def _decode_rows(self, rows: np.ndarray) -> np.ndarray:
+        """Float32 (approximate) vectors of the given rows"""
+        if self._pq is not None:
+            return self._pq.decode(self._matrix[rows])
+        vectors = self._matrix[rows].astype(np.float32)
+        if self.quantization == "int8":
+            vectors *= self._scales[rows, None]
+        return vectors
+
+    def _prepare_queries(self, queries: np.ndarray) -> np.ndarray:
+        """Per-query state for ``_scores``: PQ distance tables, or the queries themselves"""
+        if self._pq is not None:
+            return self._pq.distance_tables(queries)
+        return queries
+
+    def _scores(self, rows: np.ndarray, queries: np.ndarray) -> np.ndarray:
+        """Inner products (queries x rows) of the prepared queries with the given rows,
+        computed on the quantized form with one matrix product"""
+        if self._pq is not None:
+            return self._pq.scores_many(queries, self._matrix[rows])
+        if self.quantization == "none":
+            return queries @ self._matrix[rows].T
+        scores = queries @ self._matrix[rows].astype(np.float32).T
+        if self.quantization == "int8":
+            scores *= self._scales[rows]
+        return scores
+
+    def _allocate_row(self) -> int:
+        if self._free:
+            return self._free.pop()
+
+        row = len(self._ids)
+        if row >= self._matrix.shape[0]:
+            capacity = max(64, self._matrix.shape[0] * 2)
+            matrix = self._empty_matrix(capacity)
+            matrix[:row] = self._matrix[:row]
+            self._matrix = matrix
+            scales = np.ones(capacity, dtype=np.float32)
+            scales[:row] = self._scales[:row]
+            self._scales = scales
+            assign = np.full(capacity, -1, dtype=np.int32)
+            assign[:row] = self._assign[:row]
+            self._assign = assign
+        self._ids.append(None)
+        return row
+
+    def _assign_all(self, rows: np.ndarray):
+        self._lists = [set() for _ in range(len(self._centroids))]
+        self._assign[:] = -1
+        for start in range(0, len(rows), 4096):
+            batch = rows[start:start + 4096]
+            labels = np.argmax(self._decode_rows(batch) @ self._centroids.T, axis=1)
+            self._assign[batch] = labels
+            for row, label in zip(batch.tolist(), labels.tolist()):
+                self._lists[label].add(row)
+
+    def _maybe_train(self):
+        size = len(self._rows)
+        if self.quantization == "pq" and self._pq is None and size >= self.pq_min_train_size:
+            self.train_quantizer()
+        if size < self.min_train_size:
+            return
+        if self._centroids is None or size >= self._trained_size * self.retrain_growth:
+            self.train()
@@ -0,0 +1,87 @@
+"""
+Split long documents into overlapping, heading-aligned chunks before embedding
+"""
+
+import re
+from typing import List, Tuple
+
+CHUNK_STRATEGIES = ("none", "tokens", "headings")
+
+_TOKEN = re.compile(r"\S+")
+# Markdown ATX headings ("## Title") and setext headings ("Title" over "=====")
+_HEADING = re.compile(r"^(?:#{1,6}[ \t]+\S.*|[^\n]*\S[^\n]*\n[=-]{3,}[ \t]*)$", re.MULTILINE)
+
+
+class DocumentChunker:
+    """Split text into chunks of at most ``max_tokens`` whitespace tokens.
+
+    ``tokens`` slides a window of ``max_tokens`` with ``overlap_tokens``
+    shared between neighbours. ``headings`` cuts at Markdown headings and
+    packs consecutive sections into one chunk while they fit; sections that
+    are too long fall back to overlapping token windows. ``none`` keeps the
+    whole text as one chunk.
+
+    Chunks are returned as ``(start, end)`` character spans into the input,
+    so the chunk text can be recovered from the stored document later.
+    """
+
+    def __init__(self, strategy: str = "headings", max_tokens: int = 300, overlap_tokens: int = 40):
+        if strategy not in CHUNK_STRATEGIES:
+            raise ValueError(f"Unknown chunk strategy: {strategy} (expected one of {', '.join(CHUNK_STRATEGIES)})")
+        self.strategy = strategy
+        self.max_tokens = max(1, max_tokens)
+        self.overlap_tokens = max(0, min(overlap_tokens, self.max_tokens - 1))
+
+    def split(self, text: str) -> List[Tuple[int, int]]:
+        """Chunk spans of ``text`` in document order (one span for short texts)"""
+        tokens = [match.span() for match in _TOKEN.finditer(text)]
+        if not tokens:
+            return []
+        if self.strategy == "none" or len(tokens) <= self.max_tokens:
+            return [(tokens[0][0], tokens[-1][1])]
+        if self.strategy == "tokens":
+            return self._windows(tokens)
+        return self._sections(text, tokens)
+
+    def chunks(self, text: str) -> List[str]:
+        """Chunk texts of ``text``"""
+        return [text[start:end] for start, end in self.split(text)]
+
+    def _windows(self, tokens: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        spans = []
+        step = self.max_tokens - self.overlap_tokens
+        for first in range(0, len(tokens), step):
+            window = tokens[first:first + self.max_tokens]
+            spans.append((window[0][0], window[-1][1]))
+            if first + self.max_tokens >= len(tokens):
+                break
+        return spans
+
+    def _sections(self, text: str, tokens: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+        # Token ranges [first, last) of each section; a section starts at a heading
+        starts = [match.start() for match in _HEADING.finditer(text)]
+        boundaries = [0]
+        position = 0
+        for offset in starts:
+            while position < len(tokens) and tokens[position][0] < offset:
+                position += 1
+            if boundaries[-1] < position < len(tokens):
+                boundaries.append(position)
+        boundaries.append(len(tokens))
+
+        spans = []
+        pending = None
+        for first, last in zip(boundaries, boundaries[1:]):
+            if pending is not None and last - pending[0] <= self.max_tokens:
+                pending = (pending[0], last)
+                continue
+            if pending is not None:
+                spans.append((tokens[pending[0]][0], tokens[pending[1] - 1][1]))
+                pending = None
+            if last - first > self.max_tokens:
+                spans.extend(self._windows(tokens[first:last]))
+            else:
+                pending = (first, last)
+        if pending is not None:
+            spans.append((tokens[pending[0]][0], tokens[pending[1] - 1][1]))
+        return spans
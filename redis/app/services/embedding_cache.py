@@ -0,0 +1,190 @@
+"""
+Two-tier cache for embedding vectors: in-process LRU in front of Redis
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from .redis_pool import mget
+from .vector_codec import encode_vector, decode_vector, is_encoded
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different copies of a text share a cache entry"""
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+class EmbeddingCache:
+    """Embedding cache keyed by sha256(model_id, dimensions, normalized text).
+
+    Lookups go to the in-process LRU first and then to Redis, where entries
+    are stored in the binary vector format with a TTL. The Redis tier is
+    size-bounded by a sorted set of keys ordered by write time; the oldest
+    entries are evicted once it grows past ``max_redis_entries``.
+    """
+
+    def __init__(self, redis_client=None, key_prefix: str = "embedding_cache",
+                 max_local_entries: int = 4096, max_redis_entries: int = 100000,
+                 ttl_seconds: int = 30 * 24 * 3600, enabled: bool = True):
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.registry_key = f"{key_prefix}:registry"
+        self.max_local_entries = max_local_entries
+        self.max_redis_entries = max_redis_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self._local: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.local_evictions = 0
+        self.redis_evictions = 0
+
+    def make_key(self, model_id: str, dimensions: int, text: str) -> str:
+        """Build the cache key for a text embedded by a given model"""
+        digest = hashlib.sha256(
+            f"{model_id}\x00{dimensions}\x00{normalize_text(text)}".encode("utf-8")
+        ).hexdigest()
+        return f"{self.key_prefix}:{digest}"
+
+    def get(self, model_id: str, dimensions: int, text: str) -> Optional[np.ndarray]:
+        """Return a cached embedding or None"""
+        return self.get_many(model_id, dimensions, [text])[0]
+
+    def get_many(self, model_id: str, dimensions: int, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Look up many texts; local misses are fetched from Redis in one MGET"""
+        results: List[Optional[np.ndarray]] = [None] * len(texts)
+        if not self.enabled or not texts:
+            return results
+
+        keys = [self.make_key(model_id, dimensions, text) for text in texts]
+        remote = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._local.get(key)
+                if vector is not None:
+                    self._local.move_to_end(key)
+                    self.local_hits += 1
+                    results[i] = vector
+                else:
+                    remote.append(i)
+
+        if remote and self.redis_client is not None:
+            try:
+                values = mget(self.redis_client, [keys[i] for i in remote])
+            except Exception as e:
+                print(f"⚠️ [CACHE] Embedding cache read failed: {e}")
+                values = [None] * len(remote)
+
+            for i, data in zip(remote, values):
+                if data and is_encoded(data):
+                    results[i] = decode_vector(data)
+                    self._remember(keys[i], results[i])
+                    with self._lock:
+                        self.redis_hits += 1
+
+        with self._lock:
+            self.misses += sum(1 for vector in results if vector is None)
+        return results
+
+    def put(self, model_id: str, dimensions: int, text: str, vector: np.ndarray):
+        """Store an embedding in both tiers"""
+        self.put_many(model_id, dimensions, [text], [vector])
+
+    def put_many(self, model_id: str, dimensions: int, texts: List[str], vectors: List[Optional[np.ndarray]]):
+        """Store many embeddings; Redis writes go out in one pipeline"""
+        if not self.enabled:
+            return
+
+        entries = [
+            (self.make_key(model_id, dimensions, text), np.asarray(vector, dtype=np.float32))
+            for text, vector in zip(texts, vectors) if vector is not None
+        ]
+        if not entries:
+            return
+
+        for key, vector in entries:
+            self._remember(key, vector)
+        with self._lock:
+            self.stores += len(entries)
+
+        if self.redis_client is None:
+            return
+
+        try:
+            now = time.time()
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, vector in entries:
+                pipe.set(key, encode_vector(vector), ex=self.ttl_seconds)
+            pipe.zadd(self.registry_key, {key: now for key, _ in entries})
+            # Entries that expired through their TTL no longer count against the bound
+            pipe.zremrangebyscore(self.registry_key, "-inf", now - self.ttl_seconds)
+            pipe.zcard(self.registry_key)
+            size = pipe.execute()[-1]
+
+            overflow = size - self.max_redis_entries
+            if overflow > 0:
+                evicted = [member for member, _ in self.redis_client.zpopmin(self.registry_key, overflow)]
+                if evicted:
+                    self.redis_client.unlink(*evicted)
+                with self._lock:
+                    self.redis_evictions += len(evicted)
+        except Exception as e:
+            print(f"⚠️ [CACHE] Embedding cache write failed: {e}")
+
+    def clear(self):
+        """Drop all cached embeddings from both tiers"""
+        with self._lock:
+            self._local.clear()
+
+        if self.redis_client is None:
+            return
+        keys = [member for member in self.redis_client.zrange(self.registry_key, 0, -1)]
+        for start in range(0, len(keys), 500):
+            self.redis_client.unlink(*keys[start:start + 500])
+        self.redis_client.unlink(self.registry_key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and tier sizes"""
+        with self._lock:
+            lookups = self.local_hits + self.redis_hits + self.misses
+            stats = {
+                "enabled": self.enabled,
+                "local_entries": len(self._local),
+                "max_local_entries": self.max_local_entries,
+                "local_hits": self.local_hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "hit_rate": (self.local_hits + self.redis_hits) / lookups if lookups else 0.0,
+                "stores": self.stores,
+                "local_evictions": self.local_evictions,
+                "redis_evictions": self.redis_evictions,
+                "ttl_seconds": self.ttl_seconds
+            }
+
+        if self.redis_client is not None:
+            try:
+                stats["redis_entries"] = self.redis_client.zcard(self.registry_key)
+            except Exception:
+                stats["redis_entries"] = None
+        stats["max_redis_entries"] = self.max_redis_entries
+        return stats
+
+    def _remember(self, key: str, vector: np.ndarray):
+        with self._lock:
+            self._local[key] = vector
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local_entries:
+                self._local.popitem(last=False)
+                self.local_evictions += 1
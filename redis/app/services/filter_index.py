@@ -0,0 +1,145 @@
+"""
+Secondary indexes that resolve search filters to candidate vector ids
+"""
+
+import uuid
+from typing import Dict, Any, Iterable, List, Optional, Set, Tuple
+
+
+class FilterIndex:
+    """Redis SET indexes for the usecase, AWS service and document type filters.
+
+    ``candidates`` turns a filter combination into the set of matching
+    vector ids with SUNIONSTORE/SINTER inside Redis, so searches can be
+    restricted before any vector or metadata is loaded. The usecase filter
+    keeps its substring semantics: it is matched against a small registry
+    holding one entry per stored usecase, not against every vector.
+
+    Keys (under ``key_prefix``):
+        usecases         HASH  usecase id -> lowercased query/refined query/summary
+        usecase:<id>     SET   vector ids of that usecase
+        service:<name>   SET   vector ids mentioning the service
+        type:<name>      SET   vector ids of the document type
+        count            STRING number of indexed vectors
+    """
+
+    def __init__(self, redis_client, key_prefix: str):
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.usecases_key = f"{key_prefix}:usecases"
+        self.count_key = f"{key_prefix}:count"
+
+    def _usecase_key(self, usecase_id: str) -> str:
+        return f"{self.key_prefix}:usecase:{usecase_id}"
+
+    def _service_key(self, service: str) -> str:
+        return f"{self.key_prefix}:service:{service}"
+
+    def _type_key(self, doc_type: str) -> str:
+        return f"{self.key_prefix}:type:{doc_type}"
+
+    @staticmethod
+    def _usecase_id(vector_id: str, metadata: Dict[str, Any]) -> str:
+        # Vector ids are "<usecase timestamp>:<doc index>"
+        return metadata.get('timestamp') or vector_id.rsplit(':', 1)[0]
+
+    def _memberships(self, vector_id: str, metadata: Dict[str, Any]) -> List[str]:
+        keys = [self._usecase_key(self._usecase_id(vector_id, metadata))]
+        keys.extend(self._service_key(service) for service in metadata.get('key_services', []))
+        if metadata.get('type'):
+            keys.append(self._type_key(metadata['type']))
+        return keys
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def index(self, pipe, vector_id: str, metadata: Dict[str, Any]):
+        """Queue the index writes for one stored vector"""
+        usecase_text = "\n".join([
+            metadata.get('original_query', ''),
+            metadata.get('refined_query', ''),
+            metadata.get('usecase_summary', '')
+        ]).lower()
+        pipe.hset(self.usecases_key, self._usecase_id(vector_id, metadata), usecase_text)
+        for key in self._memberships(vector_id, metadata):
+            pipe.sadd(key, vector_id)
+        pipe.incr(self.count_key)
+
+    def remove(self, pipe, vector_id: str, metadata: Optional[Dict[str, Any]]):
+        """Queue the index removal for one vector"""
+        if metadata:
+            for key in self._memberships(vector_id, metadata):
+                pipe.srem(key, vector_id)
+        pipe.decr(self.count_key)
+
+    def count(self) -> int:
+        """Number of indexed vectors"""
+        return int(self.redis_client.get(self.count_key) or 0)
+
+    def rebuild(self, records: Iterable[Tuple[str, Optional[Dict[str, Any]]]], batch_size: int = 256) -> int:
+        """Drop the indexes and rebuild them from (vector_id, metadata) pairs"""
+        keys = list(self.redis_client.scan_iter(match=f"{self.key_prefix}:*", count=1000))
+        for start in range(0, len(keys), 500):
+            self.redis_client.unlink(*keys[start:start + 500])
+
+        rebuilt = 0
+        pipe = self.redis_client.pipeline(transaction=False)
+        for vector_id, metadata in records:
+            if metadata:
+                self.index(pipe, vector_id, metadata)
+            else:
+                pipe.incr(self.count_key)
+            rebuilt += 1
+            if rebuilt % batch_size == 0:
+                pipe.execute()
+        pipe.execute()
+        return rebuilt
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def matching_usecases(self, usecase_filter: str) -> List[str]:
+        """Usecase ids whose query, refined query or summary contains the filter"""
+        needle = usecase_filter.lower()
+        registry = self.redis_client.hgetall(self.usecases_key)
+        return [usecase_id for usecase_id, text in registry.items() if needle in text]
+
+    def candidates(self, usecase_filter: Optional[str] = None,
+                   services: Optional[List[str]] = None,
+                   doc_types: Optional[List[str]] = None) -> Optional[Set[str]]:
+        """Vector ids matching every given filter (any of the listed services/types).
+
+        Returns None when no filter is active.
+        """
+        groups = []
+        if usecase_filter and usecase_filter != "All":
+            groups.append([self._usecase_key(uid) for uid in self.matching_usecases(usecase_filter)])
+        if services:
+            groups.append([self._service_key(service) for service in services])
+        if doc_types:
+            groups.append([self._type_key(doc_type) for doc_type in doc_types])
+
+        if not groups:
+            return None
+        if any(not group for group in groups):
+            return set()
+
+        pipe = self.redis_client.pipeline(transaction=True)
+        operands = []
+        scratch_keys = []
+        for group in groups:
+            if len(group) == 1:
+                operands.append(group[0])
+                continue
+            scratch_key = f"{self.key_prefix}:tmp:{uuid.uuid4().hex}"
+            pipe.sunionstore(scratch_key, group)
+            operands.append(scratch_key)
+            scratch_keys.append(scratch_key)
+        pipe.sinter(operands)
+        if scratch_keys:
+            pipe.delete(*scratch_keys)
+        replies = pipe.execute()
+
+        return set(replies[len(scratch_keys)])
@@ -0,0 +1,130 @@
+"""
+Incremental TF-IDF embeddings over a fixed hashed feature space
+"""
+
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+
+class HashingTfidfEmbedder:
+    """TF-IDF embedder that never needs a refit.
+
+    Terms are hashed into ``n_features`` columns, so the vector space is
+    fixed up front and stored vectors stay comparable across ingests.
+    Document frequencies are accumulated online in a Redis HASH (one field
+    per feature column) next to a document counter; every process reads
+    the shared statistics and refreshes them at most every
+    ``refresh_interval`` seconds.
+    """
+
+    def __init__(self, n_features: int = 2048, redis_client=None, key_prefix: str = "tfidf",
+                 refresh_interval: float = 30.0):
+        self.n_features = n_features
+        self.refresh_interval = refresh_interval
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            alternate_sign=False,
+            norm=None,
+            stop_words='english',
+            ngram_range=(1, 2)
+        )
+
+        self._lock = threading.Lock()
+        self._df = np.zeros(n_features, dtype=np.float64)
+        self._n_docs = 0
+        self._loaded_at = 0.0
+        self.attach(redis_client, key_prefix)
+
+    def attach(self, redis_client, key_prefix: str):
+        """Keep document frequencies in Redis under ``key_prefix``"""
+        self.redis_client = redis_client
+        self.df_key = f"{key_prefix}:df"
+        self.docs_key = f"{key_prefix}:docs"
+        self.refresh(force=True)
+
+    def partial_fit(self, texts: List[str]):
+        """Add the document frequencies of new documents"""
+        texts = [text for text in texts if text and text.strip()]
+        if not texts:
+            return
+
+        counts = self.vectorizer.transform(texts)
+        counts.data[:] = 1
+        doc_freq = np.asarray(counts.sum(axis=0)).ravel()
+        features = np.flatnonzero(doc_freq)
+
+        if self.redis_client is None:
+            with self._lock:
+                self._df += doc_freq
+                self._n_docs += len(texts)
+            return
+
+        pipe = self.redis_client.pipeline(transaction=True)
+        for feature in features.tolist():
+            pipe.hincrby(self.df_key, feature, int(doc_freq[feature]))
+        pipe.incrby(self.docs_key, len(texts))
+        pipe.execute()
+        self.refresh(force=True)
+
+    def refresh(self, force: bool = False):
+        """Reload the shared document frequencies from Redis"""
+        if self.redis_client is None:
+            return
+        if not force and time.monotonic() - self._loaded_at < self.refresh_interval:
+            return
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hgetall(self.df_key)
+        pipe.get(self.docs_key)
+        raw_df, raw_docs = pipe.execute()
+
+        df = np.zeros(self.n_features, dtype=np.float64)
+        for feature, count in raw_df.items():
+            feature = int(feature)
+            if feature < self.n_features:
+                df[feature] = int(count)
+
+        with self._lock:
+            self._df = df
+            self._n_docs = int(raw_docs or 0)
+            self._loaded_at = time.monotonic()
+
+    def reset(self):
+        """Forget all document frequencies"""
+        if self.redis_client is not None:
+            self.redis_client.delete(self.df_key, self.docs_key)
+        with self._lock:
+            self._df = np.zeros(self.n_features, dtype=np.float64)
+            self._n_docs = 0
+            self._loaded_at = time.monotonic()
+
+    def idf(self) -> np.ndarray:
+        """Smoothed inverse document frequency per feature column"""
+        with self._lock:
+            return np.log((1.0 + self._n_docs) / (1.0 + self._df)) + 1.0
+
+    def embed(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Embed texts as L2-normalised sublinear TF-IDF vectors"""
+        if not texts:
+            return []
+        self.refresh()
+
+        counts = self.vectorizer.transform(texts).astype(np.float32)
+        counts.data = 1.0 + np.log(counts.data)
+        weighted = normalize(counts.multiply(self.idf().astype(np.float32)).tocsr())
+        return [weighted.getrow(i).toarray().ravel().astype(np.float32) for i in range(len(texts))]
+
+    def get_info(self) -> Dict[str, Any]:
+        """Get feature space and corpus statistics"""
+        with self._lock:
+            return {
+                "type": "hashing_tfidf",
+                "n_features": self.n_features,
+                "documents": self._n_docs,
+                "active_features": int(np.count_nonzero(self._df))
+            }
@@ -3,14 +3,26 @@ MCP service for AWS documentation fetching with Bedrock query enhancement for us
 """
 
 import asyncio
+import atexit
 import boto3
+import concurrent.futures
 import json
-from typing import Dict, Any, List
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import Dict, Any, List, Optional
 from botocore.exceptions import ClientError
 
 from mcp_aws_client import MCPClient, DocumentProcessor
 from mcp_aws_client.processors.data_converter import format_usecase_output_data
 
+# Pooled MCP connections (see MCPSessionLoop)
+MCP_HTTP2 = os.getenv('MCP_HTTP2', 'false').lower() == 'true'
+MCP_MAX_CONNECTIONS = int(os.getenv('MCP_MAX_CONNECTIONS', 20))
+MCP_KEEPALIVE_EXPIRY = float(os.getenv('MCP_KEEPALIVE_EXPIRY', 60))
+# Seconds a synchronous caller waits for a use case to be generated
+MCP_SYNC_TIMEOUT = float(os.getenv('MCP_SYNC_TIMEOUT', 600))
+
 
 class BedrockQueryEnhancer:
     """Use Bedrock to enhance and refine usecase queries and process documentation"""
@@ -278,14 +290,119 @@ Return ONLY the JSON response:"""
             }
 
 
+class MCPSessionLoop:
+    """Background event loop thread owning long-lived MCP clients.
+    
+    One MCPClient per server URL is connected on first use and kept open,
+    so its pooled keep-alive (optionally HTTP/2) connections and its MCP
+    session are reused by every request instead of paying a TCP/TLS setup
+    and an ``initialize`` handshake each time. The client re-initializes
+    the session when the server no longer knows it. Synchronous callers
+    hand coroutines to the loop with ``run``.
+    """
+    
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._clients: Dict[str, MCPClient] = {}
+        self._clients_lock: Optional[asyncio.Lock] = None
+        self._thread = threading.Thread(target=self._run_loop, name="mcp-session-loop", daemon=True)
+        self._thread.start()
+    
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+    
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run ``coro`` on the background loop and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            # Not the builtin TimeoutError before Python 3.11; stop the coroutine
+            # so it does not keep running on the shared loop
+            future.cancel()
+            raise
+    
+    async def client(self, mcp_url: str) -> MCPClient:
+        """Connected client for ``mcp_url`` (must be awaited on this loop)"""
+        if self._clients_lock is None:
+            self._clients_lock = asyncio.Lock()
+        async with self._clients_lock:
+            client = self._clients.get(mcp_url)
+            if client is None or client.http_client is None:
+                client = MCPClient(
+                    mcp_url,
+                    http2=MCP_HTTP2,
+                    max_connections=MCP_MAX_CONNECTIONS,
+                    keepalive_expiry=MCP_KEEPALIVE_EXPIRY
+                )
+                await client.connect()
+                self._clients[mcp_url] = client
+        return client
+    
+    def owns_running_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self.loop
+        except RuntimeError:
+            return False
+    
+    async def _close_clients(self):
+        for client in self._clients.values():
+            await client.close()
+        self._clients.clear()
+    
+    def close(self):
+        """Close the pooled clients and stop the loop"""
+        if not self._thread.is_alive():
+            return
+        try:
+            self.run(self._close_clients(), timeout=10)
+        except Exception as e:
+            print(f"⚠️ Error closing MCP clients: {str(e)}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=10)
+
+
+_session_loop: Optional[MCPSessionLoop] = None
+_session_loop_lock = threading.Lock()
+
+
+def get_mcp_session_loop() -> MCPSessionLoop:
+    """Process-wide MCPSessionLoop, started on first use"""
+    global _session_loop
+    with _session_loop_lock:
+        if _session_loop is None or not _session_loop._thread.is_alive():
+            _session_loop = MCPSessionLoop()
+            atexit.register(_session_loop.close)
+        return _session_loop
+
+
 class MCPService:
-    """Handle MCP client operations for AWS documentation with Bedrock enhancement for use cases"""
+    """Handle MCP client operations for AWS documentation with Bedrock enhancement for use cases
+    
+    The synchronous methods run on the shared MCPSessionLoop and reuse its
+    pooled MCP client; awaiting the async methods from another event loop
+    opens a client for the call as before.
+    """
     
     def __init__(self, mcp_url: str = "http://localhost:5000", use_bedrock: bool = True):
         self.mcp_url = mcp_url
         self.use_bedrock = use_bedrock
         self.bedrock_enhancer = BedrockQueryEnhancer() if use_bedrock else None
     
+    @asynccontextmanager
+    async def _mcp_client(self):
+        """MCP client for the current call: the pooled one on the session loop, else a fresh one"""
+        session_loop = _session_loop
+        if session_loop is not None and session_loop.owns_running_loop():
+            yield await session_loop.client(self.mcp_url)
+        else:
+            async with MCPClient(self.mcp_url) as client:
+                yield client
+    
+    def _run_sync(self, coro):
+        return get_mcp_session_loop().run(coro, timeout=MCP_SYNC_TIMEOUT)
+    
     async def generate_usecase_documentation(self, usecase_config: Dict[str, Any]) -> Dict[str, Any]:
         """Generate comprehensive use case documentation"""
         try:
@@ -351,20 +468,14 @@ class MCPService:
     def generate_usecase_documentation_sync(self, usecase_config: Dict[str, Any]) -> Dict[str, Any]:
         """Synchronous wrapper for generate_usecase_documentation"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self.generate_usecase_documentation(usecase_config))
-            loop.close()
-            return result
+            return self._run_sync(self.generate_usecase_documentation(usecase_config))
         except Exception as e:
-            return {"error": str(e)}
+            return {"error": str(e) or type(e).__name__}
     
     async def fetch_usecase_documentation(self, usecase_query: str) -> Dict[str, Any]:
         """Fetch AWS documentation for a specific use case with Bedrock enhancement"""
         try:
-            client = MCPClient(self.mcp_url)
-            
-            async with client:
+            async with self._mcp_client() as client:
                 # Check server health
                 health = await client.health_check()
                 if health.get('status') != 'ok':
@@ -374,7 +485,8 @@ class MCPService:
                 processor = DocumentProcessor(client)
                 
                 # Step 1: Refine the usecase query using Bedrock
-                refined_query = self._refine_query(usecase_query)
+                # (blocking boto3 calls run in a worker thread to keep the loop serving other requests)
+                refined_query = await asyncio.to_thread(self._refine_query, usecase_query)
                 print(f"🔍 Original query: {usecase_query}")
                 print(f"🔍 Refined query: {refined_query}")
                 
@@ -389,7 +501,8 @@ class MCPService:
                     return output_data
                 
                 # Step 3: Enhance documentation using Bedrock
-                enhanced_docs = self._enhance_documentation(
+                enhanced_docs = await asyncio.to_thread(
+                    self._enhance_documentation,
                     output_data.get('doc_content', []), 
                     usecase_query
                 )
@@ -455,19 +568,14 @@ class MCPService:
     def fetch_usecase_documentation_sync(self, usecase_query: str) -> Dict[str, Any]:
         """Synchronous wrapper for async fetch method"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self.fetch_usecase_documentation(usecase_query))
-            loop.close()
-            return result
+            return self._run_sync(self.fetch_usecase_documentation(usecase_query))
         except Exception as e:
-            return {"error": str(e)}
+            return {"error": str(e) or type(e).__name__}
     
     async def test_connection(self) -> Dict[str, Any]:
         """Test MCP server connection and Bedrock availability"""
         try:
-            client = MCPClient(self.mcp_url)
-            async with client:
+            async with self._mcp_client() as client:
                 health = await client.health_check()
                 tools = await client.list_tools()
                 
@@ -488,13 +596,9 @@ class MCPService:
     def test_connection_sync(self) -> Dict[str, Any]:
         """Synchronous wrapper for connection test"""
         try:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self.test_connection())
-            loop.close()
-            return result
+            return self._run_sync(self.test_connection())
         except Exception as e:
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e) or type(e).__name__}
 
 
 # Example usage
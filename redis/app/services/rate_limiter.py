@@ -0,0 +1,51 @@
+"""
+Thread-safe token bucket for pacing calls against a requests-per-second quota
+"""
+
+import threading
+import time
+from typing import Dict, Any
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second, holding at most ``capacity``.
+
+    ``acquire`` blocks until a token is available, so callers on several
+    threads share one quota. A rate of 0 disables pacing.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.waited_seconds = 0.0
+
+    def acquire(self, tokens: float = 1.0):
+        """Take ``tokens`` from the bucket, sleeping until they are available"""
+        if self.rate <= 0:
+            return
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                delay = (tokens - self._tokens) / self.rate
+                self.waits += 1
+                self.waited_seconds += delay
+            time.sleep(delay)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pacing statistics"""
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "waits": self.waits,
+            "waited_seconds": round(self.waited_seconds, 3)
+        }
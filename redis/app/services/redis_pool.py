@@ -0,0 +1,165 @@
+"""
+Shared Redis connection pool with binary and text client views
+"""
+
+import os
+import threading
+from types import GeneratorType
+from typing import Dict, Any, List, Optional
+
+import redis
+from redis.cluster import RedisCluster
+
+
+class InstrumentedConnectionPool(redis.BlockingConnectionPool):
+    """Blocking connection pool that counts checkouts and waits for a free connection"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
+
+    def get_connection(self, *args, **kwargs):
+        with self._stats_lock:
+            self.checkouts += 1
+            # The queue is pre-filled with placeholders, so it is only empty
+            # when every connection is checked out and this call will block.
+            if self.pool.empty():
+                self.waits += 1
+        return super().get_connection(*args, **kwargs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage statistics"""
+        idle = sum(1 for connection in list(self.pool.queue) if connection is not None)
+        created = len(self._connections)
+        return {
+            'max_connections': self.max_connections,
+            'created': created,
+            'in_use': created - idle,
+            'idle': idle,
+            'checkouts': self.checkouts,
+            'waits': self.waits
+        }
+
+
+def create_connection_pool() -> InstrumentedConnectionPool:
+    """Create the connection pool from the REDIS_* environment settings"""
+    return InstrumentedConnectionPool(
+        host=os.getenv('REDIS_HOST', 'localhost'),
+        port=int(os.getenv('REDIS_PORT', 6379)),
+        password=os.getenv('REDIS_PASSWORD', 'Localdev@123'),
+        max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 32)),
+        timeout=float(os.getenv('REDIS_POOL_TIMEOUT', 10)),
+        socket_keepalive=os.getenv('REDIS_SOCKET_KEEPALIVE', 'true').lower() == 'true',
+        health_check_interval=int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 30)),
+        decode_responses=False
+    )
+
+
+def cluster_enabled() -> bool:
+    """Whether REDIS_CLUSTER asks for a Redis Cluster deployment"""
+    return os.getenv('REDIS_CLUSTER', 'false').lower() == 'true'
+
+
+def create_cluster_client() -> RedisCluster:
+    """Create a Redis Cluster client from the REDIS_* environment settings
+
+    REDIS_HOST/REDIS_PORT name any startup node; the other nodes are
+    discovered. REDIS_MAX_CONNECTIONS applies per node.
+    """
+    return RedisCluster(
+        host=os.getenv('REDIS_HOST', 'localhost'),
+        port=int(os.getenv('REDIS_PORT', 6379)),
+        password=os.getenv('REDIS_PASSWORD', 'Localdev@123'),
+        max_connections=int(os.getenv('REDIS_MAX_CONNECTIONS', 32)),
+        socket_keepalive=os.getenv('REDIS_SOCKET_KEEPALIVE', 'true').lower() == 'true',
+        health_check_interval=int(os.getenv('REDIS_HEALTH_CHECK_INTERVAL', 30)),
+        decode_responses=False
+    )
+
+
+class ClusterPoolStats:
+    """``get_stats`` summed over the per-node connection pools of a cluster client"""
+
+    def __init__(self, client: RedisCluster):
+        self.client = client
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool usage statistics"""
+        stats = {'nodes': 0, 'max_connections': 0, 'created': 0, 'in_use': 0, 'idle': 0}
+        for node in self.client.get_nodes():
+            if node.redis_connection is None:
+                continue
+            pool = node.redis_connection.connection_pool
+            in_use = len(getattr(pool, '_in_use_connections', ()))
+            idle = len(getattr(pool, '_available_connections', ()))
+            stats['nodes'] += 1
+            stats['max_connections'] += pool.max_connections
+            stats['created'] += in_use + idle
+            stats['in_use'] += in_use
+            stats['idle'] += idle
+        return stats
+
+
+def is_cluster_client(client) -> bool:
+    """Whether ``client`` (or the client behind a TextRedisView) talks to a cluster"""
+    return isinstance(getattr(client, '_client', client), RedisCluster)
+
+
+def mget(client, keys: List[str]) -> List[Optional[Any]]:
+    """MGET that also works when the keys live in different cluster slots"""
+    if not keys:
+        return []
+    if is_cluster_client(client):
+        return client.mget_nonatomic(keys)
+    return client.mget(keys)
+
+
+def mset(client, mapping: Dict[str, Any]):
+    """MSET that also works when the keys live in different cluster slots"""
+    if not mapping:
+        return
+    if is_cluster_client(client):
+        client.mset_nonatomic(mapping)
+    else:
+        client.mset(mapping)
+
+
+def _decode(value):
+    if isinstance(value, bytes):
+        return value.decode('utf-8')
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_decode(item) for item in value)
+    if isinstance(value, set):
+        return {_decode(item) for item in value}
+    if isinstance(value, dict):
+        return {_decode(k): _decode(v) for k, v in value.items()}
+    if isinstance(value, GeneratorType):
+        # scan_iter/hscan_iter and friends
+        return (_decode(item) for item in value)
+    return value
+
+
+class TextRedisView:
+    """``decode_responses=True`` view over a binary client that shares its connection pool"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        attr = getattr(self._client, name)
+        if not callable(attr):
+            return attr
+        if name == 'pipeline':
+            return lambda *args, **kwargs: TextRedisView(attr(*args, **kwargs))
+
+        def call(*args, **kwargs):
+            result = attr(*args, **kwargs)
+            # Queued pipeline commands return the pipeline itself; keep chaining on the view
+            if result is self._client:
+                return self
+            return _decode(result)
+        return call
@@ -4,23 +4,45 @@ import json
 import os
 import numpy as np
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
-import pickle
+from typing import Dict, Any, List, Optional, Tuple, Iterable, Iterator, Callable
 import hashlib
+import heapq
+import itertools
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 import boto3
 from botocore.exceptions import ClientError, NoCredentialsError
 import streamlit as st
+from redis.commands.search.field import TextField, TagField, NumericField, VectorField
+from redis.commands.search.index_definition import IndexDefinition, IndexType
+from redis.commands.search.query import Query
+
+from .ann_index import IVFIndex
+from .chunker import DocumentChunker
+from .quantization import QUANTIZATION_MODES
+from .embedding_cache import EmbeddingCache
+from .rate_limiter import TokenBucket
+from .redis_pool import (
+    create_connection_pool, create_cluster_client, cluster_enabled, ClusterPoolStats,
+    TextRedisView, mget, mset
+)
+from .result_cache import SearchResultCache
+from .text_index import BM25Index
+from .vector_shards import VectorShard, ShardedPipeline, shard_number, merge_counts
+from .vector_codec import encode_vector, decode_vector, is_encoded, is_legacy_pickle, load_legacy_pickle
 
 # Make scikit-learn optional for fallback
 try:
-    from sklearn.feature_extraction.text import TfidfVectorizer
-    from sklearn.metrics.pairwise import cosine_similarity as sklearn_cosine_similarity
+    from .lexical_embedding import HashingTfidfEmbedder
     HAS_SKLEARN = True
     print("✅ Scikit-learn dependencies loaded successfully")
 except ImportError as e:
     HAS_SKLEARN = False
-    TfidfVectorizer = None
-    sklearn_cosine_similarity = None
+    HashingTfidfEmbedder = None
     print(f"❌ Scikit-learn dependencies not available: {e}")
 
 
@@ -43,9 +65,18 @@ class AWSEmbeddingService:
         self.method = "none"
         self.bedrock_client = None
         self.tfidf_vectorizer = None
+        self.custom_embedder: Optional[Callable[[str], Optional[np.ndarray]]] = None
         self.embedding_dim = None
         self.initialization_error = None
         self.model_id = "amazon.titan-embed-text-v2:0"
+        self.cache: Optional[EmbeddingCache] = None
+
+        # Bedrock call pacing: parallel requests, TPS quota and throttling retries
+        self.max_concurrency = int(os.getenv('BEDROCK_EMBED_CONCURRENCY', 4))
+        self.rate_limiter = TokenBucket(float(os.getenv('BEDROCK_EMBED_TPS', 10)))
+        self.max_retries = int(os.getenv('BEDROCK_MAX_RETRIES', 5))
+        self.retry_base_delay = float(os.getenv('BEDROCK_RETRY_BASE_DELAY', 0.5))
+        self.throttle_retries = 0
         
         print(f"🔄 [AWS] Initializing embedding service with method: {method}")
         
@@ -137,17 +168,13 @@ class AWSEmbeddingService:
         
         try:
             print("🔄 [AWS] Initializing TF-IDF vectorizer as fallback...")
-            self.tfidf_vectorizer = TfidfVectorizer(
-                max_features=1000,
-                stop_words='english',
-                ngram_range=(1, 2),
-                min_df=1,
-                max_df=0.95,
-                sublinear_tf=True
+            # Hashed feature space: no vocabulary to refit, so stored vectors stay comparable
+            self.tfidf_vectorizer = HashingTfidfEmbedder(
+                n_features=int(os.getenv('TFIDF_HASH_FEATURES', 2048))
             )
             
             self.method = "tfidf"
-            self.embedding_dim = 1000
+            self.embedding_dim = self.tfidf_vectorizer.n_features
             print("✅ [AWS] TF-IDF vectorizer initialized successfully")
             return True
             
@@ -157,21 +184,111 @@ class AWSEmbeddingService:
             self.tfidf_vectorizer = None
             return False
     
-    def create_embedding(self, text: str, dimensions: int = 1024) -> Optional[np.ndarray]:
-        """Create embedding using the available method"""
+    def use_custom_backend(self, embed: Callable[[str], Optional[np.ndarray]], dimensions: int):
+        """Serve embeddings from ``embed`` (text -> vector) instead of Titan or TF-IDF
+
+        Meant for offline runs such as benchmarks. Vectors go to the
+        "custom:<dimensions>" space and are not cached. The service is a
+        process-wide singleton, so this applies to every RedisVectorService.
+        """
+        self.custom_embedder = embed
+        self.method = "custom"
+        self.embedding_dim = dimensions
+        print(f"🎯 [AWS] Embedding method: custom ({dimensions} dimensions)")
+
+    def attach_cache(self, cache: Optional[EmbeddingCache]):
+        """Attach (or detach with None) the embedding cache used for Titan calls"""
+        self.cache = cache
+
+    def _active_cache(self, use_cache: bool) -> Optional[EmbeddingCache]:
+        # TF-IDF weights move with the corpus statistics, so only Titan is cached
+        if use_cache and self.method == "titan" and self.cache is not None and self.cache.enabled:
+            return self.cache
+        return None
+
+    def create_embedding(self, text: str, dimensions: int = 1024, use_cache: bool = True) -> Optional[np.ndarray]:
+        """Create embedding using the available method
+
+        ``use_cache=False`` bypasses the embedding cache for this call.
+        """
         if not text or not text.strip():
             return None
+
+        cache = self._active_cache(use_cache)
+        if cache is not None:
+            cached = cache.get(self.model_id, dimensions, text)
+            if cached is not None:
+                return cached
         
         try:
             if self.method == "titan":
-                return self._create_titan_embedding(text, dimensions)
+                embedding = self._create_titan_embedding(text, dimensions)
             elif self.method == "tfidf":
-                return self._create_tfidf_embedding(text)
+                embedding = self._create_tfidf_embedding(text)
+            elif self.method == "custom":
+                embedding = self.custom_embedder(text)
             else:
-                return None
+                embedding = None
         except Exception as e:
             print(f"Error creating embedding: {e}")
             return None
+
+        if cache is not None and embedding is not None:
+            cache.put(self.model_id, dimensions, text, embedding)
+        return embedding
+
+    def create_embeddings(self, texts: List[str], dimensions: int = 1024,
+                          use_cache: bool = True) -> List[Optional[np.ndarray]]:
+        """Create embeddings for many texts, preserving input order
+
+        Titan requests run on up to ``max_concurrency`` threads, paced by the
+        TPS token bucket; cache hits are resolved with one lookup up front.
+        """
+        embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not pending:
+            return embeddings
+
+        if self.method == "tfidf":
+            vectors = self._create_tfidf_embeddings([texts[i] for i in pending])
+            for i, vector in zip(pending, vectors):
+                embeddings[i] = vector
+            return embeddings
+        if self.method == "custom":
+            for i in pending:
+                embeddings[i] = self.create_embedding(texts[i], dimensions, use_cache=False)
+            return embeddings
+        if self.method != "titan":
+            return embeddings
+
+        cache = self._active_cache(use_cache)
+        if cache is not None:
+            cached = cache.get_many(self.model_id, dimensions, [texts[i] for i in pending])
+            for i, vector in zip(pending, cached):
+                embeddings[i] = vector
+            pending = [i for i in pending if embeddings[i] is None]
+        if not pending:
+            return embeddings
+
+        def embed(i: int) -> Optional[np.ndarray]:
+            try:
+                return self._create_titan_embedding(texts[i], dimensions)
+            except Exception as e:
+                print(f"Error creating embedding: {e}")
+                return None
+
+        workers = max(1, min(self.max_concurrency, len(pending)))
+        if workers == 1:
+            vectors = [embed(i) for i in pending]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                vectors = list(executor.map(embed, pending))
+
+        for i, vector in zip(pending, vectors):
+            embeddings[i] = vector
+        if cache is not None:
+            cache.put_many(self.model_id, dimensions, [texts[i] for i in pending], vectors)
+        return embeddings
     
     def _create_titan_embedding(self, text: str, dimensions: int = 1024) -> Optional[np.ndarray]:
         """Create embedding using AWS Titan"""
@@ -187,12 +304,7 @@ class AWSEmbeddingService:
             }
             
             # Call Bedrock
-            response = self.bedrock_client.invoke_model(
-                modelId=self.model_id,
-                body=json.dumps(body),
-                contentType='application/json',
-                accept='application/json'
-            )
+            response = self._invoke_model(json.dumps(body))
             
             # Parse response
             response_body = json.loads(response['body'].read())
@@ -211,37 +323,65 @@ class AWSEmbeddingService:
             print(f"Error creating Titan embedding: {e}")
             return None
     
-    def _create_tfidf_embedding(self, text: str) -> Optional[np.ndarray]:
-        """Create embedding using TF-IDF"""
+    THROTTLING_ERRORS = ("ThrottlingException", "TooManyRequestsException", "ServiceUnavailableException")
+
+    def _invoke_model(self, body: str) -> Dict[str, Any]:
+        """Call Bedrock within the TPS quota, backing off exponentially when throttled"""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                return self.bedrock_client.invoke_model(
+                    modelId=self.model_id,
+                    body=body,
+                    contentType='application/json',
+                    accept='application/json'
+                )
+            except ClientError as e:
+                if e.response['Error']['Code'] not in self.THROTTLING_ERRORS or attempt == self.max_retries:
+                    raise
+                delay = self.retry_base_delay * (2 ** attempt)
+                # Full jitter keeps parallel workers from retrying in lockstep
+                time.sleep(random.uniform(0, delay))
+                self.throttle_retries += 1
+
+    def _create_tfidf_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Create TF-IDF embeddings for many texts with one transform call"""
         try:
             if not self.tfidf_vectorizer:
-                return None
-                
-            if hasattr(self.tfidf_vectorizer, 'vocabulary_'):
-                vector = self.tfidf_vectorizer.transform([text])
-                return vector.toarray().flatten()
-            else:
-                return None
-                
+                return [None] * len(texts)
+            return self.tfidf_vectorizer.embed(texts)
         except Exception as e:
             print(f"Error creating TF-IDF embedding: {e}")
-            return None
+            return [None] * len(texts)
+
+    def _create_tfidf_embedding(self, text: str) -> Optional[np.ndarray]:
+        """Create embedding using TF-IDF"""
+        return self._create_tfidf_embeddings([text])[0]
+
+    def attach_tfidf_store(self, redis_client, key_prefix: str):
+        """Keep TF-IDF document frequencies in Redis so every process shares them"""
+        if self.tfidf_vectorizer is not None:
+            self.tfidf_vectorizer.attach(redis_client, key_prefix)
     
     def fit_tfidf_corpus(self, texts: List[str]):
-        """Fit TF-IDF vectorizer on a corpus of texts"""
+        """Add new documents to the TF-IDF document frequencies (no refit)"""
         if self.method == "tfidf" and self.tfidf_vectorizer and texts:
             try:
-                print(f"🔄 [AWS] Fitting TF-IDF on {len(texts)} documents...")
-                self.tfidf_vectorizer.fit(texts)
-                print(f"✅ [AWS] TF-IDF fitted on {len(texts)} documents")
+                self.tfidf_vectorizer.partial_fit(texts)
             except Exception as e:
-                print(f"Error fitting TF-IDF corpus: {e}")
+                print(f"Error updating TF-IDF statistics: {e}")
+
+    def reset_tfidf_statistics(self):
+        """Forget TF-IDF document frequencies after the corpus was cleared"""
+        if self.tfidf_vectorizer is not None:
+            self.tfidf_vectorizer.reset()
     
     def is_available(self) -> bool:
         """Check if embedding service is available"""
-        return self.method in ["titan", "tfidf"] and (
+        return self.method in ["titan", "tfidf", "custom"] and (
             (self.method == "titan" and self.bedrock_client is not None) or
-            (self.method == "tfidf" and self.tfidf_vectorizer is not None)
+            (self.method == "tfidf" and self.tfidf_vectorizer is not None) or
+            (self.method == "custom" and self.custom_embedder is not None)
         )
     
     def get_info(self) -> Dict[str, Any]:
@@ -252,6 +392,10 @@ class AWSEmbeddingService:
             "embedding_dim": self.embedding_dim,
             "initialization_error": self.initialization_error,
             "initialized": self._initialized,
+            "cache": self.cache.get_stats() if self.cache is not None else {"enabled": False},
+            "rate_limit": dict(self.rate_limiter.get_stats(),
+                               max_concurrency=self.max_concurrency,
+                               throttle_retries=self.throttle_retries),
             "model_info": {
                 "titan_available": self.bedrock_client is not None,
                 "tfidf_available": HAS_SKLEARN,
@@ -259,32 +403,153 @@ class AWSEmbeddingService:
                 "model_id": self.model_id if self.method == "titan" else None,
                 "bedrock_client_loaded": self.bedrock_client is not None,
                 "tfidf_loaded": self.tfidf_vectorizer is not None,
+                "tfidf": self.tfidf_vectorizer.get_info() if self.tfidf_vectorizer is not None else None,
                 "aws_region": os.getenv('AWS_REGION', 'us-east-1')
             }
         }
 
 
 @st.cache_resource
-def get_redis_service(embedding_method: str = "auto", embedding_dimensions: int = 1024) -> 'RedisVectorService':
+def get_redis_service(embedding_method: str = "auto", embedding_dimensions: int = 1024,
+                      storage_backend: Optional[str] = None) -> 'RedisVectorService':
     """Cached Redis service to prevent multiple initializations"""
     print(f"🏭 [CACHE] Creating new RedisVectorService instance")
-    return RedisVectorService(embedding_method, embedding_dimensions)
+    return RedisVectorService(embedding_method, embedding_dimensions, storage_backend)
 
 
 class RedisVectorService:
     """Handle all Redis operations for AWS documentation data with AWS Titan embeddings"""
 
-    def __init__(self, embedding_method: str = "auto", embedding_dimensions: int = 1024):
+    STORAGE_BACKENDS = ("keys", "redisearch")
+    FUSION_METHODS = ("rrf", "weighted")
+
+    def __init__(self, embedding_method: str = "auto", embedding_dimensions: int = 1024,
+                 storage_backend: Optional[str] = None, quantization: Optional[str] = None):
         print(f"🚀 [SERVICE] Initializing RedisVectorService with embedding_method: {embedding_method}")
         
         self.redis_client = self._init_redis()
         self.key_prefix = "aws_usecase_docs"
         self.vector_prefix = "aws_usecase_vectors"
         self.embedding_dimensions = embedding_dimensions
+
+        # "keys" keeps the :vec:/:meta: layout; "redisearch" stores HASH docs in FT vector indexes
+        self.search_index_name = f"{self.vector_prefix}:idx"
+        self._search_indexes_ready = set()
+        self.search_algorithm = os.getenv('VECTOR_SEARCH_ALGORITHM', 'HNSW').upper()
+        self.storage_backend = self._init_storage_backend(
+            storage_backend or os.getenv('VECTOR_STORAGE_BACKEND', 'keys')
+        )
+
+        # Vector quantization (none, float16, int8 or pq) for the keys backend
+        self.quantization = self._init_quantization(quantization)
+        self.keep_full_precision = os.getenv('VECTOR_KEEP_FULL_PRECISION', 'false').lower() == 'true'
+        self.pq_subvectors = int(os.getenv('VECTOR_PQ_SUBVECTORS', 64))
+        self.rerank_candidates = int(os.getenv('VECTOR_RERANK_CANDIDATES', 100))
+        self.vector_encoding = self._stored_vector_encoding()
+        self._format_migration: Dict[str, Any] = {'state': 'idle'}
+        self._format_migration_thread: Optional[threading.Thread] = None
+        self._legacy_vectors_seen = False
         
         # Use AWS embedding service
         self.embedding_service = AWSEmbeddingService(embedding_method)
         self.vector_dim = self.embedding_service.embedding_dim or embedding_dimensions
+
+        # Two-tier embedding cache so repeated texts never reach Bedrock twice
+        self.embedding_service.attach_cache(EmbeddingCache(
+            self.redis_client,
+            max_local_entries=int(os.getenv('EMBEDDING_CACHE_SIZE', 4096)),
+            max_redis_entries=int(os.getenv('EMBEDDING_CACHE_REDIS_SIZE', 100000)),
+            ttl_seconds=int(os.getenv('EMBEDDING_CACHE_TTL', 30 * 24 * 3600)),
+            enabled=os.getenv('EMBEDDING_CACHE_ENABLED', 'true').lower() == 'true'
+        ))
+        # Both TF-IDF keys are written in one MULTI, so on a cluster they share a hash tag
+        tfidf_prefix = f"{self.vector_prefix}:{{tfidf}}" if self.cluster else f"{self.vector_prefix}:tfidf"
+        self.embedding_service.attach_tfidf_store(self.redis_client, tfidf_prefix)
+
+        # Bulk reads fetch this many vectors/metadata per round trip
+        self.read_chunk_size = int(os.getenv('VECTOR_READ_CHUNK_SIZE', 256))
+
+        # Ingestion: documents per MULTI/EXEC batch
+        self.ingest_batch_size = int(os.getenv('VECTOR_INGEST_BATCH_SIZE', 64))
+
+        # Long documents are embedded as chunks; search aggregates chunk hits per document
+        self.chunker = DocumentChunker(
+            strategy=os.getenv('DOC_CHUNK_STRATEGY', 'headings'),
+            max_tokens=int(os.getenv('DOC_CHUNK_TOKENS', 300)),
+            overlap_tokens=int(os.getenv('DOC_CHUNK_OVERLAP', 40))
+        )
+
+        # Vectors are partitioned into hash-tagged shards (VECTOR_SHARDS, 16 on a cluster).
+        # Each shard holds its vectors together with their index sets, statistics
+        # counters, filter/BM25 indexes and change stream; reads scatter-gather over
+        # the shards. A single unsharded store keeps the original key names.
+        self.shard_count = max(1, int(os.getenv('VECTOR_SHARDS', 16 if self.cluster else 1)))
+        self.shards = [
+            VectorShard(self.redis_client, self.redis_text, self.vector_prefix, self.key_prefix,
+                        number, tagged=self.cluster or self.shard_count > 1)
+            for number in range(self.shard_count)
+        ]
+        self._shard_executor = ThreadPoolExecutor(
+            max_workers=min(self.shard_count, int(os.getenv('VECTOR_SHARD_WORKERS', 8))),
+            thread_name_prefix="vector-shard"
+        ) if self.shard_count > 1 else None
+
+        # Maintenance: SCAN page size, keys per UNLINK and the background job state
+        self.scan_count = int(os.getenv('REDIS_SCAN_COUNT', 1000))
+        self.unlink_batch_size = int(os.getenv('REDIS_UNLINK_BATCH_SIZE', 500))
+        self._maintenance_status: Dict[str, Any] = {'state': 'idle'}
+        self._maintenance_thread: Optional[threading.Thread] = None
+
+        # Per-shard secondary indexes turn usecase/service/type filters into candidate ids
+        self.prefilter_exact_max = int(os.getenv('VECTOR_PREFILTER_EXACT_MAX', 20000))
+        self._filter_index_checked = False
+        # Both hybrid search legs resolve filters at once; only one may rebuild the index
+        self._filter_index_lock = threading.Lock()
+
+        # Vectors are partitioned into spaces, one per (embedding method, dimension);
+        # each space has its own index set (per shard), ANN index and RediSearch index
+        self._spaces_checked = False
+
+        # Background re-embedding of other spaces into the active one
+        self.reembed_rate = float(os.getenv('REEMBED_RATE', 5))
+        self.reembed_batch_size = int(os.getenv('REEMBED_BATCH_SIZE', 16))
+        self._reembedding: Dict[str, Any] = {'state': 'idle'}
+        self._reembedding_thread: Optional[threading.Thread] = None
+
+        # In-process ANN indexes per space, loaded lazily from their Redis snapshots
+        self.ann_indexes: Dict[str, IVFIndex] = {}
+        self.ann_key = f"{self.vector_prefix}:ann"
+        self.ann_nprobe = int(os.getenv('VECTOR_ANN_NPROBE', 8))
+        self.ann_min_train_size = int(os.getenv('VECTOR_ANN_MIN_TRAIN', 1024))
+        self.ann_mmap_dir = os.getenv('VECTOR_ANN_MMAP_DIR') or None
+        self._ann_skipped: Dict[str, set] = {}
+        self._ann_dirty: Dict[str, int] = {}
+
+        # Vector inserts/deletes are published on each shard's stream so other
+        # processes keep their loaded ANN indexes current without a full resync
+        self.change_stream_maxlen = int(os.getenv('VECTOR_CHANGE_STREAM_MAXLEN', 100000))
+        self.change_stream_page = int(os.getenv('VECTOR_CHANGE_STREAM_PAGE', 1000))
+        self._instance_id = uuid.uuid4().hex
+        self._stream_position: Dict[int, str] = {}
+
+        # Search results are cached per index version, which every vector write bumps
+        self.search_cache = SearchResultCache(
+            max_entries=int(os.getenv('SEARCH_CACHE_SIZE', 256)),
+            enabled=os.getenv('SEARCH_CACHE_ENABLED', 'true').lower() == 'true'
+        )
+
+        # Hybrid search runs the BM25 leg on a worker thread next to the vector leg
+        self.hybrid_fusion = os.getenv('HYBRID_FUSION', 'rrf').lower()
+        if self.hybrid_fusion not in self.FUSION_METHODS:
+            print(f"⚠️ [HYBRID] Unknown fusion method '{self.hybrid_fusion}', using 'rrf'")
+            self.hybrid_fusion = "rrf"
+        self.hybrid_rrf_k = int(os.getenv('HYBRID_RRF_K', 60))
+        self.hybrid_semantic_weight = float(os.getenv('HYBRID_SEMANTIC_WEIGHT', 0.5))
+        self.hybrid_candidates = int(os.getenv('HYBRID_CANDIDATES', 50))
+        self._hybrid_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('HYBRID_SEARCH_WORKERS', 4)),
+            thread_name_prefix="hybrid-search"
+        )
         
         # Print final status
         embedding_info = self.embedding_service.get_info()
@@ -293,17 +558,47 @@ class RedisVectorService:
         print(f"   Available: {embedding_info['available']}")
         print(f"   Initialized: {embedding_info['initialized']}")
         print(f"   Dimension: {self.vector_dim}")
+        print(f"   Storage backend: {self.storage_backend}")
+        print(f"   Shards: {self.shard_count}{' (cluster)' if self.cluster else ''}")
         if embedding_info.get('initialization_error'):
             print(f"   Error: {embedding_info['initialization_error']}")
 
     def _init_redis(self) -> redis.Redis:
-        """Initialize Redis connection"""
-        return redis.Redis(
-            host=os.getenv('REDIS_HOST', 'localhost'),
-            port=int(os.getenv('REDIS_PORT', 6379)),
-            password=os.getenv('REDIS_PASSWORD', 'Localdev@123'),
-            decode_responses=False
-        )
+        """Initialize the shared connection pool (or cluster client) and its binary/text views"""
+        self.cluster = cluster_enabled()
+        if self.cluster:
+            redis_client = create_cluster_client()
+            self.connection_pool = ClusterPoolStats(redis_client)
+        else:
+            self.connection_pool = create_connection_pool()
+            redis_client = redis.Redis(connection_pool=self.connection_pool)
+        self.redis_text = TextRedisView(redis_client)
+        return redis_client
+
+    def _init_storage_backend(self, requested: str) -> str:
+        """Resolve the vector storage backend, falling back when RediSearch is missing"""
+        requested = (requested or "keys").lower()
+        if requested not in self.STORAGE_BACKENDS:
+            print(f"⚠️ [SERVICE] Unknown storage backend '{requested}', using 'keys'")
+            return "keys"
+
+        if requested == "redisearch" and self.cluster:
+            print("⚠️ [SERVICE] RediSearch vector indexes are not supported on Redis Cluster, using 'keys' backend")
+            return "keys"
+
+        if requested == "redisearch" and not self._has_search_module():
+            print("⚠️ [SERVICE] RediSearch module not available on this Redis server, using 'keys' backend")
+            return "keys"
+
+        return requested
+
+    def _has_search_module(self) -> bool:
+        """Check whether the Redis server provides the search (FT.*) commands"""
+        try:
+            self.redis_client.execute_command('FT._LIST')
+            return True
+        except Exception:
+            return False
 
     def test_connection(self) -> tuple[bool, str]:
         """Test Redis connection and embedding service"""
@@ -333,97 +628,149 @@ class RedisVectorService:
         """Get detailed embedding service status"""
         return self.embedding_service.get_info()
 
-    def _create_embedding(self, text: str) -> Optional[np.ndarray]:
+    def set_embedding_backend(self, embed: Callable[[str], Optional[np.ndarray]], dimensions: int):
+        """Embed with ``embed`` from now on (see AWSEmbeddingService.use_custom_backend)"""
+        self.embedding_service.use_custom_backend(embed, dimensions)
+        self.vector_dim = dimensions
+
+    def _create_embedding(self, text: str, use_cache: bool = True) -> Optional[np.ndarray]:
         """Create embedding for text using AWS service"""
         if not self.embedding_service.is_available() or not text.strip():
             return None
 
         try:
-            return self.embedding_service.create_embedding(text, self.embedding_dimensions)
+            return self.embedding_service.create_embedding(text, self.embedding_dimensions, use_cache=use_cache)
         except Exception as e:
             print(f"Error creating embedding: {e}")
             return None
 
     def _fallback_text_search(self, query: str, top_k: int = 5,
-                            usecase_filter: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Enhanced fallback text-based search with better scoring"""
+                            usecase_filter: Optional[str] = None,
+                            services_filter: Optional[List[str]] = None,
+                            types_filter: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """BM25 text search over the inverted index, used when no embeddings are available"""
         print("Using enhanced fallback text-based search...")
-        
-        # Get all vector metadata
-        index_key = f"{self.vector_prefix}:index"
-        vector_ids = self.redis_client.smembers(index_key)
-        
-        if not vector_ids:
+        return self._bm25_search(query, top_k, usecase_filter, services_filter, types_filter)
+
+    def _bm25_search(self, query: str, top_k: int,
+                     usecase_filter: Optional[str] = None,
+                     services_filter: Optional[List[str]] = None,
+                     types_filter: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Top ``top_k`` documents by BM25 score, one result per document"""
+        self._sync_text_index()
+
+        candidates = self._filter_candidates(usecase_filter, services_filter, types_filter)
+        if candidates is not None and not candidates:
             return []
-        
+
         results = []
-        query_lower = query.lower()
-        query_words = set(query_lower.split())
-        
-        for vector_id in vector_ids:
-            vector_id = vector_id.decode('utf-8') if isinstance(vector_id, bytes) else vector_id
-            metadata_key = f"{self.vector_prefix}:meta:{vector_id}"
-            metadata_data = self.redis_client.get(metadata_key)
-            
-            if metadata_data:
-                try:
-                    metadata = json.loads(metadata_data.decode('utf-8') if isinstance(metadata_data, bytes) else metadata_data)
-                    
-                    # Apply usecase filter
-                    if usecase_filter and usecase_filter != "All":
-                        original_query = metadata.get('original_query', '').lower()
-                        refined_query = metadata.get('refined_query', '').lower()
-                        if usecase_filter.lower() not in original_query and usecase_filter.lower() not in refined_query:
-                            continue
-                    
-                    # Enhanced text similarity calculation
-                    content_preview = metadata.get('content_preview', '').lower()
-                    source = metadata.get('source', '').lower()
-                    doc_type = metadata.get('type', '').lower()
-                    usecase_summary = metadata.get('usecase_summary', '').lower()
-                    key_services = ' '.join(metadata.get('key_services', [])).lower()
-                    
-                    # Combine all searchable text
-                    searchable_text = f"{content_preview} {source} {doc_type} {usecase_summary} {key_services}"
-                    searchable_words = set(searchable_text.split())
-                    
-                    # Calculate multiple similarity metrics
-                    similarity = 0.0
-                    
-                    # 1. Word overlap similarity (Jaccard)
-                    if query_words and searchable_words:
-                        intersection = query_words.intersection(searchable_words)
-                        union = query_words.union(searchable_words)
-                        jaccard_sim = len(intersection) / len(union) if union else 0.0
-                        similarity += jaccard_sim * 0.4
-                    
-                    # 2. Substring matching
-                    if query_lower in searchable_text:
-                        similarity += 0.3
-                    
-                    # 3. Exact matches in important fields
-                    if query_lower in source or query_lower in doc_type:
-                        similarity += 0.2
-                    
-                    # 4. Service matching bonus
-                    if any(word in key_services for word in query_words):
-                        similarity += 0.1
-                    
-                    if similarity > 0.1:  # Minimum threshold
-                        results.append({
-                            'vector_id': vector_id,
-                            'similarity': min(similarity, 1.0),  # Cap at 1.0
-                            'metadata': metadata,
-                            'match_type': 'text_fallback'
-                        })
-                            
-                except Exception as e:
-                    print(f"Error in fallback search for {vector_id}: {e}")
+        seen = set()
+        seen_hashes = set()
+        limit = max(top_k * 4, 50)
+        # Hits arrive best first: read metadata in small chunks and stop at top_k
+        chunk_size = min(self.read_chunk_size, max(top_k * 2, 16))
+
+        while True:
+            ranked = self._text_search(query, limit)
+            scores = {
+                vector_id: score for vector_id, score in ranked
+                if vector_id not in seen and (candidates is None or vector_id in candidates)
+            }
+            seen.update(vector_id for vector_id, _ in ranked)
+
+            for vector_id, _, metadata in self._iter_vector_records(scores, chunk_size=chunk_size):
+                if not metadata:
                     continue
-        
-        # Sort by similarity and return top_k
-        results.sort(key=lambda x: x['similarity'], reverse=True)
-        return results[:top_k]
+
+                # One result per document, from its best-scoring chunk
+                content_hash = metadata.get('content_hash', vector_id)
+                if content_hash in seen_hashes:
+                    continue
+                seen_hashes.add(content_hash)
+
+                results.append({
+                    'vector_id': vector_id,
+                    'similarity': scores[vector_id],
+                    'metadata': metadata,
+                    'match_type': 'text_fallback'
+                })
+                if len(results) >= top_k:
+                    return results
+
+            # Widen the candidate pool only when the filters discarded too many hits
+            if len(ranked) < limit:
+                return results
+            limit *= 4
+
+    @staticmethod
+    def _searchable_text(metadata: Dict[str, Any]) -> str:
+        """Text indexed for the fallback search"""
+        return " ".join([
+            metadata.get('content_preview', ''),
+            metadata.get('source', ''),
+            metadata.get('type', ''),
+            metadata.get('usecase_summary', ''),
+            " ".join(metadata.get('key_services', []))
+        ])
+
+    def _text_search(self, query: str, limit: int) -> List[Tuple[str, float]]:
+        """BM25 top ``limit`` over all shards, best first
+
+        Each shard scores against its own term statistics; the per-shard
+        top lists are merged by score.
+        """
+        ranked = self._map_shards(lambda shard: shard.text_index.search(query, limit))
+        return heapq.nlargest(limit, itertools.chain.from_iterable(ranked), key=lambda hit: hit[1])
+
+    def _sync_text_index(self):
+        """Index vectors missing from the BM25 indexes (e.g. stored before they existed)"""
+        self._map_shards(self._sync_shard_text_index)
+
+    def _sync_shard_text_index(self, shard: VectorShard):
+        index_size = self.redis_client.scard(shard.index_key)
+        if shard.text_index.document_count() == index_size:
+            return
+
+        vector_ids = self._get_index_ids([shard])
+        indexed = set(shard.text_index.indexed_ids())
+        missing = [vector_id for vector_id in vector_ids if vector_id not in indexed]
+        stale = list(indexed - set(vector_ids))
+        print(f"🔄 [BM25] Indexing {len(missing)} documents, removing {len(stale)}")
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        shard.text_index.remove_documents(pipe, stale)
+        pipe.execute()
+
+        records = self._iter_vector_records(missing)
+        while True:
+            documents = [
+                (vector_id, self._searchable_text(metadata))
+                for vector_id, _, metadata in itertools.islice(records, self.read_chunk_size)
+                if metadata
+            ]
+            if not documents:
+                break
+            shard.text_index.index_documents(pipe, documents)
+            pipe.execute()
+
+    def rebuild_text_index(self) -> Dict[str, Any]:
+        """Drop and rebuild the BM25 indexes (refreshes length normalisation)"""
+        self._unlink_matching([f"{shard.text_index.key_prefix}:*" for shard in self.shards])
+        for shard in self.shards:
+            shard.text_index = BM25Index(self.redis_client, shard.text_index.key_prefix)
+        self._sync_text_index()
+        return self._text_index_info()
+
+    def _text_index_info(self) -> Dict[str, Any]:
+        """BM25 index info, summed over the shards"""
+        infos = [shard.text_index.get_info() for shard in self.shards]
+        if len(infos) == 1:
+            return infos[0]
+        documents = sum(info.get('documents', 0) for info in infos)
+        total_length = sum(info.get('documents', 0) * (info.get('average_length') or 0) for info in infos)
+        return dict(infos[0], documents=documents,
+                    average_length=total_length / documents if documents else None,
+                    shards=len(infos))
 
     def _generate_content_hash(self, content: str, source: str = "", doc_type: str = "") -> str:
         """Generate a unique hash for document content to detect duplicates"""
@@ -433,67 +780,985 @@ class RedisVectorService:
     def _document_exists(self, content_hash: str) -> Optional[str]:
         """Check if a document with this content hash already exists"""
         hash_key = f"{self.key_prefix}:hash:{content_hash}"
-        redis_text = redis.Redis(
-            host=os.getenv('REDIS_HOST', 'localhost'),
-            port=int(os.getenv('REDIS_PORT', 6379)),
-            password=os.getenv('REDIS_PASSWORD', 'Localdev@123'),
-            decode_responses=True
-        )
-        existing_vector_id = redis_text.get(hash_key)
-        return existing_vector_id
+        return self.redis_text.get(hash_key)
+
+    def _find_existing_documents(self, content_hashes: List[str]) -> Dict[str, str]:
+        """Look up many content hashes in one MGET; returns hash -> existing vector ID"""
+        if not content_hashes:
+            return {}
+        hash_keys = [f"{self.key_prefix}:hash:{content_hash}" for content_hash in content_hashes]
+        existing = mget(self.redis_text, hash_keys)
+        return {content_hash: vector_id for content_hash, vector_id in zip(content_hashes, existing) if vector_id}
 
-    def _store_document_hash(self, content_hash: str, vector_id: str):
+    def _store_document_hash(self, content_hash: str, vector_id: str, pipe=None):
         """Store the mapping between content hash and vector ID"""
         hash_key = f"{self.key_prefix}:hash:{content_hash}"
-        redis_text = redis.Redis(
-            host=os.getenv('REDIS_HOST', 'localhost'),
-            port=int(os.getenv('REDIS_PORT', 6379)),
-            password=os.getenv('REDIS_PASSWORD', 'Localdev@123'),
-            decode_responses=True
+        (pipe if pipe is not None else self.redis_text).set(hash_key, vector_id)
+
+    def _store_vector(self, vector_id: str, embedding: np.ndarray, metadata: Dict[str, Any],
+                      pipe: Optional[ShardedPipeline] = None) -> str:
+        """Store vector with metadata and return its space
+
+        With ``pipe`` the writes are only queued; the caller executes the
+        pipeline and then calls ``_on_vectors_stored``.
+        """
+        own_pipe = pipe is None
+        if own_pipe:
+            pipe = self._write_pipeline()
+
+        shard = self._shard(vector_id)
+        write = pipe.shard(shard)
+        space = self._vector_space(metadata.get('embedding_method', self.embedding_service.method), len(embedding))
+        if self.storage_backend == "redisearch":
+            self._ensure_search_index(len(embedding), space)
+            write.hset(
+                shard.search_doc_key(vector_id),
+                mapping=self._search_doc_fields(embedding, metadata)
+            )
+        else:
+            # Store vector as binary data
+            write.set(shard.vec_key(vector_id), self._encode_vector(embedding))
+
+            # Store metadata as JSON
+            write.set(shard.meta_key(vector_id), json.dumps(metadata))
+
+        # Add to vector index and to the index set of its space
+        write.sadd(shard.index_key, vector_id)
+        write.sadd(shard.space_key(space), vector_id)
+        write.sadd(shard.spaces_key, space)
+        shard.statistics.record(write, metadata)
+        shard.filter_index.index(write, vector_id, metadata)
+        if self._chunk_hash(metadata):
+            write.hset(shard.vec_hash_key, vector_id, self._chunk_hash(metadata))
+        shard.text_index.index_document(write, vector_id, self._searchable_text(metadata))
+        self._publish_changes(write, shard, 'add', space, [vector_id])
+
+        if own_pipe:
+            pipe.execute()
+            self._on_vectors_stored([(vector_id, space, embedding)])
+        return space
+
+    def _shard(self, vector_id: str) -> VectorShard:
+        """Shard holding a vector"""
+        return self.shards[shard_number(vector_id, self.shard_count)]
+
+    def _group_by_shard(self, vector_ids: Iterable[str]) -> Dict[int, List[str]]:
+        groups: Dict[int, List[str]] = {}
+        for vector_id in vector_ids:
+            groups.setdefault(shard_number(vector_id, self.shard_count), []).append(vector_id)
+        return groups
+
+    def _map_shards(self, func: Callable[[VectorShard], Any], shards: Optional[List[VectorShard]] = None) -> List[Any]:
+        """Run ``func`` for every shard (in parallel when there are several), in shard order"""
+        shards = self.shards if shards is None else shards
+        if self._shard_executor is None or len(shards) == 1:
+            return [func(shard) for shard in shards]
+        return list(self._shard_executor.map(func, shards))
+
+    def _write_pipeline(self) -> ShardedPipeline:
+        """Pipelines for a write that may touch several shards (one MULTI per shard on a cluster)"""
+        return ShardedPipeline(self.redis_client, cluster=self.cluster)
+
+    def _count_vectors(self) -> int:
+        """Number of stored vectors over all shards"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for shard in self.shards:
+            pipe.scard(shard.index_key)
+        return sum(pipe.execute())
+
+    def _is_live(self, vector_ids: List[str]) -> List[bool]:
+        """Whether each vector id is in its shard's index set"""
+        live = {}
+        pipe = self.redis_text.pipeline(transaction=False)
+        groups = self._group_by_shard(vector_ids)
+        for number, ids in groups.items():
+            pipe.smismember(self.shards[number].index_key, ids)
+        for ids, flags in zip(groups.values(), pipe.execute()):
+            live.update(zip(ids, flags))
+        return [bool(live.get(vector_id)) for vector_id in vector_ids]
+
+    @staticmethod
+    def _parent_id(vector_id: str) -> str:
+        """Vector id of the document a chunk belongs to (chunk ids are "<parent>#<n>")"""
+        return vector_id.split('#', 1)[0]
+
+    @staticmethod
+    def _chunk_hash(metadata: Dict[str, Any]) -> Optional[str]:
+        """Content hash identifying one chunk; the first chunk uses the document's hash"""
+        return metadata.get('chunk_hash') or metadata.get('content_hash')
+
+    def _on_vectors_stored(self, vectors: List[Tuple[str, str, np.ndarray]]):
+        """Update in-process structures after vectors were committed to Redis
+
+        ``vectors`` holds (vector id, space, embedding); the space is the one
+        the vector was written to, which need not be the active one.
+        """
+        # Keep the loaded ANN indexes current
+        for vector_id, space, embedding in vectors:
+            if space in self.ann_indexes:
+                self._ann_add(space, vector_id, embedding)
+
+    @staticmethod
+    def _vector_space(method: str, dims: int) -> str:
+        """Name of the space holding vectors of one embedding method and dimension"""
+        return f"{method}:{dims}"
+
+    @property
+    def active_space(self) -> str:
+        """Space of the current embedding model: new vectors and queries go here"""
+        method = self.embedding_service.method
+        dims = self.embedding_service.embedding_dim if method in ("tfidf", "custom") else self.embedding_dimensions
+        return self._vector_space(method, dims)
+
+    def _get_spaces(self) -> List[str]:
+        """Names of all spaces that hold (or held) vectors"""
+        pipe = self.redis_text.pipeline(transaction=False)
+        for shard in self.shards:
+            pipe.smembers(shard.spaces_key)
+        return sorted(set().union(*pipe.execute()))
+
+    def _space_size(self, space: str) -> int:
+        """Number of vectors in a space over all shards"""
+        pipe = self.redis_client.pipeline(transaction=False)
+        for shard in self.shards:
+            pipe.scard(shard.space_key(space))
+        return sum(pipe.execute())
+
+    def _space_members(self, space: str) -> set:
+        """Vector ids of a space over all shards"""
+        pipe = self.redis_text.pipeline(transaction=False)
+        for shard in self.shards:
+            pipe.smembers(shard.space_key(space))
+        return set().union(*pipe.execute())
+
+    def get_vector_spaces(self) -> Dict[str, int]:
+        """Number of vectors per space"""
+        self._sync_vector_spaces()
+        return {space: self._space_size(space) for space in self._get_spaces()}
+
+    def _space_of(self, vector_id: str) -> Optional[str]:
+        """Space a stored vector belongs to"""
+        self._sync_vector_spaces()
+        shard = self._shard(vector_id)
+        spaces = self._get_spaces()
+        pipe = self.redis_client.pipeline(transaction=False)
+        for space in spaces:
+            pipe.sismember(shard.space_key(space), vector_id)
+        for space, member in zip(spaces, pipe.execute()):
+            if member:
+                return space
+        return None
+
+    def _sync_vector_spaces(self):
+        """Assign vectors stored before spaces existed, once per process"""
+        if self._spaces_checked:
+            return
+        self._spaces_checked = True
+
+        if self._count_vectors() != sum(self._space_size(space) for space in self._get_spaces()):
+            self.rebuild_vector_spaces()
+
+    def rebuild_vector_spaces(self) -> Dict[str, Any]:
+        """Recompute the space index sets from the stored vectors and metadata
+
+        The space is derived from the stored vector's length, since older
+        TF-IDF metadata recorded the requested instead of the actual dimension.
+        """
+        self._unlink_matching([pattern for shard in self.shards
+                               for pattern in (shard.spaces_key, f"{shard.prefix}:space:*")])
+        # Snapshots from before spaces existed cover every vector; the per-space ones are rebuilt
+        self._unlink_matching([self.ann_key, f"{self.ann_key}:*"])
+        self._reset_ann_index()
+
+        counts: Dict[str, int] = {}
+        pipe = self.redis_client.pipeline(transaction=False)
+        records = self._iter_vector_records(self._get_index_ids(), with_vectors=True)
+        for processed, (vector_id, embedding, metadata) in enumerate(records, 1):
+            if embedding is None:
+                continue
+            method = (metadata or {}).get('embedding_method', 'unknown')
+            space = self._vector_space(method, len(embedding))
+            shard = self._shard(vector_id)
+            pipe.sadd(shard.space_key(space), vector_id)
+            pipe.sadd(shard.spaces_key, space)
+            counts[space] = counts.get(space, 0) + 1
+            if processed % self.read_chunk_size == 0:
+                pipe.execute()
+        # Other processes drop their indexes and result caches too
+        for shard in self.shards:
+            self._publish_changes(pipe, shard, 'reset', '', [])
+        pipe.execute()
+
+        self._spaces_checked = True
+        print(f"✅ [SPACES] Assigned {sum(counts.values())} vectors to {len(counts)} spaces")
+        return {'spaces': counts}
+
+    def _get_vector(self, vector_id: str) -> Optional[np.ndarray]:
+        """Load a vector from whichever backend holds it"""
+        if self.storage_backend == "redisearch":
+            vector_data = self.redis_client.hget(self._search_doc_key(vector_id), 'embedding')
+            return np.frombuffer(vector_data, dtype=np.float32) if vector_data else None
+
+        vector_data = self.redis_client.get(self._shard(vector_id).vec_key(vector_id))
+        return self._decode_vector(vector_data) if vector_data else None
+
+    def _get_index_ids(self, shards: Optional[List[VectorShard]] = None) -> List[str]:
+        """Get all vector ids from the index sets of ``shards`` (default: all)"""
+        pipe = self.redis_text.pipeline(transaction=False)
+        for shard in self.shards if shards is None else shards:
+            pipe.smembers(shard.index_key)
+        return [vector_id for members in pipe.execute() for vector_id in members]
+
+    def _iter_vector_records(self, vector_ids: Iterable[str], with_vectors: bool = False,
+                             with_metadata: bool = True,
+                             chunk_size: Optional[int] = None) -> Iterator[Tuple[str, Optional[np.ndarray], Optional[Dict[str, Any]]]]:
+        """Stream (vector_id, embedding, metadata) tuples, one pipelined round trip per chunk
+
+        Missing or undecodable parts are yielded as None.
+        """
+        chunk_size = chunk_size or self.read_chunk_size
+        chunk = []
+        for vector_id in vector_ids:
+            chunk.append(vector_id)
+            if len(chunk) >= chunk_size:
+                yield from self._fetch_vector_records(chunk, with_vectors, with_metadata)
+                chunk = []
+        if chunk:
+            yield from self._fetch_vector_records(chunk, with_vectors, with_metadata)
+
+    def _fetch_vector_records(self, vector_ids: List[str], with_vectors: bool,
+                              with_metadata: bool) -> List[Tuple[str, Optional[np.ndarray], Optional[Dict[str, Any]]]]:
+        """Fetch one chunk of vectors and/or metadata in a single round trip"""
+        if self.storage_backend == "redisearch":
+            pipe = self.redis_client.pipeline(transaction=False)
+            for vector_id in vector_ids:
+                pipe.hmget(self._search_doc_key(vector_id), 'embedding', 'metadata')
+            rows = pipe.execute()
+            vector_values = [row[0] for row in rows]
+            metadata_values = [row[1] for row in rows]
+        else:
+            # One MGET per shard and kind, so every MGET stays within one cluster slot
+            groups = self._group_by_shard(vector_ids)
+            pipe = self.redis_client.pipeline(transaction=False)
+            for number, ids in groups.items():
+                shard = self.shards[number]
+                if with_vectors:
+                    pipe.mget([shard.vec_key(vid) for vid in ids])
+                if with_metadata:
+                    pipe.mget([shard.meta_key(vid) for vid in ids])
+            replies = iter(pipe.execute())
+            vectors, metadatas = {}, {}
+            for ids in groups.values():
+                if with_vectors:
+                    vectors.update(zip(ids, next(replies)))
+                if with_metadata:
+                    metadatas.update(zip(ids, next(replies)))
+            vector_values = [vectors.get(vid) for vid in vector_ids]
+            metadata_values = [metadatas.get(vid) for vid in vector_ids]
+
+        records = []
+        for vector_id, vector_data, metadata_data in zip(vector_ids, vector_values, metadata_values):
+            embedding = metadata = None
+            try:
+                if with_vectors and vector_data:
+                    if self.storage_backend == "redisearch":
+                        embedding = np.frombuffer(vector_data, dtype=np.float32)
+                    else:
+                        embedding = self._decode_vector(vector_data)
+                if with_metadata and metadata_data:
+                    metadata = json.loads(metadata_data.decode('utf-8') if isinstance(metadata_data, bytes) else metadata_data)
+            except Exception as e:
+                print(f"Error decoding vector {vector_id}: {e}")
+            records.append((vector_id, embedding, metadata))
+        return records
+
+    # ------------------------------------------------------------------
+    # RediSearch backend
+    # ------------------------------------------------------------------
+
+    def _search_doc_key(self, vector_id: str) -> str:
+        return self._shard(vector_id).search_doc_key(vector_id)
+
+    def _search_doc_fields(self, embedding: np.ndarray, metadata: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the HASH fields indexed by the RediSearch vector index"""
+        return {
+            'embedding': np.asarray(embedding, dtype='<f4').tobytes(),
+            'metadata': json.dumps(metadata),
+            'original_query': metadata.get('original_query', ''),
+            'refined_query': metadata.get('refined_query', ''),
+            'usecase_summary': metadata.get('usecase_summary', ''),
+            'key_services': ','.join(str(svc).replace(',', ' ') for svc in metadata.get('key_services', [])),
+            'type': metadata.get('type', ''),
+            'content_hash': metadata.get('content_hash', ''),
+            'embedding_method': metadata.get('embedding_method', ''),
+            'embedding_dimensions': len(embedding)
+        }
+
+    def _search_index_for(self, space: str) -> str:
+        """Name of the RediSearch index of a space"""
+        return f"{self.search_index_name}:{space}"
+
+    def _ensure_search_index(self, dim: int, space: str):
+        """Create the RediSearch vector index of a space if it does not exist yet
+
+        The index covers the document prefixes of all shards; each space's
+        index only takes the documents of its method and dimension through
+        an index filter.
+        """
+        if space in self._search_indexes_ready:
+            return
+
+        index_name = self._search_index_for(space)
+        search_index = self.redis_client.ft(index_name)
+        try:
+            search_index.info()
+        except redis.ResponseError:
+            method = space.rsplit(':', 1)[0]
+            vector_attributes = {"TYPE": "FLOAT32", "DIM": dim, "DISTANCE_METRIC": "COSINE"}
+            search_index.create_index(
+                [
+                    VectorField('embedding', self.search_algorithm, vector_attributes),
+                    TextField('original_query'),
+                    TextField('refined_query'),
+                    TextField('usecase_summary'),
+                    TagField('key_services', separator=','),
+                    TagField('type'),
+                    TagField('content_hash'),
+                    TagField('embedding_method'),
+                    NumericField('embedding_dimensions')
+                ],
+                definition=IndexDefinition(
+                    prefix=[f"{shard.prefix}:doc:" for shard in self.shards],
+                    filter=f"@embedding_method=='{method}' && @embedding_dimensions=={dim}",
+                    index_type=IndexType.HASH
+                )
+            )
+            print(f"✅ [SEARCH] Created {self.search_algorithm} index {index_name} (dim={dim})")
+        self._search_indexes_ready.add(space)
+
+    def _search_filter_expression(self, usecase_filter: Optional[str],
+                                  services_filter: Optional[List[str]] = None,
+                                  types_filter: Optional[List[str]] = None) -> str:
+        """Translate the usecase/service/type filters into a RediSearch pre-filter"""
+        clauses = []
+
+        terms = []
+        if usecase_filter and usecase_filter != "All":
+            terms = [term for term in re.split(r'\W+', usecase_filter.lower()) if term]
+        if terms:
+            # Prefix-match the last term so partially typed filters still match
+            terms[-1] = f"{terms[-1]}*"
+            clauses.append(f"@original_query|refined_query|usecase_summary:({' '.join(terms)})")
+
+        if services_filter:
+            clauses.append(f"@key_services:{{{'|'.join(self._escape_tag(svc) for svc in services_filter)}}}")
+        if types_filter:
+            clauses.append(f"@type:{{{'|'.join(self._escape_tag(t) for t in types_filter)}}}")
+
+        return " ".join(clauses) if clauses else "*"
+
+    @staticmethod
+    def _escape_tag(value: str) -> str:
+        """Escape punctuation and spaces in a TAG query value"""
+        return re.sub(r'([^A-Za-z0-9])', r'\\\1', str(value).replace(',', ' '))
+
+    def _search_knn(self, query_embedding: np.ndarray, top_k: int,
+                    usecase_filter: Optional[str] = None, min_similarity: Optional[float] = None,
+                    match_type: Optional[str] = None, exclude_id: Optional[str] = None,
+                    services_filter: Optional[List[str]] = None,
+                    types_filter: Optional[List[str]] = None,
+                    space: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Run a server-side KNN query against one space's index with the usecase/service/type pre-filter"""
+        # Leave headroom for the excluded document and content-hash duplicates
+        knn = top_k * 2 + 1
+        query = (
+            Query(f"({self._search_filter_expression(usecase_filter, services_filter, types_filter)})=>[KNN {knn} @embedding $vec AS vector_score]")
+            .sort_by('vector_score')
+            .return_fields('metadata', 'vector_score')
+            .paging(0, knn)
+            .dialect(2)
         )
-        redis_text.set(hash_key, vector_id)
-
-    def _store_vector(self, vector_id: str, embedding: np.ndarray, metadata: Dict[str, Any]):
-        """Store vector with metadata"""
-        vector_key = f"{self.vector_prefix}:vec:{vector_id}"
-        metadata_key = f"{self.vector_prefix}:meta:{vector_id}"
-
-        # Store vector as binary data
-        self.redis_client.set(vector_key, pickle.dumps(embedding))
-
-        # Store metadata as JSON
-        self.redis_client.set(metadata_key, json.dumps(metadata))
-
-        # Add to vector index
-        index_key = f"{self.vector_prefix}:index"
-        self.redis_client.sadd(index_key, vector_id)
-
-    def _prepare_tfidf_corpus(self, documents: List[Dict[str, Any]]):
-        """Prepare TF-IDF corpus if using TF-IDF method"""
-        if self.embedding_service.method == "tfidf" and documents:
-            texts = []
-            for doc in documents:
-                content = str(doc.get('content', ''))
-                if content.strip():
-                    texts.append(content)
-            
-            if texts:
-                self.embedding_service.fit_tfidf_corpus(texts)
 
-    def store_usecase_data(self, data: Dict[str, Any]) -> str:
-        """Store usecase documentation data with AWS Titan embeddings"""
-        timestamp = datetime.now().isoformat()
+        try:
+            response = self.redis_client.ft(self._search_index_for(space or self.active_space)).search(
+                query, query_params={'vec': np.asarray(query_embedding, dtype='<f4').tobytes()}
+            )
+        except redis.ResponseError as e:
+            print(f"Error running KNN query: {e}")
+            return []
+
+        results = []
+        seen_hashes = set()
+        for doc in response.docs:
+            vector_id = doc.id.rsplit(':doc:', 1)[-1]
+            if exclude_id and self._parent_id(vector_id) == self._parent_id(exclude_id):
+                continue
+
+            # COSINE distance is 1 - cosine similarity
+            similarity = 1.0 - float(doc.vector_score)
+            if min_similarity is not None and similarity < min_similarity:
+                break
+
+            try:
+                metadata = json.loads(doc.metadata)
+            except Exception as e:
+                print(f"Error processing vector {vector_id}: {e}")
+                continue
+
+            content_hash = metadata.get('content_hash', '')
+            if content_hash in seen_hashes:
+                continue
+            seen_hashes.add(content_hash)
+
+            result = {
+                'vector_id': vector_id,
+                'similarity': similarity,
+                'metadata': metadata
+            }
+            if match_type:
+                result['match_type'] = match_type
+            results.append(result)
+
+            if len(results) >= top_k:
+                break
+
+        return results
+
+    def migrate_to_redisearch(self, batch_size: int = 500) -> Dict[str, int]:
+        """Move vectors from the :vec:/:meta: key layout into RediSearch HASH documents"""
+        if self.storage_backend != "redisearch":
+            return {'error': 'RediSearch backend is not active', 'migrated': 0, 'skipped': 0, 'failed': 0}
+
+        vector_ids = self._get_index_ids()
+
+        migrated = skipped = failed = 0
+        for start in range(0, len(vector_ids), batch_size):
+            batch = vector_ids[start:start + batch_size]
+            pipe = self.redis_client.pipeline(transaction=False)
+            for vector_id in batch:
+                pipe.get(self._shard(vector_id).vec_key(vector_id))
+                pipe.get(self._shard(vector_id).meta_key(vector_id))
+            values = pipe.execute()
+
+            pipe = self.redis_client.pipeline(transaction=True)
+            for i, vector_id in enumerate(batch):
+                vector_data, metadata_data = values[2 * i], values[2 * i + 1]
+                if not vector_data or not metadata_data:
+                    skipped += 1
+                    continue
+                try:
+                    embedding = self._decode_vector(vector_data)
+                    metadata = json.loads(metadata_data)
+                    self._ensure_search_index(
+                        len(embedding),
+                        self._vector_space(metadata.get('embedding_method', 'unknown'), len(embedding))
+                    )
+                    pipe.hset(self._search_doc_key(vector_id), mapping=self._search_doc_fields(embedding, metadata))
+                    pipe.delete(self._shard(vector_id).vec_key(vector_id), self._shard(vector_id).meta_key(vector_id))
+                    migrated += 1
+                except Exception as e:
+                    print(f"Error migrating vector {vector_id}: {e}")
+                    failed += 1
+            pipe.execute()
+            print(f"🔄 [SEARCH] Migrated {migrated}/{len(vector_ids)} vectors")
+
+        # The in-process ANN snapshots only serve the keys backend
+        self._unlink_matching([self.ann_key, f"{self.ann_key}:*"])
+        self._reset_ann_index()
+
+        return {'migrated': migrated, 'skipped': skipped, 'failed': failed}
+
+    def _init_quantization(self, quantization: Optional[str]) -> str:
+        """Resolve the quantization mode (VECTOR_ENCODING is honoured for older deployments)"""
+        if quantization is None:
+            legacy = os.getenv('VECTOR_ENCODING')
+            quantization = os.getenv('VECTOR_QUANTIZATION') or {
+                'float32': 'none', 'float16': 'float16', 'int8': 'int8'
+            }.get(legacy, 'none')
+
+        if quantization not in QUANTIZATION_MODES:
+            print(f"⚠️ [QUANT] Unknown quantization '{quantization}', storing float32 vectors")
+            return "none"
+        return quantization
+
+    def _stored_vector_encoding(self) -> str:
+        """Encoding of the per-vector keys for the chosen quantization
+
+        PQ codes live in the ANN index only; the keys hold int8 vectors that
+        the index is rebuilt from and that re-rank PQ candidates.
+        """
+        if self.keep_full_precision or self.quantization == "none":
+            return "float32"
+        return "int8" if self.quantization == "pq" else self.quantization
+
+    @property
+    def _rerank_enabled(self) -> bool:
+        """Whether the stored vectors are more precise than the ANN index rows"""
+        if self.quantization == "none" or self.rerank_candidates <= 0:
+            return False
+        return self.keep_full_precision or self.quantization == "pq"
+
+    def _rerank_hits(self, query_embedding: np.ndarray,
+                     hits: List[Tuple[str, float]]) -> List[Tuple[str, float]]:
+        """Re-score the top ANN hits with the stored vectors, best first"""
+        head = hits[:self.rerank_candidates]
+        query = np.asarray(query_embedding, dtype=np.float32).ravel()
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        scores = np.array([score for _, score in head], dtype=np.float32)
+        position = {vector_id: i for i, (vector_id, _) in enumerate(head)}
+        rows, vectors = [], []
+        for vector_id, embedding, _ in self._iter_vector_records(
+                position, with_vectors=True, with_metadata=False):
+            if embedding is not None and embedding.shape == query.shape:
+                rows.append(position[vector_id])
+                vectors.append(embedding)
+
+        if vectors:
+            matrix = np.vstack(vectors)
+            norms = np.linalg.norm(matrix, axis=1)
+            valid = norms > 0
+            scores[np.asarray(rows)[valid]] = (matrix[valid] @ query) / norms[valid]
+
+        order = np.argsort(-scores, kind="stable")
+        return [(head[i][0], float(scores[i])) for i in order] + hits[self.rerank_candidates:]
+
+    def _encode_vector(self, embedding: np.ndarray) -> bytes:
+        """Encode a vector in the binary wire format (sparse for TF-IDF vectors)"""
+        if self.embedding_service.method == "tfidf":
+            return encode_vector(embedding, "sparse")
+        return encode_vector(embedding, self.vector_encoding)
+
+    def _decode_vector(self, vector_data: bytes) -> np.ndarray:
+        """Decode a stored vector (binary format, or a not yet migrated pickle)"""
+        if is_encoded(vector_data):
+            return decode_vector(vector_data)
+        if is_legacy_pickle(vector_data):
+            self._legacy_vectors_seen = True
+            return load_legacy_pickle(vector_data)
+        raise ValueError("Unknown vector encoding")
+
+    def migrate_vector_format(self, batch_size: int = 500, pause: float = 0.0) -> Dict[str, Any]:
+        """Rewrite pickled vectors in the binary format, batch by batch"""
+        vector_ids = self._get_index_ids()
+
+        status = self._format_migration
+        status.update({
+            'state': 'running',
+            'total': len(vector_ids),
+            'processed': 0,
+            'converted': 0,
+            'failed': 0,
+            'bytes_before': 0,
+            'bytes_after': 0,
+            'started_at': datetime.now().isoformat()
+        })
+
+        for start in range(0, len(vector_ids), batch_size):
+            batch = vector_ids[start:start + batch_size]
+            # WATCH/MULTI must stay within one shard (one cluster slot)
+            for number, ids in self._group_by_shard(batch).items():
+                self._migrate_vector_batch([self.shards[number].vec_key(vid) for vid in ids], status)
+            status['processed'] += len(batch)
+            if pause:
+                time.sleep(pause)
+
+        status['state'] = 'completed'
+        status['finished_at'] = datetime.now().isoformat()
+        print(f"✅ [CODEC] Converted {status['converted']} vectors "
+              f"({status['bytes_before']} -> {status['bytes_after']} bytes)")
+        return dict(status)
+
+    def _migrate_vector_batch(self, vector_keys: List[str], status: Dict[str, Any]):
+        """Convert one batch, skipping keys that change while we convert them"""
+        with self.redis_client.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    pipe.watch(*vector_keys)
+                    values = pipe.mget(vector_keys)
+
+                    rewrites = {}
+                    for vector_key, vector_data in zip(vector_keys, values):
+                        if not vector_data or not is_legacy_pickle(vector_data):
+                            continue
+                        try:
+                            rewrites[vector_key] = (len(vector_data), self._encode_vector(load_legacy_pickle(vector_data)))
+                        except Exception as e:
+                            print(f"Error converting {vector_key}: {e}")
+                            status['failed'] += 1
+
+                    if not rewrites:
+                        pipe.unwatch()
+                        return
+
+                    pipe.multi()
+                    for vector_key, (_, encoded) in rewrites.items():
+                        pipe.set(vector_key, encoded)
+                    pipe.execute()
+                    break
+                except redis.WatchError:
+                    # A vector in this batch was rewritten concurrently; re-read it
+                    continue
 
-        # Store main data
-        redis_text = redis.Redis(
-            host=os.getenv('REDIS_HOST', 'localhost'),
-            port=int(os.getenv('REDIS_PORT', 6379)),
-            password=os.getenv('REDIS_PASSWORD', 'Localdev@123'),
-            decode_responses=True
+        for old_size, encoded in rewrites.values():
+            status['converted'] += 1
+            status['bytes_before'] += old_size
+            status['bytes_after'] += len(encoded)
+
+    def start_vector_format_migration(self, batch_size: int = 500, pause: float = 0.05) -> bool:
+        """Run migrate_vector_format in a background thread"""
+        if self._format_migration_thread and self._format_migration_thread.is_alive():
+            return False
+
+        def run():
+            try:
+                self.migrate_vector_format(batch_size=batch_size, pause=pause)
+            except Exception as e:
+                self._format_migration.update({'state': 'failed', 'error': str(e)})
+                print(f"❌ [CODEC] Vector format migration failed: {e}")
+
+        self._format_migration_thread = threading.Thread(target=run, name="vector-format-migration", daemon=True)
+        self._format_migration_thread.start()
+        return True
+
+    def get_vector_format_migration_status(self) -> Dict[str, Any]:
+        """Get progress of the pickle -> binary vector migration"""
+        return dict(self._format_migration)
+
+    def reembed_vectors(self, rate: Optional[float] = None, batch_size: Optional[int] = None) -> Dict[str, Any]:
+        """Re-embed vectors of other spaces with the current model, batch by batch
+
+        At most ``rate`` documents per second are re-embedded (REEMBED_RATE),
+        leaving Bedrock quota for interactive ingestion and search. Vector ids,
+        content hashes and the filter/text indexes are kept; only the vector,
+        its metadata and its space change.
+        """
+        if not self.embedding_service.is_available():
+            return {'error': 'No embedding service available', 'state': 'failed'}
+
+        self._sync_vector_spaces()
+        batch_size = batch_size or self.reembed_batch_size
+        limiter = TokenBucket(rate if rate is not None else self.reembed_rate, capacity=batch_size)
+        target = self.active_space
+        sources = {space: count for space, count in self.get_vector_spaces().items() if space != target and count}
+
+        status = self._reembedding
+        status.update({
+            'state': 'running',
+            'target_space': target,
+            'source_spaces': sources,
+            'total': sum(sources.values()),
+            'processed': 0,
+            'reembedded': 0,
+            'failed': 0,
+            'started_at': datetime.now().isoformat()
+        })
+
+        for space in sources:
+            vector_ids = sorted(self._space_members(space))
+            for start in range(0, len(vector_ids), batch_size):
+                batch = vector_ids[start:start + batch_size]
+                limiter.acquire(len(batch))
+                reembedded = self._reembed_batch(space, batch)
+                status['processed'] += len(batch)
+                status['reembedded'] += reembedded
+                status['failed'] += len(batch) - reembedded
+
+            if not self._space_size(space):
+                # Fully migrated: forget the space and its ANN snapshot
+                pipe = self.redis_client.pipeline(transaction=False)
+                for shard in self.shards:
+                    pipe.srem(shard.spaces_key, space)
+                pipe.execute()
+                self._unlink_matching([self._ann_snapshot_key(space)])
+                self.ann_indexes.pop(space, None)
+
+        self._persist_ann_index()
+        status['state'] = 'completed'
+        status['finished_at'] = datetime.now().isoformat()
+        print(f"✅ [REEMBED] Re-embedded {status['reembedded']}/{status['total']} vectors into {target}")
+        return dict(status)
+
+    def _reembed_batch(self, space: str, vector_ids: List[str]) -> int:
+        """Re-embed one batch of vectors from ``space`` into the active space"""
+        records = [(vid, md) for vid, _, md in self._iter_vector_records(vector_ids) if md]
+        if not records:
+            return 0
+
+        # Embed the full document text the same way ingestion does
+        pipe = self.redis_text.pipeline(transaction=False)
+        for _, metadata in records:
+            pipe.hget(metadata.get('doc_key', ''), 'content')
+        texts = []
+        for (_, metadata), content in zip(records, pipe.execute()):
+            try:
+                content_text = json.loads(content) if content else metadata.get('content_preview', '')
+            except ValueError:
+                content_text = content
+            if content and 'chunk_start' in metadata:
+                content_text = content_text[metadata['chunk_start']:metadata['chunk_end']]
+            texts.append(f"{content_text} {metadata.get('usecase_summary', '')}")
+
+        self.embedding_service.fit_tfidf_corpus(texts)
+        embeddings = self._create_embeddings(texts)
+
+        method = self.embedding_service.method
+        pipe = self._write_pipeline()
+        moved = []
+        for (vector_id, metadata), embedding in zip(records, embeddings):
+            if embedding is None:
+                continue
+            new_metadata = dict(metadata, embedding_method=method, embedding_dimensions=len(embedding))
+            new_space = self._vector_space(method, len(embedding))
+            shard = self._shard(vector_id)
+            write = pipe.shard(shard)
+
+            if self.storage_backend == "redisearch":
+                self._ensure_search_index(len(embedding), new_space)
+                write.hset(shard.search_doc_key(vector_id), mapping=self._search_doc_fields(embedding, new_metadata))
+            else:
+                write.set(shard.vec_key(vector_id), self._encode_vector(embedding))
+                write.set(shard.meta_key(vector_id), json.dumps(new_metadata))
+            if metadata.get('doc_key'):
+                # Documents stored before sharding live outside the shard's slot
+                pipe.common().hset(metadata['doc_key'], mapping={
+                    'embedding_method': method,
+                    'embedding_dimensions': len(embedding)
+                })
+
+            shard.statistics.record(write, metadata, -1)
+            shard.statistics.record(write, new_metadata)
+            write.srem(shard.space_key(space), vector_id)
+            write.sadd(shard.space_key(new_space), vector_id)
+            write.sadd(shard.spaces_key, new_space)
+            self._publish_changes(write, shard, 'add', new_space, [vector_id])
+            moved.append((vector_id, new_space, embedding))
+
+        try:
+            pipe.execute()
+        except Exception as e:
+            print(f"Error committing re-embedded batch: {e}")
+            return 0
+
+        self._ann_remove([vector_id for vector_id, _, _ in moved])
+        self._on_vectors_stored(moved)
+        return len(moved)
+
+    def start_reembedding_job(self, rate: Optional[float] = None, batch_size: Optional[int] = None) -> bool:
+        """Run reembed_vectors in a background thread"""
+        if self._reembedding_thread and self._reembedding_thread.is_alive():
+            return False
+
+        def run():
+            try:
+                self.reembed_vectors(rate=rate, batch_size=batch_size)
+            except Exception as e:
+                self._reembedding.update({'state': 'failed', 'error': str(e)})
+                print(f"❌ [REEMBED] Re-embedding failed: {e}")
+
+        self._reembedding_thread = threading.Thread(target=run, name="vector-reembedding", daemon=True)
+        self._reembedding_thread.start()
+        return True
+
+    def get_reembedding_status(self) -> Dict[str, Any]:
+        """Get progress of the re-embedding job"""
+        return dict(self._reembedding)
+
+    def _get_ann_index(self, space: Optional[str] = None) -> IVFIndex:
+        """Get the ANN index of a space (default: the active one), loading or building it on first use"""
+        self._sync_vector_spaces()
+        space = space or self.active_space
+        if self.ann_indexes:
+            # Another process may have written vectors since we last looked
+            self._apply_changes(space)
+
+        index = self.ann_indexes.get(space)
+        if index is None:
+            # Changes published during the full sync are replayed later; replaying is idempotent
+            if not self._stream_position:
+                self._stream_position = self._last_change_ids()
+            index = self.ann_indexes[space] = self._load_ann_index(space)
+            self._ann_skipped[space] = set()
+            self._sync_ann_index(space)
+        return index
+
+    def _publish_changes(self, pipe, shard: VectorShard, op: str, space: str, vector_ids: List[str]):
+        """Queue a change event ('add', 'remove' or 'reset') on the shard's change
+        stream and bump its index version"""
+        pipe.incr(shard.version_key)
+        pipe.xadd(
+            shard.change_stream_key,
+            {'op': op, 'space': space, 'ids': ','.join(vector_ids), 'origin': self._instance_id},
+            maxlen=self.change_stream_maxlen,
+            approximate=True
         )
 
-        main_key = f"{self.key_prefix}:data:{timestamp}"
-        redis_text.set(main_key, json.dumps(data))
+    def _shard_versions(self) -> List[int]:
+        return [int(version or 0) for version in mget(self.redis_client, [shard.version_key for shard in self.shards])]
+
+    def _index_version(self) -> int:
+        # Per-shard counters only grow, so their sum changes with every write
+        return sum(self._shard_versions())
+
+    def _last_change_ids(self) -> Dict[int, str]:
+        pipe = self.redis_text.pipeline(transaction=False)
+        for shard in self.shards:
+            pipe.xrevrange(shard.change_stream_key, count=1)
+        return {
+            shard.number: entries[0][0] if entries else "0-0"
+            for shard, entries in zip(self.shards, pipe.execute())
+        }
+
+    def _apply_changes(self, space: str):
+        """Replay change events of other processes on the loaded ANN indexes
+
+        Keeping an index current costs one XRANGE per shard and search
+        instead of an id-set comparison. The space's SCARD is read in the
+        same round trip (one MULTI on a single node); if it still disagrees
+        with the index afterwards (events trimmed from the stream, writers
+        predating it) the space falls back to a full sync. A vector's events
+        all go to its own shard's stream, so their order is kept.
+        """
+        while True:
+            pipe = self.redis_text.pipeline(transaction=not self.cluster)
+            for shard in self.shards:
+                position = self._stream_position.get(shard.number, "0-0")
+                pipe.xrange(shard.change_stream_key, min=f"({position}", count=self.change_stream_page)
+                pipe.scard(shard.space_key(space))
+            replies = pipe.execute()
+            pages = replies[0::2]
+            stored = sum(replies[1::2])
+            entries = []
+            for shard, page in zip(self.shards, pages):
+                if page:
+                    self._stream_position[shard.number] = page[-1][0]
+                    entries.extend(page)
+
+            # Net effect per id: the last event wins
+            removed = set()
+            added: Dict[str, set] = {}
+            for _, fields in entries:
+                if fields.get('origin') == self._instance_id:
+                    continue
+                if fields.get('op') == 'reset':
+                    print("🔄 [ANN] Vectors were cleared by another process, reloading indexes")
+                    self._reset_ann_index()
+                    return
+                vector_ids = set(filter(None, fields.get('ids', '').split(',')))
+                for ids in added.values():
+                    ids -= vector_ids
+                if fields.get('op') == 'add':
+                    removed -= vector_ids
+                    added.setdefault(fields.get('space', ''), set()).update(vector_ids)
+                else:
+                    removed |= vector_ids
+
+            # Re-embedded vectors move between spaces, so every added id is dropped first
+            self._ann_remove(removed.union(*added.values()))
+            for added_space, vector_ids in added.items():
+                if added_space not in self.ann_indexes:
+                    continue
+                for vector_id, embedding, _ in self._iter_vector_records(vector_ids, with_vectors=True, with_metadata=False):
+                    if embedding is None:
+                        self._ann_skipped[added_space].add(vector_id)
+                    else:
+                        self._ann_add(added_space, vector_id, embedding)
+
+            if all(len(page) < self.change_stream_page for page in pages):
+                break
+
+        index = self.ann_indexes.get(space)
+        if index is not None and stored != len(index) + len(self._ann_skipped[space]):
+            self._sync_ann_index(space)
+
+    def _ann_snapshot_key(self, space: str) -> str:
+        return f"{self.ann_key}:{space}"
+
+    def _load_ann_index(self, space: str) -> IVFIndex:
+        """Load the persisted ANN index snapshot of a space from Redis"""
+        snapshot = self.redis_client.get(self._ann_snapshot_key(space))
+        if snapshot:
+            try:
+                index = IVFIndex.from_bytes(snapshot, min_train_size=self.ann_min_train_size,
+                                            mmap_dir=self.ann_mmap_dir)
+                index.nprobe = self.ann_nprobe
+                if index.quantization == self.quantization:
+                    print(f"✅ [ANN] Loaded {space} index snapshot with {len(index)} vectors")
+                    return index
+                print(f"🔄 [ANN] Snapshot uses {index.quantization} quantization, rebuilding as {self.quantization}")
+            except Exception as e:
+                print(f"⚠️ [ANN] Could not load {space} index snapshot, rebuilding: {e}")
+
+        return IVFIndex(
+            nprobe=self.ann_nprobe,
+            min_train_size=self.ann_min_train_size,
+            quantization=self.quantization,
+            pq_subvectors=self.pq_subvectors,
+            pq_min_train_size=self.ann_min_train_size,
+            mmap_dir=self.ann_mmap_dir
+        )
+
+    def _sync_ann_index(self, space: str):
+        """Bring a space's ANN index in line with the space's index set"""
+        index = self.ann_indexes[space]
+        stored_ids = self._space_members(space)
+        indexed_ids = set(index.ids())
+
+        stale_ids = indexed_ids - stored_ids
+        for vector_id in stale_ids:
+            index.remove(vector_id)
+        self._ann_skipped[space] &= stored_ids
+
+        missing_ids = stored_ids - indexed_ids - self._ann_skipped[space]
+        for vector_id, embedding, _ in self._iter_vector_records(missing_ids, with_vectors=True, with_metadata=False):
+            if embedding is None:
+                self._ann_skipped[space].add(vector_id)
+                continue
+            self._ann_add(space, vector_id, embedding)
+
+        if stale_ids or missing_ids:
+            print(f"🔄 [ANN] Synced {space} index: +{len(missing_ids)} / -{len(stale_ids)} vectors")
+            self._ann_dirty[space] = self._ann_dirty.get(space, 0) + len(stale_ids) + len(missing_ids)
+            self._persist_ann_index()
+
+        # Pickled vectors from before the binary format: convert them in the background
+        if self._legacy_vectors_seen:
+            self._legacy_vectors_seen = False
+            if self.start_vector_format_migration():
+                print("🔄 [CODEC] Legacy pickled vectors found, started background format migration")
+
+    def _ann_add(self, space: str, vector_id: str, embedding: np.ndarray):
+        """Add a vector to a space's ANN index, remembering vectors it cannot hold"""
+        if self.ann_indexes[space].add(vector_id, embedding):
+            self._ann_skipped[space].discard(vector_id)
+            self._ann_dirty[space] = self._ann_dirty.get(space, 0) + 1
+        else:
+            # Zero vector; it stays out of ANN search
+            self._ann_skipped[space].add(vector_id)
+
+    def _ann_remove(self, vector_ids: Iterable[str]):
+        """Drop vectors from every loaded ANN index"""
+        for space, index in self.ann_indexes.items():
+            for vector_id in vector_ids:
+                if index.remove(vector_id):
+                    self._ann_dirty[space] = self._ann_dirty.get(space, 0) + 1
+                self._ann_skipped[space].discard(vector_id)
+
+    def _persist_ann_index(self):
+        """Save changed ANN index snapshots so restarts don't rebuild them from scratch"""
+        for space, index in self.ann_indexes.items():
+            if not self._ann_dirty.get(space):
+                continue
+            try:
+                self.redis_client.set(self._ann_snapshot_key(space), index.to_bytes())
+                self._ann_dirty[space] = 0
+            except Exception as e:
+                print(f"⚠️ [ANN] Could not persist {space} index snapshot: {e}")
+
+    def store_usecase_data(self, data: Dict[str, Any]) -> str:
+        """Store usecase documentation data with AWS Titan embeddings"""
+        timestamp = datetime.now().isoformat()
+        started = time.perf_counter()
 
         # Extract usecase information
         original_query = data.get('original_query', '')
@@ -519,121 +1784,213 @@ class RedisVectorService:
             'embedding_method': self.embedding_service.method,
             'embedding_dimensions': self.embedding_dimensions
         }
-        
+
+        # Store main data, usecase metadata and search results in one round trip
+        main_key = f"{self.key_prefix}:data:{timestamp}"
+        pipe = self.redis_text.pipeline(transaction=False)
+        pipe.set(main_key, json.dumps(data))
+
         metadata_key = f"{self.key_prefix}:usecase_metadata:{timestamp}"
-        redis_text.hset(metadata_key, mapping={k: json.dumps(v) if isinstance(v, (list, dict)) else str(v) for k, v in usecase_metadata.items()})
+        pipe.hset(metadata_key, mapping={k: json.dumps(v) if isinstance(v, (list, dict)) else str(v) for k, v in usecase_metadata.items()})
 
-        # Store search results
         search_results = data.get('search_results', {})
         if search_results:
             search_key = f"{self.key_prefix}:search:{timestamp}"
-            redis_text.set(search_key, json.dumps(search_results))
+            pipe.set(search_key, json.dumps(search_results))
+        pipe.execute()
 
         # Process raw documentation and create vectors
         raw_documentation = data.get('raw_documentation', [])
-        
-        # Prepare TF-IDF corpus if needed
-        self._prepare_tfidf_corpus(raw_documentation)
-        
+
+        ingest_stats = self._ingest_documents(raw_documentation, timestamp, usecase_metadata, enhanced_documentation)
+        vector_ids = ingest_stats['vector_ids']
+
+        elapsed = time.perf_counter() - started
+        docs_per_second = len(raw_documentation) / elapsed if elapsed > 0 else 0.0
+
+        # Update usecase metadata with deduplication stats
+        usecase_metadata.update({
+            'new_documents': ingest_stats['new_documents'],
+            'duplicate_documents': ingest_stats['duplicate_documents'],
+            'total_processed': len(raw_documentation),
+            'vector_ids_count': len(vector_ids),
+            'ingest_seconds': round(elapsed, 3),
+            'docs_per_second': round(docs_per_second, 1)
+        })
+
+        # Store vector mapping and add to recent usecase queries list in one round trip
+        pipe = self.redis_text.pipeline(transaction=False)
+        if vector_ids:
+            vector_mapping_key = f"{self.key_prefix}:vectors:{timestamp}"
+            pipe.set(vector_mapping_key, json.dumps(vector_ids))
+        self._add_to_recent_usecase_queries(timestamp, usecase_metadata, pipe)
+        pipe.execute()
+
+        self._persist_ann_index()
+
+        print(f"Usecase storage complete: {ingest_stats['new_documents']} new documents, "
+              f"{ingest_stats['duplicate_documents']} duplicates skipped "
+              f"({docs_per_second:.1f} docs/sec)")
+        print(f"Embedding method used: {self.embedding_service.method}")
+        return main_key
+
+    def _ingest_documents(self, raw_documentation: List[Dict[str, Any]], timestamp: str,
+                          usecase_metadata: Dict[str, Any],
+                          enhanced_documentation: Dict[str, Any]) -> Dict[str, Any]:
+        """Deduplicate, embed and store raw documents in batches
+
+        Each batch costs one MGET for content hashes, concurrent embedding
+        calls and one MULTI/EXEC pipeline for all document, vector, metadata
+        and hash-mapping writes. Documents longer than one chunk (see
+        ``chunker``) are stored as one vector per chunk: the first keeps the
+        document's vector id, the others are "<vector id>#<n>".
+        """
+        usecase_summary = enhanced_documentation.get('usecase_summary', '')
         vector_ids = []
         duplicate_count = 0
         new_document_count = 0
 
+        candidates = []
         for i, doc in enumerate(raw_documentation):
             content_text = str(doc.get('content', ''))
-            source = doc.get('source', '')
-            doc_type = doc.get('type', '')
-            
             if not content_text.strip():
                 continue
-
-            # Generate content hash for deduplication
+            source = doc.get('source', '')
+            doc_type = doc.get('type', '')
             content_hash = self._generate_content_hash(content_text, source, doc_type)
-            
-            # Check if document already exists
-            existing_vector_id = self._document_exists(content_hash)
-            
-            if existing_vector_id:
-                vector_ids.append(existing_vector_id)
-                duplicate_count += 1
-                print(f"Duplicate document found: {source} - {doc_type[:50]}...")
+            candidates.append((i, doc, content_text, source, doc_type, content_hash))
+
+        for start in range(0, len(candidates), self.ingest_batch_size):
+            batch = candidates[start:start + self.ingest_batch_size]
+
+            # Deduplicate against the store and within the batch
+            existing = self._find_existing_documents([item[5] for item in batch])
+            new_docs = []
+            for item in batch:
+                content_hash = item[5]
+                if content_hash in existing:
+                    vector_ids.append(existing[content_hash])
+                    duplicate_count += 1
+                    print(f"Duplicate document found: {item[3]} - {item[4][:50]}...")
+                    continue
+                existing[content_hash] = f"{timestamp}:{item[0]}"
+                new_docs.append(item)
+
+            if not new_docs:
                 continue
 
-            # Document is new, proceed with storage
-            doc_key = f"{self.key_prefix}:doc:{timestamp}:{i}"
-
-            # Store document data
-            doc_data = {
-                'type': doc_type,
-                'source': source,
-                'parent': doc.get('parent', ''),
-                'content': json.dumps(content_text),
-                'content_hash': content_hash,
-                'original_query': original_query,
-                'refined_query': refined_query,
-                'usecase_context': enhanced_documentation.get('usecase_summary', ''),
-                'embedding_method': self.embedding_service.method,
-                'embedding_dimensions': self.embedding_dimensions,
-                'created_at': timestamp
-            }
-            redis_text.hset(doc_key, mapping=doc_data)
+            # Split documents into chunks; each chunk is embedded and stored as its own vector
+            chunks = [
+                (doc_number, chunk_index, chunk_start, chunk_end)
+                for doc_number, (_, _, content_text, _, _, _) in enumerate(new_docs)
+                for chunk_index, (chunk_start, chunk_end) in enumerate(self.chunker.split(content_text))
+            ]
 
-            # Create and store vectors (if embedding service is available)
+            # Create embeddings concurrently (if embedding service is available)
+            embeddings = [None] * len(chunks)
             if self.embedding_service.is_available():
                 # Combine content with usecase context for better embeddings
-                embedding_text = f"{content_text} {enhanced_documentation.get('usecase_summary', '')}"
-                embedding = self._create_embedding(embedding_text)
-                
-                if embedding is not None:
-                    vector_id = f"{timestamp}:{i}"
+                texts = [f"{new_docs[doc_number][2][chunk_start:chunk_end]} {usecase_summary}"
+                         for doc_number, _, chunk_start, chunk_end in chunks]
+                # Only documents that are actually stored count towards TF-IDF document frequencies
+                self.embedding_service.fit_tfidf_corpus(texts)
+                embeddings = self._create_embeddings(texts)
+
+            doc_chunks: Dict[int, list] = {}
+            for (doc_number, chunk_index, chunk_start, chunk_end), embedding in zip(chunks, embeddings):
+                doc_chunks.setdefault(doc_number, []).append((chunk_index, chunk_start, chunk_end, embedding))
+
+            pipe = self._write_pipeline()
+            stored = []
+            for doc_number, (i, doc, content_text, source, doc_type, content_hash) in enumerate(new_docs):
+                parent_id = f"{timestamp}:{i}"
+                # The document goes to the shard of its vectors
+                shard = self._shard(parent_id)
+                doc_key = shard.doc_key(timestamp, i)
+                parts = doc_chunks.get(doc_number, [])
+                dimensions = next((len(e) for _, _, _, e in parts if e is not None), self.embedding_dimensions)
+
+                # Store document data
+                pipe.shard(shard).hset(doc_key, mapping={
+                    'type': doc_type,
+                    'source': source,
+                    'parent': doc.get('parent', ''),
+                    'content': json.dumps(content_text),
+                    'content_hash': content_hash,
+                    'original_query': usecase_metadata['original_query'],
+                    'refined_query': usecase_metadata['refined_query'],
+                    'usecase_context': usecase_summary,
+                    'embedding_method': self.embedding_service.method,
+                    'embedding_dimensions': dimensions,
+                    'chunk_count': len(parts),
+                    'created_at': timestamp
+                })
+
+                for chunk_index, chunk_start, chunk_end, embedding in parts:
+                    if embedding is None:
+                        continue
+
+                    vector_id = parent_id if chunk_index == 0 else f"{parent_id}#{chunk_index}"
+                    chunk_hash = content_hash if chunk_index == 0 else f"{content_hash}#{chunk_index}"
                     vector_metadata = {
                         'doc_key': doc_key,
                         'timestamp': timestamp,
                         'doc_index': i,
+                        'parent_id': parent_id,
+                        'chunk_index': chunk_index,
+                        'chunk_count': len(parts),
+                        'chunk_start': chunk_start,
+                        'chunk_end': chunk_end,
+                        'chunk_hash': chunk_hash,
                         'type': doc_type,
                         'source': source,
                         'parent': doc.get('parent', ''),
-                        'content_preview': content_text[:200],
+                        'content_preview': content_text[chunk_start:chunk_end][:200],
                         'content_hash': content_hash,
-                        'original_query': original_query,
-                        'refined_query': refined_query,
-                        'usecase_summary': enhanced_documentation.get('usecase_summary', ''),
+                        'original_query': usecase_metadata['original_query'],
+                        'refined_query': usecase_metadata['refined_query'],
+                        'usecase_summary': usecase_summary,
                         'key_services': enhanced_documentation.get('key_services', []),
                         'key_recommendations': enhanced_documentation.get('key_recommendations', []),
                         'query_refined': usecase_metadata.get('query_refined', False),
                         'enhanced_by_bedrock': usecase_metadata.get('enhanced_by_bedrock', False),
                         'embedding_method': self.embedding_service.method,
-                        'embedding_dimensions': self.embedding_dimensions,
+                        'embedding_dimensions': len(embedding),
                         'created_at': timestamp
                     }
-
                     try:
-                        self._store_vector(vector_id, embedding, vector_metadata)
-                        self._store_document_hash(content_hash, vector_id)
-                        vector_ids.append(vector_id)
-                        new_document_count += 1
+                        space = self._store_vector(vector_id, embedding, vector_metadata, pipe)
+                        self._store_document_hash(chunk_hash, vector_id, pipe.common())
+                        stored.append((vector_id, space, embedding))
                     except Exception as e:
-                        print(f"Error storing vector for doc {i}: {e}")
+                        print(f"Error storing vector for doc {i} chunk {chunk_index}: {e}")
 
-        # Store vector mapping for this usecase entry
-        if vector_ids:
-            vector_mapping_key = f"{self.key_prefix}:vectors:{timestamp}"
-            redis_text.set(vector_mapping_key, json.dumps(vector_ids))
+            try:
+                pipe.execute()
+            except Exception as e:
+                print(f"Error committing document batch: {e}")
+                continue
 
-        # Update usecase metadata with deduplication stats
-        usecase_metadata.update({
+            self._on_vectors_stored(stored)
+            vector_ids.extend(vector_id for vector_id, _, _ in stored)
+            new_document_count += len({self._parent_id(vector_id) for vector_id, _, _ in stored})
+
+        return {
+            'vector_ids': vector_ids,
             'new_documents': new_document_count,
-            'duplicate_documents': duplicate_count,
-            'total_processed': len(raw_documentation),
-            'vector_ids_count': len(vector_ids)
-        })
+            'duplicate_documents': duplicate_count
+        }
 
-        # Add to recent usecase queries list
-        self._add_to_recent_usecase_queries(timestamp, usecase_metadata, redis_text)
+    def _create_embeddings(self, texts: List[str]) -> List[Optional[np.ndarray]]:
+        """Create embeddings for many texts using the concurrent batch API, preserving order"""
+        if not self.embedding_service.is_available():
+            return [None] * len(texts)
 
-        print(f"Usecase storage complete: {new_document_count} new documents, {duplicate_count} duplicates skipped")
-        print(f"Embedding method used: {self.embedding_service.method}")
-        return main_key
+        try:
+            return self.embedding_service.create_embeddings(texts, self.embedding_dimensions)
+        except Exception as e:
+            print(f"Error creating embeddings: {e}")
+            return [None] * len(texts)
 
     def _add_to_recent_usecase_queries(self, timestamp: str, usecase_metadata: Dict[str, Any], redis_client):
         """Add usecase query to recent queries list"""
@@ -648,6 +2005,8 @@ class RedisVectorService:
             'new_documents': usecase_metadata.get('new_documents', 0),
             'duplicate_documents': usecase_metadata.get('duplicate_documents', 0),
             'total_processed': usecase_metadata.get('total_processed', 0),
+            'ingest_seconds': usecase_metadata.get('ingest_seconds', 0),
+            'docs_per_second': usecase_metadata.get('docs_per_second', 0),
             'query_refined': usecase_metadata.get('query_refined', False),
             'enhanced_by_bedrock': usecase_metadata.get('enhanced_by_bedrock', False),
             'embedding_method': usecase_metadata.get('embedding_method', 'none'),
@@ -658,186 +2017,397 @@ class RedisVectorService:
 
     def semantic_search_usecases(self, query: str, top_k: int = 5,
                                 usecase_filter: Optional[str] = None,
-                                min_similarity: float = 0.1) -> List[Dict[str, Any]]:
-        """Perform semantic search using AWS Titan embeddings"""
-        
+                                min_similarity: float = 0.1,
+                                nprobe: Optional[int] = None,
+                                services_filter: Optional[List[str]] = None,
+                                types_filter: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Perform semantic search using AWS Titan embeddings
+
+        ``nprobe`` overrides the ANN index recall-vs-latency setting for this query.
+        ``services_filter``/``types_filter`` keep documents mentioning any of the
+        listed AWS services / of any of the listed document types.
+        Results are cached until the next vector write (see ``search_cache``).
+        """
+        available = self.embedding_service.is_available()
+        cache_key = (
+            query, top_k, usecase_filter, min_similarity, nprobe,
+            tuple(services_filter or ()), tuple(types_filter or ()),
+            self.active_space, available
+        )
+        version = self._index_version()
+        cached = self.search_cache.get(cache_key, version)
+        if cached is not None:
+            return cached
+
+        results = self._semantic_search(query, top_k, usecase_filter, min_similarity,
+                                        nprobe, services_filter, types_filter, available)
+        self.search_cache.put(cache_key, version, results)
+        return results
+
+    def _semantic_search(self, query: str, top_k: int, usecase_filter: Optional[str],
+                         min_similarity: float, nprobe: Optional[int],
+                         services_filter: Optional[List[str]], types_filter: Optional[List[str]],
+                         available: bool) -> List[Dict[str, Any]]:
         # If no embedding service available, use fallback text search
-        if not self.embedding_service.is_available():
+        if not available:
             print("Warning: No embedding service available, using enhanced text search")
-            return self._fallback_text_search(query, top_k, usecase_filter)
+            return self._fallback_text_search(query, top_k, usecase_filter, services_filter, types_filter)
 
         # Create query embedding
         query_embedding = self._create_embedding(query)
         if query_embedding is None:
             print("Warning: Could not create embedding for query, using fallback text search")
-            return self._fallback_text_search(query, top_k, usecase_filter)
-
-        # Get all vectors
-        index_key = f"{self.vector_prefix}:index"
-        vector_ids = self.redis_client.smembers(index_key)
+            return self._fallback_text_search(query, top_k, usecase_filter, services_filter, types_filter)
+
+        match_type = f'semantic_{self.embedding_service.method}'
+
+        # Only vectors of the query's method and dimension are comparable
+        space = self.active_space
+        if self.storage_backend == "redisearch":
+            return self._search_knn(
+                query_embedding, top_k,
+                usecase_filter=usecase_filter,
+                min_similarity=min_similarity,
+                match_type=match_type,
+                services_filter=services_filter,
+                types_filter=types_filter,
+                space=space
+            )
 
-        if not vector_ids:
+        ann_index = self._get_ann_index(space)
+        if len(ann_index) == 0:
+            if self._count_vectors():
+                print(f"Warning: No vectors embedded as {space} yet (re-embedding pending), using fallback text search")
+                return self._fallback_text_search(query, top_k, usecase_filter, services_filter, types_filter)
             print("Warning: No vectors found in database")
             return []
 
-        similarities = []
-        seen_hashes = set()
-
-        for vector_id in vector_ids:
-            vector_id = vector_id.decode('utf-8') if isinstance(vector_id, bytes) else vector_id
-
-            vector_key = f"{self.vector_prefix}:vec:{vector_id}"
-            metadata_key = f"{self.vector_prefix}:meta:{vector_id}"
-
-            vector_data = self.redis_client.get(vector_key)
-            metadata_data = self.redis_client.get(metadata_key)
+        candidates = self._filter_candidates(usecase_filter, services_filter, types_filter)
+        if candidates is not None and not candidates:
+            return []
 
-            if vector_data and metadata_data:
-                try:
-                    stored_embedding = pickle.loads(vector_data)
-                    metadata = json.loads(metadata_data.decode('utf-8') if isinstance(metadata_data, bytes) else metadata_data)
+        return self._ann_search(
+            ann_index, query_embedding, top_k,
+            min_similarity=min_similarity,
+            nprobe=nprobe,
+            match_type=match_type,
+            candidates=candidates
+        )
 
-                    content_hash = metadata.get('content_hash', '')
-                    if content_hash in seen_hashes:
-                        continue
-                    seen_hashes.add(content_hash)
-
-                    # Apply usecase filter
-                    if usecase_filter and usecase_filter != "All":
-                        original_query = metadata.get('original_query', '').lower()
-                        refined_query = metadata.get('refined_query', '').lower()
-                        usecase_summary = metadata.get('usecase_summary', '').lower()
-                        
-                        if (usecase_filter.lower() not in original_query and 
-                            usecase_filter.lower() not in refined_query and 
-                            usecase_filter.lower() not in usecase_summary):
-                            continue
+    def hybrid_search_usecases(self, query: str, top_k: int = 5,
+                               usecase_filter: Optional[str] = None,
+                               min_similarity: float = 0.1,
+                               nprobe: Optional[int] = None,
+                               services_filter: Optional[List[str]] = None,
+                               types_filter: Optional[List[str]] = None,
+                               fusion: Optional[str] = None,
+                               semantic_weight: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Search the vector and the BM25 index together and fuse the rankings
+
+        The BM25 leg runs on a worker thread while the vector leg runs here,
+        so the latency is that of the slower leg. ``fusion`` is "rrf"
+        (reciprocal rank fusion) or "weighted" (min-max normalised scores);
+        ``semantic_weight`` (0..1) balances the legs in both. ``min_similarity``
+        only applies to the vector leg. Results are tagged
+        ``hybrid_<method>`` and keep each leg's rank and score; without
+        embeddings this is the plain text search.
+        """
+        fusion = (fusion or self.hybrid_fusion).lower()
+        if fusion not in self.FUSION_METHODS:
+            raise ValueError(f"Unknown fusion method: {fusion} (expected one of {', '.join(self.FUSION_METHODS)})")
+        weight = min(max(self.hybrid_semantic_weight if semantic_weight is None else semantic_weight, 0.0), 1.0)
+
+        available = self.embedding_service.is_available()
+        cache_key = (
+            'hybrid', query, top_k, usecase_filter, min_similarity, nprobe,
+            tuple(services_filter or ()), tuple(types_filter or ()),
+            fusion, weight, self.active_space, available
+        )
+        version = self._index_version()
+        cached = self.search_cache.get(cache_key, version)
+        if cached is not None:
+            return cached
+
+        results = self._hybrid_search(query, top_k, usecase_filter, min_similarity, nprobe,
+                                      services_filter, types_filter, fusion, weight, available)
+        self.search_cache.put(cache_key, version, results)
+        return results
+
+    def _hybrid_search(self, query: str, top_k: int, usecase_filter: Optional[str],
+                       min_similarity: float, nprobe: Optional[int],
+                       services_filter: Optional[List[str]], types_filter: Optional[List[str]],
+                       fusion: str, weight: float, available: bool) -> List[Dict[str, Any]]:
+        # Each leg contributes a deeper list than top_k so documents ranked well by both surface
+        pool = max(top_k, self.hybrid_candidates)
+        text_leg = self._hybrid_executor.submit(
+            self._bm25_search, query, pool, usecase_filter, services_filter, types_filter
+        )
+        try:
+            semantic = self._semantic_search(query, pool, usecase_filter, min_similarity,
+                                             nprobe, services_filter, types_filter, available) if available else []
+        finally:
+            text = text_leg.result()
+
+        # The vector leg fell back to text search itself: nothing to fuse
+        if not available or any(result['match_type'] == 'text_fallback' for result in semantic):
+            print("Warning: No embeddings for hybrid search, using text search only")
+            return text[:top_k]
+
+        return self._fuse_results(semantic, text, top_k, fusion, weight,
+                                  f'hybrid_{self.embedding_service.method}')
+
+    def _fuse_results(self, semantic: List[Dict[str, Any]], text: List[Dict[str, Any]], top_k: int,
+                      fusion: str, weight: float, match_type: str) -> List[Dict[str, Any]]:
+        """Fuse the per-document rankings of both legs into one top_k list
+
+        ``similarity`` becomes the fused score scaled to 0..1 (1 means ranked
+        first, or scored highest, by both legs); ``semantic_similarity`` and
+        ``text_score`` keep the original scores.
+        """
+        fused: Dict[str, Dict[str, Any]] = {}
+        for leg, results, leg_weight in (('semantic', semantic, weight), ('text', text, 1.0 - weight)):
+            scores = [result['similarity'] for result in results]
+            low, high = (min(scores), max(scores)) if scores else (0.0, 0.0)
+            for rank, result in enumerate(results, 1):
+                document = result.get('parent_id') or self._parent_id(result['vector_id'])
+                entry = fused.get(document)
+                if entry is None:
+                    entry = fused[document] = dict(
+                        result, fusion_score=0.0, semantic_rank=None, text_rank=None,
+                        semantic_similarity=None, text_score=None
+                    )
+                entry[f'{leg}_rank'] = rank
+                entry['semantic_similarity' if leg == 'semantic' else 'text_score'] = result['similarity']
+                if fusion == 'rrf':
+                    entry['fusion_score'] += leg_weight / (self.hybrid_rrf_k + rank)
+                else:
+                    entry['fusion_score'] += leg_weight * ((result['similarity'] - low) / (high - low) if high > low else 1.0)
+
+        best = 1.0 / (self.hybrid_rrf_k + 1) if fusion == 'rrf' else 1.0
+        ranked = sorted(fused.values(), key=lambda entry: entry['fusion_score'], reverse=True)[:top_k]
+        for entry in ranked:
+            entry['similarity'] = entry['fusion_score'] / best
+            entry['match_type'] = match_type
+        return ranked
+
+    def semantic_search_batch(self, queries: List[str], top_k: int = 5,
+                              usecase_filter: Optional[str] = None,
+                              min_similarity: float = 0.1,
+                              nprobe: Optional[int] = None,
+                              services_filter: Optional[List[str]] = None,
+                              types_filter: Optional[List[str]] = None) -> List[List[Dict[str, Any]]]:
+        """Run ``semantic_search_usecases`` for several queries, one result list per query
+
+        Queries are embedded in one concurrent batch and scored against the
+        ANN index with a single matrix-matrix product.
+        """
+        queries = list(queries)
+        if not queries:
+            return []
 
-                    similarity = self._calculate_similarity(query_embedding, stored_embedding)
+        def single(query: str) -> List[Dict[str, Any]]:
+            return self.semantic_search_usecases(query, top_k, usecase_filter, min_similarity,
+                                                 nprobe, services_filter, types_filter)
 
-                    if similarity >= min_similarity:
-                        similarities.append({
-                            'vector_id': vector_id,
-                            'similarity': similarity,
-                            'metadata': metadata,
-                            'match_type': f'semantic_{self.embedding_service.method}'
-                        })
+        if not self.embedding_service.is_available():
+            return [single(query) for query in queries]
+
+        embeddings = self._create_embeddings(queries)
+        space = self.active_space
+        ann_index = None if self.storage_backend == "redisearch" else self._get_ann_index(space)
+        batch = [i for i, embedding in enumerate(embeddings) if embedding is not None]
+        if ann_index is None or len(ann_index) == 0 or not batch:
+            return [single(query) for query in queries]
+
+        candidates = self._filter_candidates(usecase_filter, services_filter, types_filter)
+        if candidates is not None and not candidates:
+            return [[] for _ in queries]
+
+        exact = candidates is not None and len(candidates) <= self.prefilter_exact_max
+        hits = dict(zip(batch, ann_index.search_many(
+            np.stack([embeddings[i] for i in batch]),
+            self._ann_pool_size(top_k),
+            nprobe,
+            vector_ids=candidates if exact else None
+        )))
+
+        match_type = f'semantic_{self.embedding_service.method}'
+        return [
+            self._ann_search(
+                ann_index, embeddings[i], top_k,
+                min_similarity=min_similarity,
+                nprobe=nprobe,
+                match_type=match_type,
+                candidates=candidates,
+                hits=hits[i]
+            ) if i in hits else single(query)
+            for i, query in enumerate(queries)
+        ]
+
+    def _filter_candidates(self, usecase_filter: Optional[str] = None,
+                           services_filter: Optional[List[str]] = None,
+                           types_filter: Optional[List[str]] = None) -> Optional[set]:
+        """Resolve the search filters to candidate vector ids (None when unfiltered)"""
+        if not (usecase_filter and usecase_filter != "All") and not services_filter and not types_filter:
+            return None
 
-                except Exception as e:
-                    print(f"Error processing vector {vector_id}: {e}")
+        # Vectors stored before the filter index existed are indexed once per process
+        if not self._filter_index_checked:
+            with self._filter_index_lock:
+                if not self._filter_index_checked:
+                    indexed = sum(self._map_shards(lambda shard: shard.filter_index.count()))
+                    if indexed != self._count_vectors():
+                        self.rebuild_filter_index()
+                    self._filter_index_checked = True
+
+        return set().union(*self._map_shards(
+            lambda shard: shard.filter_index.candidates(usecase_filter, services_filter, types_filter)
+        ))
+
+    def rebuild_filter_index(self) -> Dict[str, Any]:
+        """Rebuild the usecase/service/type filter indexes from the stored metadata"""
+        rebuilt = sum(self._map_shards(lambda shard: shard.filter_index.rebuild(
+            ((vector_id, metadata) for vector_id, _, metadata in self._iter_vector_records(self._get_index_ids([shard]))),
+            batch_size=self.read_chunk_size
+        )))
+        print(f"✅ [FILTER] Indexed {rebuilt} vectors")
+        return {'rebuilt': rebuilt}
+
+    def _ann_search(self, ann_index: IVFIndex, query_embedding: np.ndarray, top_k: int,
+                    usecase_filter: Optional[str] = None, min_similarity: Optional[float] = None,
+                    nprobe: Optional[int] = None, match_type: Optional[str] = None,
+                    exclude_id: Optional[str] = None, candidates: Optional[set] = None,
+                    hits: Optional[List[Tuple[str, float]]] = None) -> List[Dict[str, Any]]:
+        """Query the ANN index and resolve hits to filtered, de-duplicated results
+
+        ``candidates`` (from the filter index) restricts the search before any
+        metadata is read: small candidate sets are scored exactly, larger ones
+        filter the ANN hits by membership. ``hits`` are index results for the
+        first pool the caller already computed (see ``semantic_search_batch``).
+        """
+        # Hits are dropped by the filter and de-duplication after the index
+        # lookup, so over-fetch and widen the pool until top_k survive.
+        pool_size = self._ann_pool_size(top_k)
+        exact = candidates is not None and len(candidates) <= self.prefilter_exact_max
+
+        while True:
+            if hits is None and exact:
+                hits = ann_index.search_subset(query_embedding, candidates, pool_size)
+            elif hits is None:
+                hits = ann_index.search(query_embedding, pool_size, nprobe)
+            if self._rerank_enabled:
+                hits = self._rerank_hits(query_embedding, hits)
+
+            excluded = self._parent_id(exclude_id) if exclude_id else None
+            scores = {
+                vector_id: similarity for vector_id, similarity in hits
+                if self._parent_id(vector_id) != excluded and (min_similarity is None or similarity >= min_similarity)
+                and (candidates is None or vector_id in candidates)
+            }
+            # Chunks of one document share its content hash, so only the best
+            # chunk is reported; the others are counted as matched chunks
+            matched_chunks: Dict[str, int] = {}
+            for vector_id in scores:
+                parent_id = self._parent_id(vector_id)
+                matched_chunks[parent_id] = matched_chunks.get(parent_id, 0) + 1
+            # Metadata is fetched in small chunks so we stop reading once top_k survive
+            chunk_size = min(self.read_chunk_size, max(top_k * 2, 16))
+
+            results = []
+            seen_hashes = set()
+            for vector_id, _, metadata in self._iter_vector_records(scores, chunk_size=chunk_size):
+                similarity = scores[vector_id]
+                if not metadata:
                     continue
 
-        similarities.sort(key=lambda x: x['similarity'], reverse=True)
-        return similarities[:top_k]
+                content_hash = metadata.get('content_hash', '')
+                if content_hash in seen_hashes:
+                    continue
+                seen_hashes.add(content_hash)
 
-    def _calculate_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
-        """Calculate similarity between two vectors (method-agnostic)"""
-        try:
-            if self.embedding_service.method == "tfidf":
-                # For TF-IDF, use sklearn's cosine similarity
-                if HAS_SKLEARN:
-                    similarity = sklearn_cosine_similarity([vec1], [vec2])[0][0]
-                    return float(similarity)
-            
-            # For Titan or fallback, use cosine similarity
-            dot_product = np.dot(vec1, vec2)
-            norm_a = np.linalg.norm(vec1)
-            norm_b = np.linalg.norm(vec2)
+                if not self._matches_usecase_filter(metadata, usecase_filter):
+                    continue
 
-            if norm_a == 0 or norm_b == 0:
-                return 0.0
+                result = {
+                    'vector_id': vector_id,
+                    'similarity': similarity,
+                    'metadata': metadata
+                }
+                if match_type:
+                    result['match_type'] = match_type
+                if metadata.get('chunk_count', 1) > 1:
+                    result['parent_id'] = self._parent_id(vector_id)
+                    result['matched_chunks'] = matched_chunks[result['parent_id']]
+                results.append(result)
+
+                if len(results) >= top_k:
+                    return results
+
+            exhausted = len(hits) < pool_size or (
+                min_similarity is not None and hits and hits[-1][1] < min_similarity
+            )
+            if exhausted:
+                return results
+            pool_size *= 4
+            hits = None
+
+    @staticmethod
+    def _ann_pool_size(top_k: int) -> int:
+        return max(top_k * 4, 50)
+
+    def _matches_usecase_filter(self, metadata: Dict[str, Any], usecase_filter: Optional[str]) -> bool:
+        """Check a vector's metadata against the usecase filter"""
+        if not usecase_filter or usecase_filter == "All":
+            return True
 
-            return float(dot_product / (norm_a * norm_b))
-        except Exception:
-            return 0.0
+        usecase_filter = usecase_filter.lower()
+        return (usecase_filter in metadata.get('original_query', '').lower() or
+                usecase_filter in metadata.get('refined_query', '').lower() or
+                usecase_filter in metadata.get('usecase_summary', '').lower())
 
     def get_similar_usecase_documents(self, doc_id: str, top_k: int = 5) -> List[Dict[str, Any]]:
         """Find documents similar to a given usecase document"""
-        vector_key = f"{self.vector_prefix}:vec:{doc_id}"
-        vector_data = self.redis_client.get(vector_key)
-
-        if not vector_data:
-            return []
-
-        try:
-            doc_embedding = pickle.loads(vector_data)
-        except Exception:
+        # Neighbours come from the document's own space
+        space = self._space_of(doc_id)
+        if space is None:
             return []
 
-        # Get all other vectors
-        index_key = f"{self.vector_prefix}:index"
-        vector_ids = self.redis_client.smembers(index_key)
+        if self.storage_backend == "redisearch":
+            doc_embedding = self._get_vector(doc_id)
+            if doc_embedding is None:
+                return []
+            return self._search_knn(doc_embedding, top_k, exclude_id=doc_id, space=space)
 
-        similarities = []
-        seen_hashes = set()
-
-        for vector_id in vector_ids:
-            vector_id = vector_id.decode('utf-8') if isinstance(vector_id, bytes) else vector_id
-
-            if vector_id == doc_id:
-                continue
+        ann_index = self._get_ann_index(space)
+        doc_embedding = ann_index.get_vector(doc_id)
 
-            other_vector_key = f"{self.vector_prefix}:vec:{vector_id}"
-            metadata_key = f"{self.vector_prefix}:meta:{vector_id}"
-
-            other_vector_data = self.redis_client.get(other_vector_key)
-            metadata_data = self.redis_client.get(metadata_key)
-
-            if other_vector_data and metadata_data:
-                try:
-                    other_embedding = pickle.loads(other_vector_data)
-                    metadata = json.loads(metadata_data.decode('utf-8') if isinstance(metadata_data, bytes) else metadata_data)
-
-                    content_hash = metadata.get('content_hash', '')
-                    if content_hash in seen_hashes:
-                        continue
-                    seen_hashes.add(content_hash)
-
-                    similarity = self._calculate_similarity(doc_embedding, other_embedding)
-
-                    similarities.append({
-                        'vector_id': vector_id,
-                        'similarity': similarity,
-                        'metadata': metadata
-                    })
-
-                except Exception as e:
-                    print(f"Error processing vector {vector_id}: {e}")
-                    continue
+        if doc_embedding is None:
+            try:
+                doc_embedding = self._get_vector(doc_id)
+            except Exception:
+                return []
+            if doc_embedding is None:
+                return []
 
-        similarities.sort(key=lambda x: x['similarity'], reverse=True)
-        return similarities[:top_k]
+        return self._ann_search(ann_index, doc_embedding, top_k, exclude_id=doc_id)
 
     def get_usecase_data(self, key: str) -> Dict[str, Any]:
         """Retrieve usecase documentation data from Redis"""
-        redis_text = redis.Redis(
-            host=os.getenv('REDIS_HOST', 'localhost'),
-            port=int(os.getenv('REDIS_PORT', 6379)),
-            password=os.getenv('REDIS_PASSWORD', 'Localdev@123'),
-            decode_responses=True
-        )
-
-        data_str = redis_text.get(key)
+        data_str = self.redis_text.get(key)
         if data_str:
             return json.loads(data_str)
         return {}
 
     def get_recent_usecase_queries(self) -> List[Dict[str, Any]]:
         """Get recent usecase documentation queries"""
-        redis_text = redis.Redis(
-            host=os.getenv('REDIS_HOST', 'localhost'),
-            port=int(os.getenv('REDIS_PORT', 6379)),
-            password=os.getenv('REDIS_PASSWORD', 'Localdev@123'),
-            decode_responses=True
-        )
-
         recent_key = f"{self.key_prefix}:recent_usecases"
-        recent_data = redis_text.lrange(recent_key, 0, -1)
+        recent_data = self.redis_text.lrange(recent_key, 0, -1)
         return [json.loads(item) for item in recent_data]
 
-    def get_latest_usecase_data(self) -> Optional[Dict[str, Any]]:
-        """Get the most recent usecase data"""
-        recent_queries = self.get_recent_usecase_queries()
+    def get_latest_usecase_data(self, recent_queries: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+        """Get the most recent usecase data (``recent_queries`` skips reading the list again)"""
+        if recent_queries is None:
+            recent_queries = self.get_recent_usecase_queries()
         if recent_queries:
             latest_query = recent_queries[0]
             timestamp = latest_query['timestamp']
@@ -846,82 +2416,85 @@ class RedisVectorService:
         return None
 
     def get_usecase_statistics(self) -> Dict[str, Any]:
-        """Get usecase vector database statistics"""
+        """Get usecase vector database statistics from the materialized counters"""
         try:
-            index_key = f"{self.vector_prefix}:index"
-            total_vectors = self.redis_client.scard(index_key)
-
-            vector_ids = self.redis_client.smembers(index_key)
+            stats = self._read_statistics()
 
-            original_queries = {}
-            key_services = {}
-            types = {}
-            embedding_methods = {}
-            embedding_dimensions = {}
-            unique_hashes = set()
-            bedrock_enhanced = 0
-            query_refined = 0
+            # Counters missing (pre-existing data) or drifted from the index: recompute once
+            if (stats['index_size'] != stats['counts'].get('total_vectors', 0)
+                    or (stats['index_size'] and 'total_documents' not in stats['counts'])):
+                self.rebuild_statistics()
+                stats = self._read_statistics()
 
-            for vector_id in vector_ids:
-                vector_id = vector_id.decode('utf-8') if isinstance(vector_id, bytes) else vector_id
-                metadata_key = f"{self.vector_prefix}:meta:{vector_id}"
-                metadata_data = self.redis_client.get(metadata_key)
-
-                if metadata_data:
-                    try:
-                        metadata = json.loads(metadata_data.decode('utf-8') if isinstance(metadata_data, bytes) else metadata_data)
-
-                        original_query = metadata.get('original_query', 'Unknown')[:50]
-                        doc_type = metadata.get('type', 'Unknown')
-                        content_hash = metadata.get('content_hash', '')
-                        services = metadata.get('key_services', [])
-                        embedding_method = metadata.get('embedding_method', 'unknown')
-                        embedding_dim = metadata.get('embedding_dimensions', 1024)
-
-                        original_queries[original_query] = original_queries.get(original_query, 0) + 1
-                        types[doc_type] = types.get(doc_type, 0) + 1
-                        embedding_methods[embedding_method] = embedding_methods.get(embedding_method, 0) + 1
-                        embedding_dimensions[str(embedding_dim)] = embedding_dimensions.get(str(embedding_dim), 0) + 1
-                        
-                        for service in services:
-                            key_services[service] = key_services.get(service, 0) + 1
-                        
-                        if content_hash:
-                            unique_hashes.add(content_hash)
-                            
-                        if metadata.get('enhanced_by_bedrock', False):
-                            bedrock_enhanced += 1
-                            
-                        if metadata.get('query_refined', False):
-                            query_refined += 1
-
-                    except Exception:
-                        continue
+            counts = stats['counts']
+            distributions = stats['distributions']
+            total_vectors = counts.get('total_vectors', 0)
+            total_documents = counts.get('total_documents', total_vectors)
+            unique_documents = min(stats['unique_hashes'], total_documents)
 
             embedding_info = self.embedding_service.get_info()
 
             return {
                 'total_vectors': total_vectors,
-                'unique_documents': len(unique_hashes),
-                'potential_duplicates': total_vectors - len(unique_hashes),
-                'bedrock_enhanced_count': bedrock_enhanced,
-                'query_refined_count': query_refined,
+                'total_documents': total_documents,
+                'unique_documents': unique_documents,
+                'potential_duplicates': total_documents - unique_documents,
+                'bedrock_enhanced_count': counts.get('bedrock_enhanced', 0),
+                'query_refined_count': counts.get('query_refined', 0),
                 'vector_dimension': self.vector_dim,
                 'embedding_service': embedding_info,
-                'embedding_methods_used': embedding_methods,
-                'embedding_dimensions_used': embedding_dimensions,
-                'usecase_queries_distribution': original_queries,
-                'key_services_distribution': key_services,
-                'types_distribution': types
+                'ann_index': self.ann_indexes[self.active_space].get_info() if self.active_space in self.ann_indexes else None,
+                'active_space': self.active_space,
+                'vector_spaces': self.get_vector_spaces(),
+                'text_index': self._text_index_info(),
+                'embedding_methods_used': distributions['methods'],
+                'embedding_dimensions_used': distributions['dimensions'],
+                'usecase_queries_distribution': distributions['queries'],
+                'key_services_distribution': distributions['services'],
+                'types_distribution': distributions['types']
             }
 
         except Exception as e:
             return {'error': str(e)}
 
-    def get_usecase_analytics_data(self) -> Dict[str, Any]:
-        """Get analytics data for usecase dashboard"""
-        recent_queries = self.get_recent_usecase_queries()
-        vector_stats = self.get_usecase_statistics()
+    def _read_statistics(self) -> Dict[str, Any]:
+        """Read the counters of every shard and add them up
+
+        Unique content counts are HyperLogLogs per shard; duplicates that
+        landed on different shards are counted once per shard.
+        """
+        shard_stats = self._map_shards(lambda shard: shard.statistics.read(shard.index_key))
+        if len(shard_stats) == 1:
+            return shard_stats[0]
+        return {
+            'index_size': sum(stats['index_size'] for stats in shard_stats),
+            'counts': merge_counts([stats['counts'] for stats in shard_stats]),
+            'unique_hashes': sum(stats['unique_hashes'] for stats in shard_stats),
+            'distributions': {
+                name: merge_counts([stats['distributions'][name] for stats in shard_stats])
+                for name in shard_stats[0]['distributions']
+            }
+        }
+
+    def rebuild_statistics(self) -> Dict[str, Any]:
+        """Recompute the materialized statistics from the stored metadata (repairs drift)"""
+        rebuilt = sum(self._map_shards(lambda shard: shard.statistics.rebuild(
+            (metadata for _, _, metadata in self._iter_vector_records(self._get_index_ids([shard]))),
+            batch_size=self.read_chunk_size
+        )))
+        print(f"✅ [STATS] Rebuilt statistics for {rebuilt} vectors")
+        return {'rebuilt': rebuilt}
+
+    def get_usecase_analytics_data(self, recent_queries: Optional[List[Dict[str, Any]]] = None,
+                                   vector_stats: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get analytics data for usecase dashboard
+
+        ``recent_queries``/``vector_stats`` already read by the caller are reused.
+        """
+        if recent_queries is None:
+            recent_queries = self.get_recent_usecase_queries()
+        if vector_stats is None:
+            vector_stats = self.get_usecase_statistics()
 
         if not recent_queries:
             return {
@@ -986,78 +2559,261 @@ class RedisVectorService:
             'vector_stats': vector_stats
         }
 
-    def remove_duplicates(self) -> Dict[str, int]:
-        """Remove duplicate documents from the database"""
-        index_key = f"{self.vector_prefix}:index"
-        vector_ids = self.redis_client.smembers(index_key)
-        
-        seen_hashes = {}
-        duplicates_removed = 0
+    def remove_duplicates(self, progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, int]:
+        """Remove duplicate documents from the database
+
+        Driven by the vector_id -> content hash HASH and the existing
+        ``:hash:`` content-hash -> vector_id mapping: a vector is a duplicate
+        when its content hash maps to another live vector. Vectors are
+        walked with HSCAN in batches, so no metadata is read.
+        """
+        self._sync_vector_hashes()
+
+        duplicate_ids = []
+        unique_hashes = set()
+        claimed: Dict[str, str] = {}
         total_processed = 0
-        
-        for vector_id in vector_ids:
-            vector_id = vector_id.decode('utf-8') if isinstance(vector_id, bytes) else vector_id
-            total_processed += 1
-            
-            metadata_key = f"{self.vector_prefix}:meta:{vector_id}"
-            metadata_data = self.redis_client.get(metadata_key)
-            
-            if metadata_data:
-                try:
-                    metadata = json.loads(metadata_data.decode('utf-8') if isinstance(metadata_data, bytes) else metadata_data)
-                    content_hash = metadata.get('content_hash', '')
-                    
-                    if content_hash:
-                        if content_hash in seen_hashes:
-                            self._remove_vector(vector_id)
-                            duplicates_removed += 1
-                        else:
-                            seen_hashes[content_hash] = vector_id
-                            
-                except Exception as e:
-                    print(f"Error processing vector {vector_id} for deduplication: {e}")
-        
+
+        entries = itertools.chain.from_iterable(
+            self.redis_text.hscan_iter(shard.vec_hash_key, count=self.scan_count) for shard in self.shards
+        )
+        while True:
+            batch = list(itertools.islice(entries, self.read_chunk_size))
+            if not batch:
+                break
+
+            owners = mget(self.redis_text, [f"{self.key_prefix}:hash:{content_hash}" for _, content_hash in batch])
+            owners_live = dict(zip([vector_id for vector_id, _ in batch],
+                                   self._is_live([vector_id for vector_id, _ in batch])))
+            owner_live = self._is_live([owner or "" for owner in owners])
+
+            repairs = {}
+            for (vector_id, content_hash), owner, owner_is_live in zip(batch, owners, owner_live):
+                if not owners_live[vector_id]:
+                    continue
+                total_processed += 1
+                # Chunk hashes are "<document hash>#<n>"
+                unique_hashes.add(content_hash.split('#', 1)[0])
+
+                if owner == vector_id:
+                    continue
+                if owner and owner_is_live:
+                    duplicate_ids.append(vector_id)
+                elif content_hash in claimed:
+                    duplicate_ids.append(vector_id)
+                else:
+                    # Mapping missing or pointing at a removed vector: this one becomes canonical
+                    claimed[content_hash] = vector_id
+                    repairs[f"{self.key_prefix}:hash:{content_hash}"] = vector_id
+
+            mset(self.redis_text, repairs)
+            if progress:
+                progress({'phase': 'scanning', 'processed': total_processed, 'duplicates': len(duplicate_ids)})
+
+        duplicates_removed = self._remove_vectors(duplicate_ids, progress=progress)
+        self._persist_ann_index()
+
         return {
             'total_processed': total_processed,
             'duplicates_removed': duplicates_removed,
-            'unique_documents': len(seen_hashes)
+            'unique_documents': len(unique_hashes)
+        }
+
+    def _sync_vector_hashes(self):
+        """Backfill the vector_id -> content hash HASH for vectors stored before it existed"""
+        self._map_shards(self._sync_shard_vector_hashes)
+
+    def _sync_shard_vector_hashes(self, shard: VectorShard):
+        if self.redis_client.hlen(shard.vec_hash_key) == self.redis_client.scard(shard.index_key):
+            return
+
+        known = set(self.redis_text.hkeys(shard.vec_hash_key))
+        missing = [vector_id for vector_id in self._get_index_ids([shard]) if vector_id not in known]
+        mapping = {
+            vector_id: self._chunk_hash(metadata)
+            for vector_id, _, metadata in self._iter_vector_records(missing)
+            if metadata and self._chunk_hash(metadata)
         }
+        for start in range(0, len(mapping), self.unlink_batch_size):
+            items = list(mapping.items())[start:start + self.unlink_batch_size]
+            self.redis_text.hset(shard.vec_hash_key, mapping=dict(items))
 
     def _remove_vector(self, vector_id: str):
         """Remove a vector and its associated data"""
-        vector_key = f"{self.vector_prefix}:vec:{vector_id}"
-        metadata_key = f"{self.vector_prefix}:meta:{vector_id}"
-        index_key = f"{self.vector_prefix}:index"
-        
-        self.redis_client.delete(vector_key)
-        self.redis_client.delete(metadata_key)
-        self.redis_client.srem(index_key, vector_id)
+        self._remove_vectors([vector_id])
+
+    def _remove_vectors(self, vector_ids: List[str],
+                        progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> int:
+        """Remove vectors and their associated data, one pipeline per chunk"""
+        # A removed vector's space is not recorded per vector; there are only a few spaces
+        spaces = self._get_spaces()
+
+        for start in range(0, len(vector_ids), self.read_chunk_size):
+            chunk = vector_ids[start:start + self.read_chunk_size]
+            removed_metadata = {
+                vector_id: metadata
+                for vector_id, _, metadata in self._iter_vector_records(chunk)
+            }
 
-    def clear_all_vectors(self) -> int:
+            # Drop content-hash mappings that point at the removed vectors
+            hashed = [
+                (vector_id, self._chunk_hash(metadata))
+                for vector_id, metadata in removed_metadata.items()
+                if metadata and self._chunk_hash(metadata)
+            ]
+            hash_keys = [f"{self.key_prefix}:hash:{content_hash}" for _, content_hash in hashed]
+            owners = mget(self.redis_text, hash_keys)
+            stale_hash_keys = [
+                hash_key for hash_key, (vector_id, _), owner in zip(hash_keys, hashed, owners)
+                if owner == vector_id
+            ]
+
+            pipe = self._write_pipeline()
+            for number, ids in self._group_by_shard(chunk).items():
+                shard = self.shards[number]
+                write = pipe.shard(shard)
+                for vector_id in ids:
+                    if vector_id in removed_metadata:
+                        shard.statistics.record(write, removed_metadata[vector_id], -1)
+                        shard.filter_index.remove(write, vector_id, removed_metadata[vector_id])
+                    write.delete(shard.vec_key(vector_id), shard.meta_key(vector_id), shard.search_doc_key(vector_id))
+                write.srem(shard.index_key, *ids)
+                for space in spaces:
+                    write.srem(shard.space_key(space), *ids)
+                write.hdel(shard.vec_hash_key, *ids)
+                shard.text_index.remove_documents(write, ids)
+                self._publish_changes(write, shard, 'remove', '', ids)
+            if stale_hash_keys:
+                pipe.common().unlink(*stale_hash_keys)
+            pipe.execute()
+
+            if progress:
+                progress({'phase': 'removing', 'removed': min(start + len(chunk), len(vector_ids)),
+                          'total': len(vector_ids)})
+
+        self._ann_remove(vector_ids)
+        return len(vector_ids)
+
+    def clear_all_vectors(self, progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> int:
         """Clear all vector data"""
-        vector_keys = self.redis_client.keys(f"{self.vector_prefix}:*")
-        hash_keys = self.redis_client.keys(f"{self.key_prefix}:hash:*")
-        all_keys = vector_keys + hash_keys
-        if all_keys:
-            return self.redis_client.delete(*all_keys)
-        return 0
-
-    def clear_all_usecase_data(self) -> int:
+        self._reset_ann_index()
+        self.embedding_service.reset_tfidf_statistics()
+        return self._clear_keys(
+            [f"{self.vector_prefix}:*", f"{self.key_prefix}:hash:*"],
+            progress=progress
+        )
+
+    def clear_all_usecase_data(self, progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> int:
         """Clear all usecase-related keys including vectors"""
-        usecase_keys = self.redis_client.keys(f"{self.key_prefix}:*")
-        vector_keys = self.redis_client.keys(f"{self.vector_prefix}:*")
+        self._reset_ann_index()
+        self.embedding_service.reset_tfidf_statistics()
+        return self._clear_keys(
+            [f"{self.key_prefix}:*", f"{self.vector_prefix}:*"],
+            progress=progress
+        )
+
+    def _clear_keys(self, patterns: List[str],
+                    progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> int:
+        """Unlink keys matching ``patterns`` and announce the reset to other processes"""
+        versions = self._shard_versions()
+        deleted = self._unlink_matching(patterns, progress=progress)
+
+        pipe = self._write_pipeline()
+        for shard, version in zip(self.shards, versions):
+            # The version keys went with the rest; restore them so versions never repeat
+            pipe.shard(shard).set(shard.version_key, version)
+            self._publish_changes(pipe.shard(shard), shard, 'reset', '', [])
+        pipe.execute()
+        return deleted
+
+    def _unlink_matching(self, patterns: List[str],
+                         progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> int:
+        """Delete keys matching ``patterns`` with cursor-based SCAN and batched UNLINK
+
+        Neither SCAN nor UNLINK blocks the server for long (UNLINK frees
+        memory in a background thread), so clearing a large keyspace does not
+        stall concurrent reads.
+        """
+        deleted = 0
+        batch = []
+
+        def flush():
+            nonlocal deleted
+            deleted += self.redis_client.unlink(*batch)
+            batch.clear()
+            if progress:
+                progress({'phase': 'deleting', 'deleted': deleted})
+
+        for pattern in patterns:
+            for key in self.redis_client.scan_iter(match=pattern, count=self.scan_count):
+                batch.append(key)
+                if len(batch) >= self.unlink_batch_size:
+                    flush()
+        if batch:
+            flush()
+        return deleted
+
+    def _count_keys(self, pattern: str) -> int:
+        """Count keys matching ``pattern`` with SCAN instead of KEYS"""
+        return sum(1 for _ in self.redis_client.scan_iter(match=pattern, count=self.scan_count))
+
+    MAINTENANCE_JOBS = ("remove_duplicates", "clear_vectors", "clear_all")
+
+    def start_maintenance_job(self, job: str) -> bool:
+        """Run a maintenance job (see MAINTENANCE_JOBS) in a background thread
+
+        Returns False when another job is still running.
+        """
+        handlers = {
+            "remove_duplicates": self.remove_duplicates,
+            "clear_vectors": self.clear_all_vectors,
+            "clear_all": self.clear_all_usecase_data
+        }
+        if job not in handlers:
+            raise ValueError(f"Unknown maintenance job: {job}")
+        if self._maintenance_thread and self._maintenance_thread.is_alive():
+            return False
+
+        status = {'job': job, 'state': 'running', 'started_at': datetime.now().isoformat(), 'progress': {}}
+        self._maintenance_status = status
+
+        def report(progress: Dict[str, Any]):
+            status['progress'] = dict(progress)
 
-        all_keys = usecase_keys + vector_keys
-        if all_keys:
-            return self.redis_client.delete(*all_keys)
-        return 0
+        def run():
+            try:
+                status['result'] = handlers[job](progress=report)
+                status['state'] = 'completed'
+            except Exception as e:
+                status.update({'state': 'failed', 'error': str(e)})
+                print(f"❌ [MAINTENANCE] {job} failed: {e}")
+            status['finished_at'] = datetime.now().isoformat()
+
+        self._maintenance_thread = threading.Thread(target=run, name=f"maintenance-{job}", daemon=True)
+        self._maintenance_thread.start()
+        return True
+
+    def get_maintenance_status(self) -> Dict[str, Any]:
+        """Get state and progress of the last background maintenance job"""
+        return dict(self._maintenance_status)
+
+    def _reset_ann_index(self):
+        """Drop the in-process ANN indexes; they are rebuilt on the next search"""
+        self.ann_indexes = {}
+        self._ann_skipped = {}
+        self._ann_dirty = {}
+        self._spaces_checked = False
+        self._stream_position = {}
 
     def get_system_info(self) -> Dict[str, Any]:
         """Get Redis system information including embedding service info"""
         try:
             info = self.redis_client.info()
-            usecase_keys_count = len(self.redis_client.keys(f"{self.key_prefix}:*"))
-            vector_keys_count = len(self.redis_client.keys(f"{self.vector_prefix}:*"))
+            if self.cluster and info and all(isinstance(node_info, dict) for node_info in info.values()):
+                # One INFO reply per node; report the first node like a single server
+                info = next(iter(info.values()))
+            usecase_keys_count = self._count_keys(f"{self.key_prefix}:*")
+            vector_keys_count = self._count_keys(f"{self.vector_prefix}:*")
             embedding_info = self.embedding_service.get_info()
 
             return {
@@ -1072,6 +2828,22 @@ class RedisVectorService:
                 'keyspace_hits': info.get('keyspace_hits', 0),
                 'keyspace_misses': info.get('keyspace_misses', 0),
                 'embedding_service': embedding_info,
+                'connection_pool': self.connection_pool.get_stats(),
+                'storage_backend': self.storage_backend,
+                'cluster': self.cluster,
+                'shards': self.shard_count,
+                'vector_encoding': self.vector_encoding,
+                'quantization': self.quantization,
+                'vector_format_migration': self.get_vector_format_migration_status(),
+                'maintenance': self.get_maintenance_status(),
+                'reembedding': self.get_reembedding_status(),
+                'search_cache': self.search_cache.get_stats(),
+                'hybrid_search': {
+                    'fusion': self.hybrid_fusion,
+                    'rrf_k': self.hybrid_rrf_k,
+                    'semantic_weight': self.hybrid_semantic_weight,
+                    'candidates': self.hybrid_candidates
+                },
                 'service_type': 'aws_titan_usecase_documentation_service'
             }
         except Exception as e:
@@ -0,0 +1,86 @@
+"""
+In-process LRU cache for search results, invalidated by the vector index version
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Hashable, List, Optional
+
+
+class SearchResultCache:
+    """LRU cache of search results keyed by query parameters and index version.
+
+    Every vector write bumps a version counter in Redis. Lookups pass the
+    current version; once a newer version is seen all older entries are
+    dropped, so a write anywhere invalidates the cache of every process
+    without deleting anything on the write path.
+    """
+
+    def __init__(self, max_entries: int = 256, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled and max_entries > 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, List[Dict[str, Any]]]" = OrderedDict()
+        self._version: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def _check_version(self, version: int):
+        if self._version != version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get(self, key: Hashable, version: int) -> Optional[List[Dict[str, Any]]]:
+        """Return a copy of the cached results for ``key`` at ``version``, or None"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            self._check_version(version)
+            results = self._entries.get(key)
+            if results is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        # Callers may annotate the result dicts; never hand out the cached ones
+        return copy.deepcopy(results)
+
+    def put(self, key: Hashable, version: int, results: List[Dict[str, Any]]):
+        """Cache the results computed for ``key`` at ``version``"""
+        if not self.enabled:
+            return
+        results = copy.deepcopy(results)
+        with self._lock:
+            self._check_version(version)
+            self._entries[key] = results
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all cached results"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and the cache size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "index_version": self._version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+                "evictions": self.evictions
+            }
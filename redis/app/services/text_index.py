@@ -0,0 +1,185 @@
+"""
+BM25 inverted index kept in Redis sorted sets
+"""
+
+import math
+import re
+import time
+import uuid
+from typing import Dict, Any, List, Optional, Tuple
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens, skipping single characters"""
+    return [token for token in _TOKEN.findall(text.lower()) if len(token) > 1]
+
+
+class BM25Index:
+    """Inverted index with one posting ZSET per token.
+
+    Each posting stores the BM25 term-frequency component of a document
+    (tf saturation and length normalisation, using the average document
+    length at index time), so a query is a single weighted ZUNIONSTORE
+    over the query tokens with idf weights, computed inside Redis.
+
+    Keys (under ``key_prefix``):
+        post:<token>   ZSET  vector_id -> tf component
+        terms          HASH  vector_id -> space separated tokens (for removal)
+        len            HASH  vector_id -> document length
+        stats          HASH  docs, total_len
+    """
+
+    def __init__(self, redis_client, key_prefix: str, k1: float = 1.2, b: float = 0.75,
+                 stats_refresh_interval: float = 30.0):
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.k1 = k1
+        self.b = b
+        self.stats_refresh_interval = stats_refresh_interval
+        self.terms_key = f"{key_prefix}:terms"
+        self.len_key = f"{key_prefix}:len"
+        self.stats_key = f"{key_prefix}:stats"
+        self._avgdl: Optional[float] = None
+        self._avgdl_at: Optional[float] = None
+
+    def _posting_key(self, token: str) -> str:
+        return f"{self.key_prefix}:post:{token}"
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def index_document(self, pipe, vector_id: str, text: str):
+        """Queue the index writes for one document on ``pipe``"""
+        tokens = tokenize(text)
+        if not tokens:
+            return
+
+        counts: Dict[str, int] = {}
+        for token in tokens:
+            counts[token] = counts.get(token, 0) + 1
+
+        doc_len = len(tokens)
+        avgdl = self._average_length() or doc_len
+        norm = self.k1 * (1 - self.b + self.b * doc_len / avgdl)
+        for token, tf in counts.items():
+            pipe.zadd(self._posting_key(token), {vector_id: tf * (self.k1 + 1) / (tf + norm)})
+
+        pipe.hset(self.terms_key, vector_id, " ".join(counts))
+        pipe.hset(self.len_key, vector_id, doc_len)
+        pipe.hincrby(self.stats_key, "docs", 1)
+        pipe.hincrby(self.stats_key, "total_len", doc_len)
+
+    def index_documents(self, pipe, documents: List[Tuple[str, str]]):
+        """Queue index writes for many (vector_id, text) pairs.
+
+        On an empty index the average length is seeded from the batch, so a
+        bulk (re)build gets proper length normalisation from the start.
+        """
+        if documents and self._average_length() is None:
+            lengths = [len(tokenize(text)) for _, text in documents]
+            self._avgdl = (sum(lengths) / len(lengths)) or None
+            self._avgdl_at = time.monotonic()
+        for vector_id, text in documents:
+            self.index_document(pipe, vector_id, text)
+
+    def remove_documents(self, pipe, vector_ids: List[str]):
+        """Queue the removal of documents on ``pipe`` (reads their terms first)"""
+        if not vector_ids:
+            return
+
+        read = self.redis_client.pipeline(transaction=False)
+        read.hmget(self.terms_key, vector_ids)
+        read.hmget(self.len_key, vector_ids)
+        terms, lengths = read.execute()
+
+        removed = 0
+        removed_len = 0
+        for vector_id, doc_terms, doc_len in zip(vector_ids, terms, lengths):
+            if doc_terms is None:
+                continue
+            if isinstance(doc_terms, bytes):
+                doc_terms = doc_terms.decode("utf-8")
+            for token in doc_terms.split():
+                pipe.zrem(self._posting_key(token), vector_id)
+            removed += 1
+            removed_len += int(doc_len or 0)
+
+        if removed:
+            pipe.hdel(self.terms_key, *vector_ids)
+            pipe.hdel(self.len_key, *vector_ids)
+            pipe.hincrby(self.stats_key, "docs", -removed)
+            pipe.hincrby(self.stats_key, "total_len", -removed_len)
+
+    def indexed_ids(self) -> List[str]:
+        """Return the ids of all indexed documents"""
+        return [vid.decode("utf-8") if isinstance(vid, bytes) else vid
+                for vid in self.redis_client.hkeys(self.len_key)]
+
+    def document_count(self) -> int:
+        """Number of indexed documents"""
+        return int(self.redis_client.hget(self.stats_key, "docs") or 0)
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int) -> List[Tuple[str, float]]:
+        """Return up to ``limit`` (vector_id, score) pairs, best first.
+
+        Scores are normalised by the best attainable score for the query,
+        so they fall in [0, 1].
+        """
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens or limit <= 0:
+            return []
+
+        pipe = self.redis_client.pipeline(transaction=False)
+        pipe.hget(self.stats_key, "docs")
+        for token in tokens:
+            pipe.zcard(self._posting_key(token))
+        docs, *doc_freqs = pipe.execute()
+
+        n_docs = int(docs or 0)
+        weights = {}
+        for token, df in zip(tokens, doc_freqs):
+            if df:
+                weights[self._posting_key(token)] = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+        if not weights:
+            return []
+
+        max_score = sum(weights.values()) * (self.k1 + 1)
+        scratch_key = f"{self.key_prefix}:tmp:{uuid.uuid4().hex}"
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.zunionstore(scratch_key, weights, aggregate="SUM")
+        pipe.zrevrange(scratch_key, 0, limit - 1, withscores=True)
+        pipe.delete(scratch_key)
+        ranked = pipe.execute()[1]
+
+        return [
+            (vid.decode("utf-8") if isinstance(vid, bytes) else vid, min(score / max_score, 1.0))
+            for vid, score in ranked
+        ]
+
+    def get_info(self) -> Dict[str, Any]:
+        """Get index statistics"""
+        stats = self.redis_client.hgetall(self.stats_key)
+        stats = {(k.decode("utf-8") if isinstance(k, bytes) else k): int(v) for k, v in stats.items()}
+        docs = stats.get("docs", 0)
+        return {
+            "type": "bm25",
+            "documents": docs,
+            "average_length": stats.get("total_len", 0) / docs if docs else 0.0,
+            "k1": self.k1,
+            "b": self.b
+        }
+
+    def _average_length(self) -> Optional[float]:
+        if self._avgdl_at is None or time.monotonic() - self._avgdl_at > self.stats_refresh_interval:
+            docs, total_len = self.redis_client.hmget(self.stats_key, ["docs", "total_len"])
+            docs = int(docs or 0)
+            self._avgdl = int(total_len or 0) / docs if docs else None
+            self._avgdl_at = time.monotonic()
+        return self._avgdl
@@ -0,0 +1,180 @@
+"""
+Streamlit-side cache for the RedisVectorService reads shared by the UI components
+"""
+
+import os
+from typing import Dict, Any, List, Optional, Tuple
+
+import streamlit as st
+
+# Seconds a cached read may be served before Redis is asked again
+STATS_TTL = int(os.getenv('UI_CACHE_STATS_TTL', 30))
+RECENT_TTL = int(os.getenv('UI_CACHE_RECENT_TTL', 30))
+SYSTEM_TTL = int(os.getenv('UI_CACHE_SYSTEM_TTL', 10))
+DATA_TTL = int(os.getenv('UI_CACHE_DATA_TTL', 300))
+
+
+class _Uncached(Exception):
+    """Carries a result that must not be cached (an error reply)"""
+
+    def __init__(self, result: Any):
+        super().__init__()
+        self.result = result
+
+
+def _read(cached_function, *args):
+    try:
+        return cached_function(*args)
+    except _Uncached as uncached:
+        return uncached.result
+
+
+def _check(result: Any) -> Any:
+    if isinstance(result, dict) and result.get('error'):
+        raise _Uncached(result)
+    return result
+
+
+# Arguments starting with "_" are not hashed; ``namespace`` tells service instances apart
+
+@st.cache_data(ttl=STATS_TTL, show_spinner=False)
+def _usecase_statistics(_service, namespace: str) -> Dict[str, Any]:
+    return _check(_service.get_usecase_statistics())
+
+
+@st.cache_data(ttl=RECENT_TTL, show_spinner=False)
+def _recent_usecase_queries(_service, namespace: str) -> List[Dict[str, Any]]:
+    return _service.get_recent_usecase_queries()
+
+
+@st.cache_data(ttl=STATS_TTL, show_spinner=False)
+def _usecase_analytics_data(_cache: 'CachedUsecaseService', namespace: str) -> Dict[str, Any]:
+    analytics = _cache.service.get_usecase_analytics_data(
+        recent_queries=_cache.get_recent_usecase_queries(),
+        vector_stats=_cache.get_usecase_statistics()
+    )
+    _check(analytics.get('vector_stats'))
+    return analytics
+
+
+@st.cache_data(ttl=SYSTEM_TTL, show_spinner=False)
+def _system_info(_service, namespace: str) -> Dict[str, Any]:
+    return _check(_service.get_system_info())
+
+
+@st.cache_data(ttl=SYSTEM_TTL, show_spinner=False)
+def _connection_status(_service, namespace: str) -> Tuple[bool, str]:
+    connected, message = _service.test_connection()
+    if not connected:
+        raise _Uncached((connected, message))
+    return connected, message
+
+
+@st.cache_data(ttl=DATA_TTL, show_spinner=False)
+def _usecase_data(_service, namespace: str, data_key: str) -> Optional[Dict[str, Any]]:
+    return _service.get_usecase_data(data_key)
+
+
+@st.cache_data(ttl=RECENT_TTL, show_spinner=False)
+def _latest_usecase_data(_cache: 'CachedUsecaseService', namespace: str) -> Optional[Dict[str, Any]]:
+    return _cache.service.get_latest_usecase_data(recent_queries=_cache.get_recent_usecase_queries())
+
+
+_CACHED_READS = (
+    _usecase_statistics, _recent_usecase_queries, _usecase_analytics_data,
+    _system_info, _connection_status, _usecase_data, _latest_usecase_data
+)
+
+# Background jobs whose completion changes the stored data: status method per job kind
+_BACKGROUND_JOBS = {
+    "maintenance": "get_maintenance_status",
+    "reembedding": "get_reembedding_status"
+}
+
+# (started_at, state) of the last finished job seen per service namespace and job kind;
+# module level because the facade is created again on every page render
+_finished_jobs: Dict[str, Dict[str, Tuple[Any, Any]]] = {}
+
+
+class CachedUsecaseService:
+    """Read-through cache in front of RedisVectorService for the Streamlit UI.
+
+    Statistics, recent queries, analytics, system info, the connection
+    check and stored use case documents are cached with ``st.cache_data``
+    for a few seconds (UI_CACHE_*_TTL), so one page render reads each of
+    them from Redis at most once however many components ask. Writes made
+    through the facade drop every cached read; all other attributes are
+    passed through to the service. Background maintenance and re-embedding
+    jobs change the data after their start method returned, so the cached
+    reads are dropped once such a job is seen to have finished.
+    """
+
+    WRITE_METHODS = (
+        "store_usecase_data", "store_aws_data", "clear_all_usecase_data", "clear_all_vectors",
+        "remove_duplicates", "rebuild_statistics", "rebuild_vector_spaces"
+    )
+
+    def __init__(self, service):
+        self.service = service
+        self.namespace = f"{type(service).__name__}:{id(service)}"
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.service, name)
+        if name not in self.WRITE_METHODS:
+            return attribute
+
+        def write(*args, **kwargs):
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                self.invalidate()
+        return write
+
+    @staticmethod
+    def invalidate():
+        """Drop all cached reads (after the stored data changed)"""
+        for cached_read in _CACHED_READS:
+            cached_read.clear()
+
+    def _invalidate_after_finished_jobs(self):
+        """Drop the cached reads if a background job finished since the last check"""
+        finished = _finished_jobs.setdefault(self.namespace, {})
+        for kind, status_method in _BACKGROUND_JOBS.items():
+            if not hasattr(self.service, status_method):
+                continue
+            status = getattr(self.service, status_method)() or {}
+            state = status.get('state')
+            if state in (None, 'idle', 'running'):
+                continue
+            job = (status.get('started_at'), state)
+            if finished.get(kind) != job:
+                finished[kind] = job
+                self.invalidate()
+
+    def get_usecase_statistics(self) -> Dict[str, Any]:
+        self._invalidate_after_finished_jobs()
+        return _read(_usecase_statistics, self.service, self.namespace)
+
+    def get_recent_usecase_queries(self) -> List[Dict[str, Any]]:
+        self._invalidate_after_finished_jobs()
+        return _read(_recent_usecase_queries, self.service, self.namespace)
+
+    def get_usecase_analytics_data(self) -> Dict[str, Any]:
+        self._invalidate_after_finished_jobs()
+        return _read(_usecase_analytics_data, self, self.namespace)
+
+    def get_system_info(self) -> Dict[str, Any]:
+        self._invalidate_after_finished_jobs()
+        return _read(_system_info, self.service, self.namespace)
+
+    def test_connection(self) -> Tuple[bool, str]:
+        return _read(_connection_status, self.service, self.namespace)
+
+    def get_usecase_data(self, data_key: str) -> Optional[Dict[str, Any]]:
+        self._invalidate_after_finished_jobs()
+        return _read(_usecase_data, self.service, self.namespace, data_key)
+
+    def get_latest_usecase_data(self) -> Optional[Dict[str, Any]]:
+        self._invalidate_after_finished_jobs()
+        return _read(_latest_usecase_data, self, self.namespace)
+
@@ -0,0 +1,147 @@
+"""
+Compact binary wire format for stored embedding vectors
+
+Layout (little-endian, 16-byte header so the payload stays aligned):
+
+    magic   4s   b"AVEC"
+    version B    format version (1)
+    dtype   B    0 = float32, 1 = float16, 2 = int8, 3 = sparse float32
+    flags   H    reserved
+    dim     I    number of components
+    scale   f    int8 dequantisation scale (1.0 otherwise)
+    payload      dim * itemsize bytes
+                 sparse: nnz uint32 indices followed by nnz float32 values
+"""
+
+import io
+import pickle
+import struct
+import time
+from typing import Dict, Any
+
+import numpy as np
+
+MAGIC = b"AVEC"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sBBHIf")
+HEADER_SIZE = HEADER.size
+
+DTYPE_CODES = {"float32": 0, "float16": 1, "int8": 2, "sparse": 3}
+DENSE_DTYPES = ("float32", "float16", "int8")
+_CODE_DTYPES = {0: np.dtype("<f4"), 1: np.dtype("<f2"), 2: np.dtype("i1")}
+
+
+def encode_vector(vector: np.ndarray, dtype: str = "float32") -> bytes:
+    """Encode a vector into the versioned binary format"""
+    if dtype not in DTYPE_CODES:
+        raise ValueError(f"Unsupported vector dtype: {dtype}")
+
+    vector = np.asarray(vector, dtype=np.float32).ravel()
+    code = DTYPE_CODES[dtype]
+    scale = 1.0
+
+    if dtype == "sparse":
+        indices = np.flatnonzero(vector).astype("<u4")
+        payload = indices.tobytes() + vector[indices].astype("<f4").tobytes()
+        return HEADER.pack(MAGIC, FORMAT_VERSION, code, 0, vector.size, scale) + payload
+
+    if dtype == "int8":
+        max_abs = float(np.max(np.abs(vector))) if vector.size else 0.0
+        scale = max_abs / 127.0 if max_abs > 0 else 1.0
+        payload = np.clip(np.rint(vector / scale), -127, 127).astype(np.int8)
+    else:
+        payload = vector.astype(_CODE_DTYPES[code], copy=False)
+
+    return HEADER.pack(MAGIC, FORMAT_VERSION, code, 0, vector.size, scale) + payload.tobytes()
+
+
+def is_encoded(data: bytes) -> bool:
+    """Check whether a stored value uses the binary vector format"""
+    return data[:4] == MAGIC
+
+
+def is_legacy_pickle(data: bytes) -> bool:
+    """Check whether a stored value is a pickled numpy array (pre-AVEC format)"""
+    return data[:1] == b"\x80"
+
+
+def decode_header(data: bytes) -> Dict[str, Any]:
+    """Read the header of an encoded vector"""
+    magic, version, code, _, dim, scale = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not an encoded vector")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported vector format version: {version}")
+    return {"version": version, "dtype": code, "dim": dim, "scale": scale}
+
+
+def decode_vector(data: bytes) -> np.ndarray:
+    """Decode a vector to float32.
+
+    float32 payloads are returned as a read-only view over ``data`` (no copy);
+    float16/int8 payloads are widened to float32 and sparse payloads are
+    scattered into a dense float32 array.
+    """
+    header = decode_header(data)
+    if header["dtype"] == DTYPE_CODES["sparse"]:
+        nnz = (len(data) - HEADER_SIZE) // 8
+        indices = np.frombuffer(data, dtype="<u4", count=nnz, offset=HEADER_SIZE)
+        values = np.frombuffer(data, dtype="<f4", count=nnz, offset=HEADER_SIZE + nnz * 4)
+        vector = np.zeros(header["dim"], dtype=np.float32)
+        vector[indices] = values
+        return vector
+
+    raw = np.frombuffer(data, dtype=_CODE_DTYPES[header["dtype"]], count=header["dim"], offset=HEADER_SIZE)
+
+    if header["dtype"] == DTYPE_CODES["float32"]:
+        return raw
+    if header["dtype"] == DTYPE_CODES["float16"]:
+        return raw.astype(np.float32)
+    return raw.astype(np.float32) * np.float32(header["scale"])
+
+
+class _NumpyOnlyUnpickler(pickle.Unpickler):
+    """Unpickler that only reconstructs numpy arrays"""
+
+    _ALLOWED = {
+        ("numpy", "ndarray"),
+        ("numpy", "dtype"),
+        ("numpy.core.multiarray", "_reconstruct"),
+        ("numpy._core.multiarray", "_reconstruct"),
+        ("numpy.core.multiarray", "scalar"),
+        ("numpy._core.multiarray", "scalar"),
+        ("codecs", "encode"),
+    }
+
+    def find_class(self, module, name):
+        if (module, name) not in self._ALLOWED:
+            raise pickle.UnpicklingError(f"Refusing to load {module}.{name} from a stored vector")
+        return super().find_class(module, name)
+
+
+def load_legacy_pickle(data: bytes) -> np.ndarray:
+    """Load a legacy pickled vector, refusing anything that is not a numpy array"""
+    vector = _NumpyOnlyUnpickler(io.BytesIO(data)).load()
+    return np.asarray(vector, dtype=np.float32)
+
+
+def benchmark_codec(dim: int = 1024, samples: int = 1000, seed: int = 0) -> Dict[str, Any]:
+    """Compare bytes per vector and decode time of pickle vs the binary formats"""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((samples, dim)).astype(np.float32)
+
+    def measure(encode, decode):
+        blobs = [encode(v) for v in vectors]
+        start = time.perf_counter()
+        for blob in blobs:
+            decode(blob)
+        elapsed = time.perf_counter() - start
+        return {
+            "bytes_per_vector": sum(len(b) for b in blobs) / samples,
+            "decode_us": elapsed / samples * 1e6
+        }
+
+    report = {"dim": dim, "samples": samples, "pickle": measure(pickle.dumps, load_legacy_pickle)}
+    for dtype in DENSE_DTYPES:
+        report[dtype] = measure(lambda v, d=dtype: encode_vector(v, d), decode_vector)
+    return report
@@ -0,0 +1,126 @@
+"""
+Partitioning of the vector store into hash-tagged shards (Redis Cluster ready)
+"""
+
+import zlib
+from typing import Dict, Any, List, Optional
+
+from .filter_index import FilterIndex
+from .text_index import BM25Index
+from .vector_stats import VectorStatistics
+
+
+def shard_number(vector_id: str, shard_count: int) -> int:
+    """Shard of a vector; the chunks of a document follow the document"""
+    if shard_count <= 1:
+        return 0
+    return zlib.crc32(vector_id.split('#', 1)[0].encode("utf-8")) % shard_count
+
+
+class VectorShard:
+    """Keys and per-shard indexes of one partition of the vector store.
+
+    All keys of a shard carry the hash tag ``{<number>}``, so a vector's
+    vec/meta keys, its index set and space set entries, statistics, filter
+    and text index postings and change events map to one cluster slot and
+    are written in one MULTI. An unsharded store (``tagged=False``) keeps
+    the original key names.
+
+    Keys (under ``prefix``):
+        index              SET    vector ids of the shard
+        space:<space>      SET    vector ids per (method, dimension) space
+        spaces             SET    spaces with vectors in the shard
+        vec_hash           HASH   vector id -> content (chunk) hash
+        vec:<id>/meta:<id> STRING vector and metadata (keys backend)
+        doc:<id>           HASH   RediSearch document (redisearch backend)
+        changes            STREAM change events for in-process ANN indexes
+        version            STRING write counter behind the search cache
+        stats:*, filter:*, bm25:*  see VectorStatistics, FilterIndex, BM25Index
+    """
+
+    def __init__(self, redis_client, redis_text, vector_prefix: str, key_prefix: str,
+                 number: int = 0, tagged: bool = False):
+        self.number = number
+        tag = f"{{{number}}}" if tagged else ""
+        self.prefix = f"{vector_prefix}:{tag}" if tagged else vector_prefix
+        # Source documents are written in the same MULTI as their vectors
+        self.doc_prefix = f"{key_prefix}:doc:{tag}:" if tagged else f"{key_prefix}:doc:"
+
+        self.index_key = f"{self.prefix}:index"
+        self.spaces_key = f"{self.prefix}:spaces"
+        self.vec_hash_key = f"{self.prefix}:vec_hash"
+        self.change_stream_key = f"{self.prefix}:changes"
+        self.version_key = f"{self.prefix}:version"
+
+        self.statistics = VectorStatistics(redis_text, f"{self.prefix}:stats")
+        self.filter_index = FilterIndex(redis_text, f"{self.prefix}:filter")
+        self.text_index = BM25Index(redis_client, f"{self.prefix}:bm25")
+
+    def vec_key(self, vector_id: str) -> str:
+        return f"{self.prefix}:vec:{vector_id}"
+
+    def meta_key(self, vector_id: str) -> str:
+        return f"{self.prefix}:meta:{vector_id}"
+
+    def search_doc_key(self, vector_id: str) -> str:
+        return f"{self.prefix}:doc:{vector_id}"
+
+    def space_key(self, space: str) -> str:
+        return f"{self.prefix}:space:{space}"
+
+    def doc_key(self, timestamp: str, doc_index: int) -> str:
+        return f"{self.doc_prefix}{timestamp}:{doc_index}"
+
+
+class ShardedPipeline:
+    """Pipelines for one logical write that spans shards.
+
+    On a single Redis node every shard shares one MULTI/EXEC, so the write
+    stays atomic as a whole. On a cluster each shard gets its own MULTI
+    (its keys share a slot) and keys outside the shards, such as the
+    content-hash mappings, go through a plain cluster pipeline executed
+    after the shards.
+    """
+
+    def __init__(self, redis_client, cluster: bool = False):
+        self.redis_client = redis_client
+        self.cluster = cluster
+        self._shared = None if cluster else redis_client.pipeline(transaction=True)
+        self._shards: Dict[int, Any] = {}
+        self._common = None
+
+    def shard(self, shard: VectorShard):
+        """Pipeline for keys of ``shard``"""
+        if self._shared is not None:
+            return self._shared
+        if shard.number not in self._shards:
+            self._shards[shard.number] = self.redis_client.pipeline(transaction=True)
+        return self._shards[shard.number]
+
+    def common(self):
+        """Pipeline for keys that belong to no shard"""
+        if self._shared is not None:
+            return self._shared
+        if self._common is None:
+            self._common = self.redis_client.pipeline(transaction=False)
+        return self._common
+
+    def execute(self) -> List[Any]:
+        """Execute all pipelines, shards first"""
+        if self._shared is not None:
+            return self._shared.execute()
+        results = []
+        for pipe in self._shards.values():
+            results.extend(pipe.execute())
+        if self._common is not None:
+            results.extend(self._common.execute())
+        return results
+
+
+def merge_counts(dicts: List[Optional[Dict[str, Any]]]) -> Dict[str, int]:
+    """Sum per-shard counter dicts"""
+    merged: Dict[str, int] = {}
+    for counts in dicts:
+        for field, value in (counts or {}).items():
+            merged[field] = merged.get(field, 0) + int(value)
+    return merged
@@ -0,0 +1,105 @@
+"""
+Materialized vector statistics maintained alongside every store/remove
+"""
+
+from typing import Dict, Any, Iterable, Optional
+
+# Metadata distributions kept as HINCRBY hashes
+DISTRIBUTIONS = ("queries", "services", "types", "methods", "dimensions")
+
+
+class VectorStatistics:
+    """Counters describing the stored vectors.
+
+    ``record`` queues HINCRBY/PFADD commands on the caller's pipeline, so
+    the counters change in the same MULTI/EXEC as the vector itself. The
+    unique content count is a HyperLogLog, which cannot forget removed
+    hashes; ``rebuild`` recomputes everything from the stored metadata.
+
+    Keys (under ``key_prefix``):
+        counts         HASH  total_vectors, total_documents, bedrock_enhanced, query_refined
+        <distribution> HASH  value -> count (see DISTRIBUTIONS)
+        hashes         HLL   content hashes
+    """
+
+    def __init__(self, redis_client, key_prefix: str):
+        self.redis_client = redis_client
+        self.key_prefix = key_prefix
+        self.counts_key = f"{key_prefix}:counts"
+        self.hashes_key = f"{key_prefix}:hashes"
+
+    def _distribution_key(self, name: str) -> str:
+        return f"{self.key_prefix}:{name}"
+
+    def keys(self) -> list:
+        """All keys owned by the statistics"""
+        return [self.counts_key, self.hashes_key] + [self._distribution_key(name) for name in DISTRIBUTIONS]
+
+    @staticmethod
+    def _values(metadata: Dict[str, Any]) -> Dict[str, list]:
+        return {
+            "queries": [metadata.get('original_query', 'Unknown')[:50]],
+            "services": list(metadata.get('key_services', [])),
+            "types": [metadata.get('type', 'Unknown')],
+            "methods": [metadata.get('embedding_method', 'unknown')],
+            "dimensions": [str(metadata.get('embedding_dimensions', 1024))]
+        }
+
+    def record(self, pipe, metadata: Optional[Dict[str, Any]], delta: int = 1):
+        """Queue the counter updates for one stored (+1) or removed (-1) vector
+
+        A vector without metadata only counts towards ``total_vectors`` and
+        ``total_documents``; a document's second and later chunks only
+        towards ``total_vectors``.
+        """
+        pipe.hincrby(self.counts_key, "total_vectors", delta)
+        if not metadata or not metadata.get('chunk_index', 0):
+            pipe.hincrby(self.counts_key, "total_documents", delta)
+        if not metadata or metadata.get('chunk_index', 0):
+            return
+        if metadata.get('enhanced_by_bedrock', False):
+            pipe.hincrby(self.counts_key, "bedrock_enhanced", delta)
+        if metadata.get('query_refined', False):
+            pipe.hincrby(self.counts_key, "query_refined", delta)
+
+        for name, values in self._values(metadata).items():
+            for value in values:
+                pipe.hincrby(self._distribution_key(name), value, delta)
+
+        if delta > 0 and metadata.get('content_hash'):
+            pipe.pfadd(self.hashes_key, metadata['content_hash'])
+
+    def read(self, index_key: str) -> Dict[str, Any]:
+        """Read all counters in one transaction, together with the size of ``index_key``"""
+        pipe = self.redis_client.pipeline(transaction=True)
+        pipe.scard(index_key)
+        pipe.hgetall(self.counts_key)
+        pipe.pfcount(self.hashes_key)
+        for name in DISTRIBUTIONS:
+            pipe.hgetall(self._distribution_key(name))
+        index_size, counts, unique, *distributions = pipe.execute()
+
+        return {
+            "index_size": index_size,
+            "counts": {field: int(value) for field, value in counts.items()},
+            "unique_hashes": unique,
+            # Fields that dropped to zero after removals are not reported
+            "distributions": {
+                name: {field: int(value) for field, value in values.items() if int(value) > 0}
+                for name, values in zip(DISTRIBUTIONS, distributions)
+            }
+        }
+
+    def rebuild(self, metadata_records: Iterable[Optional[Dict[str, Any]]], batch_size: int = 256) -> int:
+        """Drop the counters and recompute them from ``metadata_records``"""
+        self.redis_client.delete(*self.keys())
+
+        rebuilt = 0
+        pipe = self.redis_client.pipeline(transaction=False)
+        for metadata in metadata_records:
+            self.record(pipe, metadata)
+            rebuilt += 1
+            if rebuilt % batch_size == 0:
+                pipe.execute()
+        pipe.execute()
+        return rebuilt
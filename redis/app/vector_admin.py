@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Maintenance commands for the use case vector store
+
+Usage (from the app directory):
+    python vector_admin.py migrate-redisearch
+    python vector_admin.py migrate-format
+    python vector_admin.py codec-benchmark --dim 1024
+    python vector_admin.py quantization-benchmark --dim 1024 --samples 20000
+    python vector_admin.py rebuild-text-index
+    python vector_admin.py rebuild-statistics
+    python vector_admin.py rebuild-filter-index
+    python vector_admin.py rebuild-vector-spaces
+    python vector_admin.py reembed --rate 5
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add the app directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.redis_service import RedisVectorService
+from services.quantization import benchmark_quantization
+from services.vector_codec import benchmark_codec
+
+
+def _migrate_redisearch(args) -> dict:
+    service = RedisVectorService(args.embedding_method, storage_backend="redisearch")
+    if service.storage_backend != "redisearch":
+        return {"error": "Redis server does not provide the RediSearch module"}
+    return service.migrate_to_redisearch(batch_size=args.batch_size)
+
+
+def _migrate_format(args) -> dict:
+    service = RedisVectorService(args.embedding_method)
+    return service.migrate_vector_format(batch_size=args.batch_size, pause=args.pause)
+
+
+def _codec_benchmark(args) -> dict:
+    return benchmark_codec(dim=args.dim, samples=args.samples)
+
+
+def _quantization_benchmark(args) -> dict:
+    return benchmark_quantization(
+        dim=args.dim,
+        samples=args.samples,
+        queries=args.queries,
+        k=args.k,
+        pq_subvectors=args.pq_subvectors,
+        rerank=args.rerank
+    )
+
+
+def _rebuild_text_index(args) -> dict:
+    service = RedisVectorService(args.embedding_method)
+    return service.rebuild_text_index()
+
+
+def _rebuild_statistics(args) -> dict:
+    service = RedisVectorService(args.embedding_method)
+    return service.rebuild_statistics()
+
+
+def _rebuild_filter_index(args) -> dict:
+    service = RedisVectorService(args.embedding_method)
+    return service.rebuild_filter_index()
+
+
+def _rebuild_vector_spaces(args) -> dict:
+    service = RedisVectorService(args.embedding_method)
+    return service.rebuild_vector_spaces()
+
+
+def _reembed(args) -> dict:
+    service = RedisVectorService(args.embedding_method, embedding_dimensions=args.dimensions)
+    return service.reembed_vectors(rate=args.rate, batch_size=args.batch_size)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Use case vector store maintenance")
+    parser.add_argument("--embedding-method", default="auto", help="Embedding method (auto, titan, tfidf)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = subparsers.add_parser(
+        "migrate-redisearch",
+        help="Move vectors from the :vec:/:meta: key layout into the RediSearch index"
+    )
+    migrate_parser.add_argument("--batch-size", type=int, default=500, help="Vectors per pipeline batch")
+    migrate_parser.set_defaults(handler=_migrate_redisearch)
+
+    format_parser = subparsers.add_parser(
+        "migrate-format",
+        help="Rewrite pickled vectors in the binary float32 format"
+    )
+    format_parser.add_argument("--batch-size", type=int, default=500, help="Vectors per batch")
+    format_parser.add_argument("--pause", type=float, default=0.0, help="Seconds to sleep between batches")
+    format_parser.set_defaults(handler=_migrate_format)
+
+    benchmark_parser = subparsers.add_parser(
+        "codec-benchmark",
+        help="Compare bytes per vector and decode time of pickle vs the binary formats"
+    )
+    benchmark_parser.add_argument("--dim", type=int, default=1024, help="Vector dimension")
+    benchmark_parser.add_argument("--samples", type=int, default=1000, help="Vectors to encode")
+    benchmark_parser.set_defaults(handler=_codec_benchmark)
+
+    quantization_parser = subparsers.add_parser(
+        "quantization-benchmark",
+        help="Measure recall@k, bytes per vector and query time of each quantization mode"
+    )
+    quantization_parser.add_argument("--dim", type=int, default=1024, help="Vector dimension")
+    quantization_parser.add_argument("--samples", type=int, default=20000, help="Vectors to index")
+    quantization_parser.add_argument("--queries", type=int, default=200, help="Queries to run")
+    quantization_parser.add_argument("--k", type=int, default=10, help="Neighbours per query")
+    quantization_parser.add_argument("--pq-subvectors", type=int, default=64, help="PQ code bytes per vector")
+    quantization_parser.add_argument("--rerank", type=int, default=100, help="Candidates re-scored at full precision")
+    quantization_parser.set_defaults(handler=_quantization_benchmark)
+
+    text_index_parser = subparsers.add_parser(
+        "rebuild-text-index",
+        help="Drop and rebuild the BM25 index used by the text search fallback"
+    )
+    text_index_parser.set_defaults(handler=_rebuild_text_index)
+
+    statistics_parser = subparsers.add_parser(
+        "rebuild-statistics",
+        help="Recompute the materialized vector statistics from stored metadata"
+    )
+    statistics_parser.set_defaults(handler=_rebuild_statistics)
+
+    filter_parser = subparsers.add_parser(
+        "rebuild-filter-index",
+        help="Rebuild the usecase/service/type filter indexes from stored metadata"
+    )
+    filter_parser.set_defaults(handler=_rebuild_filter_index)
+
+    spaces_parser = subparsers.add_parser(
+        "rebuild-vector-spaces",
+        help="Reassign stored vectors to their (embedding method, dimension) spaces"
+    )
+    spaces_parser.set_defaults(handler=_rebuild_vector_spaces)
+
+    reembed_parser = subparsers.add_parser(
+        "reembed",
+        help="Re-embed vectors of other methods/dimensions with the current model"
+    )
+    reembed_parser.add_argument("--dimensions", type=int, default=1024, help="Titan embedding dimension (256, 512, 1024)")
+    reembed_parser.add_argument("--rate", type=float, default=None, help="Documents per second (default REEMBED_RATE)")
+    reembed_parser.add_argument("--batch-size", type=int, default=None, help="Documents per embedding batch")
+    reembed_parser.set_defaults(handler=_reembed)
+
+    args = parser.parse_args()
+    result = args.handler(args)
+    print(json.dumps(result, indent=2))
+    return 1 if result.get("error") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
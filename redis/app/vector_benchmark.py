@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Benchmark the use case vector store against a running Redis server
+
+Generates deterministic synthetic corpora, ingests them with
+store_usecase_data and measures ingest throughput, semantic_search_usecases
+latency (p50/p95/p99) and recall@k against an exact scan of the stored
+vectors, Redis memory per vector and get_usecase_statistics latency.
+Embeddings come from a seeded hashing embedder instead of Bedrock, so runs
+are reproducible and need no AWS access.
+
+The benchmark clears all use case data in the target Redis; point
+REDIS_HOST/REDIS_PORT at a scratch redis-server.
+
+Usage (from the app directory):
+    python vector_benchmark.py --allow-clear
+    python vector_benchmark.py --allow-clear --sizes 1000,10000 --queries 100 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+# Add the app directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.redis_service import RedisVectorService
+
+SERVICES = ["Lambda", "S3", "DynamoDB", "API Gateway", "Kinesis", "Glue", "RDS", "ECS", "SQS", "CloudFront"]
+TYPES = ["main_content", "api_reference", "tutorial"]
+
+_TOKEN = re.compile(r"\w+")
+
+
+class HashingEmbedder:
+    """Deterministic bag-of-words embedder: the normalised sum of one seeded
+    random vector per token, so texts sharing words are similar"""
+
+    def __init__(self, dim: int, seed: int = 0):
+        self.dim = dim
+        self.seed = seed
+        self._tokens: Dict[str, np.ndarray] = {}
+
+    def _token_vector(self, token: str) -> np.ndarray:
+        vector = self._tokens.get(token)
+        if vector is None:
+            rng = np.random.default_rng(zlib.crc32(token.encode("utf-8")) ^ self.seed)
+            vector = self._tokens[token] = rng.standard_normal(self.dim).astype(np.float32)
+        return vector
+
+    def __call__(self, text: str) -> Optional[np.ndarray]:
+        tokens = _TOKEN.findall(text.lower())
+        if not tokens:
+            return None
+        vector = np.sum([self._token_vector(token) for token in tokens], axis=0)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else None
+
+
+class SyntheticCorpus:
+    """Topic-clustered documents and queries drawn from a fixed vocabulary"""
+
+    def __init__(self, topics: int = 64, words_per_topic: int = 40, doc_tokens: int = 80, seed: int = 0):
+        self.rng = np.random.default_rng(seed)
+        self.topics = [[f"t{t}w{w}" for w in range(words_per_topic)] for t in range(topics)]
+        self.common = [f"common{w}" for w in range(400)]
+        self.doc_tokens = doc_tokens
+
+    def _words(self, topic: int, count: int, topic_share: float) -> List[str]:
+        from_topic = self.rng.random(count) < topic_share
+        words = self.topics[topic]
+        return [
+            words[self.rng.integers(len(words))] if use_topic else self.common[self.rng.integers(len(self.common))]
+            for use_topic in from_topic
+        ]
+
+    def document(self, number: int) -> Dict[str, Any]:
+        topic = int(self.rng.integers(len(self.topics)))
+        # The document number keeps every content hash unique
+        content = f"doc{number} " + " ".join(self._words(topic, self.doc_tokens, 0.7))
+        return {
+            'content': content,
+            'source': f"https://example.com/bench/{topic}/{number}",
+            'type': TYPES[number % len(TYPES)],
+            'services': [SERVICES[topic % len(SERVICES)], SERVICES[(topic + 3) % len(SERVICES)]]
+        }
+
+    def query(self) -> str:
+        topic = int(self.rng.integers(len(self.topics)))
+        return " ".join(self._words(topic, 8, 0.9))
+
+    def usecase(self, documents: List[Dict[str, Any]], batch: int) -> Dict[str, Any]:
+        services = sorted({service for doc in documents for service in doc.pop('services')})
+        return {
+            'original_query': f"benchmark batch {batch}",
+            'refined_query': f"benchmark batch {batch}",
+            'enhanced_documentation': {'key_services': services},
+            'metadata': {'total_documents_found': len(documents)},
+            'raw_documentation': documents
+        }
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    values = np.asarray(samples) * 1e3
+    return {
+        'p50_ms': float(np.percentile(values, 50)),
+        'p95_ms': float(np.percentile(values, 95)),
+        'p99_ms': float(np.percentile(values, 99)),
+        'mean_ms': float(values.mean())
+    }
+
+
+def _used_memory(service: RedisVectorService) -> int:
+    info = service.redis_client.info('memory')
+    if info and all(isinstance(node_info, dict) for node_info in info.values()):
+        # Redis Cluster: one reply per node
+        return sum(int(node_info.get('used_memory', 0)) for node_info in info.values())
+    return int(info.get('used_memory', 0))
+
+
+def _create_service(args) -> RedisVectorService:
+    # Measure the search itself, not the result cache
+    os.environ['SEARCH_CACHE_ENABLED'] = 'false'
+    service = RedisVectorService("tfidf", embedding_dimensions=args.dim)
+    service.set_embedding_backend(HashingEmbedder(args.dim, seed=args.seed), args.dim)
+    return service
+
+
+def _exact_top_k(service: RedisVectorService, queries: List[str], k: int) -> List[List[str]]:
+    """Exact cosine top-k documents over every stored vector (a document scores as its best chunk)"""
+    records = [
+        (vector_id, embedding)
+        for vector_id, embedding, _ in service._iter_vector_records(service._get_index_ids(), with_vectors=True,
+                                                                   with_metadata=False)
+        if embedding is not None
+    ]
+    ids = [vector_id for vector_id, _ in records]
+    matrix = np.stack([embedding for _, embedding in records]).astype(np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    query_matrix = np.stack([service._create_embedding(query, use_cache=False) for query in queries])
+    parents = [service._parent_id(vector_id) for vector_id in ids]
+    exact = []
+    for scores in query_matrix @ matrix.T:
+        top: List[str] = []
+        for i in np.argsort(-scores):
+            if parents[i] not in top:
+                top.append(parents[i])
+                if len(top) == k:
+                    break
+        exact.append(top)
+    return exact
+
+
+def run_size(service: RedisVectorService, size: int, args) -> Dict[str, Any]:
+    """Ingest ``size`` documents into an empty store and measure it"""
+    corpus = SyntheticCorpus(seed=args.seed)
+    service.clear_all_usecase_data()
+    memory_before = _used_memory(service)
+
+    print(f"🔄 [BENCH] Ingesting {size} documents")
+    started = time.perf_counter()
+    for batch, first in enumerate(range(0, size, args.batch_size)):
+        documents = [corpus.document(number) for number in range(first, min(first + args.batch_size, size))]
+        service.store_usecase_data(corpus.usecase(documents, batch))
+    ingest_seconds = time.perf_counter() - started
+
+    vectors = service._count_vectors()
+    memory_after = _used_memory(service)
+
+    queries = [corpus.query() for _ in range(max(1, args.queries))]
+    # The first search loads (or builds) the ANN index
+    started = time.perf_counter()
+    service.semantic_search_usecases(queries[0], top_k=args.k, min_similarity=-1.0)
+    first_search_seconds = time.perf_counter() - started
+
+    print(f"🔄 [BENCH] Running {len(queries)} searches")
+    latencies = []
+    results = []
+    for query in queries:
+        started = time.perf_counter()
+        hits = service.semantic_search_usecases(query, top_k=args.k, min_similarity=-1.0)
+        latencies.append(time.perf_counter() - started)
+        results.append([hit.get('parent_id', hit['vector_id']) for hit in hits])
+
+    exact = _exact_top_k(service, queries, args.k)
+    recall = float(np.mean([len(set(found) & set(truth)) / len(truth) for found, truth in zip(results, exact) if truth]))
+
+    stats_latencies = []
+    for _ in range(args.stats_runs):
+        started = time.perf_counter()
+        service.get_usecase_statistics()
+        stats_latencies.append(time.perf_counter() - started)
+
+    report = {
+        'documents': size,
+        'vectors': vectors,
+        'ingest': {
+            'seconds': ingest_seconds,
+            'docs_per_second': size / ingest_seconds if ingest_seconds > 0 else 0.0
+        },
+        'memory': {
+            'used_bytes': memory_after - memory_before,
+            'bytes_per_vector': (memory_after - memory_before) / vectors if vectors else None
+        },
+        'search': dict(_percentiles(latencies), first_search_seconds=first_search_seconds,
+                       match_type=hits[0]['match_type'] if hits else None),
+        f'recall@{args.k}': recall,
+        'statistics': _percentiles(stats_latencies)
+    }
+    print(f"✅ [BENCH] {size} docs: {report['ingest']['docs_per_second']:.0f} docs/s, "
+          f"search p50 {report['search']['p50_ms']:.2f} ms / p99 {report['search']['p99_ms']:.2f} ms, "
+          f"recall@{args.k} {recall:.3f}")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the use case vector store against a Redis server")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma separated corpus sizes")
+    parser.add_argument("--dim", type=int, default=256, help="Embedding dimension")
+    parser.add_argument("--queries", type=int, default=200, help="Searches per corpus size")
+    parser.add_argument("--k", type=int, default=10, help="Results per search (recall@k)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Documents per store_usecase_data call")
+    parser.add_argument("--stats-runs", type=int, default=20, help="get_usecase_statistics calls per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON results file")
+    parser.add_argument("--allow-clear", action="store_true",
+                        help="Allow clearing the use case data already stored in the target Redis")
+    args = parser.parse_args(argv)
+
+    service = _create_service(args)
+    if service._count_vectors() and not args.allow_clear:
+        print("❌ [BENCH] The target Redis holds use case vectors; rerun with --allow-clear to delete them")
+        return 2
+
+    info = service.get_system_info()
+    report = {
+        'started_at': datetime.now().isoformat(),
+        'config': {
+            'dim': args.dim,
+            'queries': args.queries,
+            'k': args.k,
+            'batch_size': args.batch_size,
+            'seed': args.seed,
+            'redis_version': info.get('redis_version'),
+            'cluster': service.cluster,
+            'shards': service.shard_count,
+            'storage_backend': service.storage_backend,
+            'quantization': service.quantization,
+            'ann_nprobe': service.ann_nprobe,
+            'chunk_strategy': service.chunker.strategy
+        },
+        'runs': []
+    }
+    try:
+        for size in (int(size) for size in args.sizes.split(",") if size.strip()):
+            report['runs'].append(run_size(service, size, args))
+    finally:
+        service.clear_all_usecase_data()
+
+    with open(args.output, "w") as handle:
+        json.dump(report, handle, indent=2)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())